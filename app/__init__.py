@@ -1,31 +1,64 @@
 from flask import Flask
-from flask_cors import CORS
-from .extensions import db, jwt, cache, limiter
-from .blueprints.auth.routes import auth_bp
-from .blueprints.tasks.routes import tasks_bp
-from .config import Config
-from .tasks.celery import init_celery, celery  
-
-def create_app(config_class=Config):
+from .config import Config, config
+
+APP_ROLES = ('web', 'worker')
+
+def create_app(config_class=Config, role='web'):
+    """Build the app for one process type.
+
+    ``web`` sets up everything that serves HTTP: CORS, JWT, the rate
+    limiter, blueprints and metrics, and only configures Celery to send
+    tasks. ``worker`` sets up the database, the cache and Celery's task
+    context, and never imports CORS, Alembic, JWT or the rate limiter.
+    Unless DB_POOL_PROFILE is set, each role gets the pool profile of the
+    same name.
+    """
+    if role not in APP_ROLES:
+        raise ValueError(f"role must be one of: {', '.join(APP_ROLES)}")
     app = Flask(__name__)
+    if isinstance(config_class, str):
+        config_class = config[config_class]
     app.config.from_object(config_class)
-    
-    
+    if not app.config.get('DB_POOL_PROFILE'):
+        app.config['DB_POOL_PROFILE'] = role
+
+    if role == 'worker':
+        _setup_worker(app)
+    else:
+        _setup_web(app)
+    return app
+
+def _setup_web(app):
+    from flask import Response
+    from flask_cors import CORS
+    from .extensions import initialize_extensions, cache
+    from .web_extensions import limiter
+    from .blueprints.auth.routes import auth_bp
+    from .blueprints.tasks.routes import tasks_bp
+    from .blueprints.admin.routes import admin_bp
+    from .utils.metrics import registry
+    from .utils.instrumentation import init_instrumentation
+    from .tasks.celery import configure_celery
+
     CORS(app)
-    
-    
-    from .extensions import initialize_extensions
     initialize_extensions(app)
-    
-    
+
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
- 
-    @app.after_request
-    def inject_x_rate_headers(response):
-        return response
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
-   
-    init_celery(app)
+    @app.route('/metrics')
+    @limiter.exempt
+    def metrics():
+        """Expose process metrics in the Prometheus text format."""
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
 
-    return app
+    init_instrumentation(app, cache, limiter)
+    configure_celery(app)
+
+def _setup_worker(app):
+    from .extensions import initialize_worker_extensions
+    from .tasks.celery import init_celery
+
+    initialize_worker_extensions(app)
+    init_celery(app)
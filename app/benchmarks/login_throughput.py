@@ -0,0 +1,97 @@
+"""Login throughput under concurrent load, inline hashing vs. the process pool.
+
+Run from the repository root:
+
+    python -m app.benchmarks.login_throughput --threads 16 --logins 200
+
+For each hashing backend it reports logins per second and the p50/p95
+latency of a cheap request (``GET /metrics``) issued during the spike. The
+second number shows whether hashing starves other traffic.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, password_hasher
+
+
+def _make_app(database_path, workers, method):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        JWT_SECRET_KEY = TestingConfig.JWT_SECRET_KEY or 'benchmark-secret'
+        PASSWORD_HASH_METHOD = method
+        PASSWORD_HASH_WORKERS = workers
+        PASSWORD_HASH_MAX_CONCURRENCY = max(workers, 1) * 2
+        PASSWORD_HASH_WAIT_TIMEOUT = 60
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    client = app.test_client()
+    client.post('/api/auth/register', json={
+        'username': 'bench', 'email': 'bench@example.com', 'password': 'benchmark-password'
+    })
+    return app
+
+
+def run(threads, logins, workers, method):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _make_app(os.path.join(tmp, 'bench.db'), workers, method)
+        done = threading.Event()
+        probe_latencies = []
+
+        def login(_):
+            response = app.test_client().post('/api/auth/login', json={
+                'email': 'bench@example.com', 'password': 'benchmark-password'
+            })
+            assert response.status_code == 200, response.data
+
+        def probe():
+            client = app.test_client()
+            while not done.is_set():
+                started = time.perf_counter()
+                client.get('/metrics')
+                probe_latencies.append(time.perf_counter() - started)
+                time.sleep(0.005)
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(login, range(logins)))
+            elapsed = time.perf_counter() - started
+        finally:
+            done.set()
+            prober.join()
+            password_hasher.shutdown()
+
+        probe_ms = sorted(latency * 1000 for latency in probe_latencies) or [0.0]
+        return {
+            "workers": workers,
+            "logins_per_second": round(logins / elapsed, 1),
+            "probe_p50_ms": round(statistics.median(probe_ms), 2),
+            "probe_p95_ms": round(probe_ms[int(len(probe_ms) * 0.95) - 1], 2),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--pool-workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--method', default='pbkdf2:sha256:600000')
+    args = parser.parse_args()
+
+    for workers in (0, args.pool_workers):
+        print(run(args.threads, args.logins, workers, args.method))
+
+
+if __name__ == '__main__':
+    main()
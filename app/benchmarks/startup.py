@@ -0,0 +1,78 @@
+"""Report how long each process type takes to start and what it loads.
+
+Run from the repository root:
+
+    python -m app.benchmarks.startup                       # web and worker, TestingConfig
+    python -m app.benchmarks.startup --role worker --config production
+
+Every sample builds the app with ``create_app(role=...)`` in a fresh
+interpreter, so imports are cold. It reports the import and
+``create_app`` times (the median over ``--repeat`` runs), the number of
+modules loaded, the extensions, blueprints and pool profile that were set
+up, and which of the web-only or worker-only packages were imported. ``production``
+connects to the configured database and counts that time.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Packages that should only show up in one process type.
+WATCHED_PACKAGES = ('flask_cors', 'flask_limiter', 'flask_jwt_extended', 'flask_migrate', 'pydantic', 'celery')
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+from app.tasks.celery import celery, TASK_MODULES
+imported = time.perf_counter()
+app = create_app(sys.argv[1], role=sys.argv[2])
+created = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "modules": len(sys.modules),
+    "extensions": sorted(app.extensions),
+    "blueprints": sorted(app.blueprints),
+    "db_pool_profile": app.config['DB_POOL_PROFILE'],
+    "task_modules": list(celery.conf.include or ()),
+    "packages": sorted(name for name in json.loads(sys.argv[3]) if name in sys.modules),
+}))
+"""
+
+
+def probe(role, config_name):
+    """Start one fresh interpreter that builds the app for ``role`` and return its report."""
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE, config_name, role, json.dumps(WATCHED_PACKAGES)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(roles=('web', 'worker'), config_name='testing', repeat=3):
+    results = {}
+    for role in roles:
+        samples = [probe(role, config_name) for _ in range(repeat)]
+        results[role] = {
+            **samples[-1],
+            "import_ms": round(statistics.median(s['import_ms'] for s in samples), 1),
+            "create_app_ms": round(statistics.median(s['create_app_ms'] for s in samples), 1),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--role', action='append', choices=('web', 'worker'))
+    parser.add_argument('--config', default='testing')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(report(args.role or ('web', 'worker'), args.config, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,295 @@
+"""Offline benchmark suite for the auth and tasks hot paths.
+
+Run from the repository root:
+
+    python -m app.benchmarks.suite                    # compare with baseline.json
+    python -m app.benchmarks.suite --update-baseline  # record a new baseline
+
+The suite uses a temporary SQLite file. Flask-Caching's SimpleCache stands in
+for Redis, and the rate limiter keeps its in-memory storage. It seeds
+``--tasks`` tasks with ``--days`` daily log rows each. Then it measures
+latency percentiles and SQL statements per request for every auth and tasks
+route, and rows per second for daily_task_loader and the CSV import. The
+run exits non-zero when any metric regresses past the thresholds in
+``compare``.
+
+Latency baselines depend on the machine, so record them on the machine that
+enforces them. Query counts do not.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, insert
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, cache
+from app.blueprints.auth.models import User, RoleEnum
+from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatus
+from app.tasks.daily_task_loader import build_daily_load
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+SEED_DATE = date(2030, 1, 1)
+
+
+class QueryCounter:
+    """Counts SQL statements sent to an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    @contextmanager
+    def counting(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def make_app(database_path):
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        JWT_SECRET_KEY = TestingConfig.JWT_SECRET_KEY or 'benchmark-secret'
+        # Measure the routes, not the key derivation function.
+        PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+    return create_app(BenchmarkConfig)
+
+
+def seed(tasks, days):
+    """Insert users, tasks and ``days`` log rows per task with Core bulk inserts."""
+    db.drop_all()
+    db.create_all()
+    db.session.execute(insert(User.__table__), [
+        {"username": 'admin', "email": 'admin@example.com', "password_hash": 'x', "role": RoleEnum.ADMIN},
+        {"username": 'manager', "email": 'manager@example.com', "password_hash": 'x', "role": RoleEnum.MANAGER},
+    ])
+    statuses = list(TaskStatus)
+    db.session.execute(insert(TaskManager.__table__), [
+        {
+            "title": f"Seeded task {i}",
+            "description": f"Seeded description {i} " * 4,
+            "status": statuses[i % len(statuses)],
+            "priority": i % 5 + 1,
+            "due_date": datetime(2030, 6, 1),
+            "created_by": 2,
+            "updated_by": 2,
+        }
+        for i in range(tasks)
+    ])
+    for day in range(days):
+        log_date = SEED_DATE + timedelta(days=day)
+        db.session.execute(insert(TaskLogger.__table__), [
+            {"task_id": task_id, "status": statuses[task_id % len(statuses)], "log_date": log_date}
+            for task_id in range(1, tasks + 1)
+        ])
+    db.session.commit()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure_route(counter, request_fn, iterations, warmup=3):
+    """Time ``request_fn(i)`` and count its SQL statements.
+
+    Warm-up calls use indexes after the measured ones, so every call that
+    creates or deletes something gets its own index.
+    """
+    for i in range(warmup):
+        request_fn(iterations + i)
+
+    latencies = []
+    queries = []
+    for i in range(iterations):
+        with counter.counting():
+            started = time.perf_counter()
+            response = request_fn(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code < 400, (response.status_code, response.data[:200])
+        queries.append(counter.count)
+
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "queries_per_request": max(queries),
+    }
+
+
+def route_scenarios(client, tasks, days):
+    admin = {"Authorization": f"Bearer {create_access_token(identity=1, additional_claims={'role': 'admin'})}"}
+    manager = {"Authorization": f"Bearer {create_access_token(identity=2, additional_claims={'role': 'manager'})}"}
+    client.post('/api/auth/register', json={
+        'username': 'bench', 'email': 'bench@example.com', 'password': 'benchmark-password'
+    })
+    log_id = tasks * days // 2
+    small_csv = ("title,description,status,priority\n" + "".join(
+        f"Uploaded {i},desc,pending,2\n" for i in range(100)
+    )).encode('utf-8')
+
+    return {
+        "auth.register": lambda i: client.post('/api/auth/register', json={
+            'username': f'user{i}', 'email': f'user{i}@example.com', 'password': 'benchmark-password'
+        }),
+        "auth.login": lambda i: client.post('/api/auth/login', json={
+            'email': 'bench@example.com', 'password': 'benchmark-password'
+        }),
+        "auth.profile": lambda i: client.get('/api/auth/profile', headers=manager),
+        "tasks.get_tasks.page": lambda i: client.get(
+            f'/api/tasks/tasks?page={i % 50 + 1}&per_page=50&x={i}', headers=manager
+        ),
+        "tasks.get_tasks.deep_page": lambda i: client.get(
+            f'/api/tasks/tasks?page={tasks * days // 50 - 1}&per_page=50&x={i}', headers=manager
+        ),
+        "tasks.get_tasks.cursor": lambda i: client.get(
+            f'/api/tasks/tasks?cursor=&per_page=50&x={i}', headers=manager
+        ),
+        "tasks.get_tasks.cached": lambda i: client.get('/api/tasks/tasks?per_page=50', headers=manager),
+        "tasks.get_task": lambda i: client.get(f'/api/tasks/task/{log_id}', headers=manager),
+        "tasks.create_task": lambda i: client.post('/api/tasks/task', json={
+            'title': f'Benchmark task {i}', 'description': 'created by the benchmark', 'priority': 3
+        }, headers=manager),
+        "tasks.update_task": lambda i: client.put(f'/api/tasks/task/{i % tasks + 1}', json={
+            'title': f'Updated task {i}', 'priority': i % 5 + 1
+        }, headers=admin),
+        "tasks.delete_task": lambda i: client.delete(f'/api/tasks/task/{tasks - i - 10}', headers=manager),
+        "tasks.upload_csv_100_rows": lambda i: client.post(
+            '/api/tasks/upload-csv',
+            data={'file': (BytesIO(small_csv), 'tasks.csv')},
+            headers=manager,
+            content_type='multipart/form-data'
+        ),
+    }
+
+
+def measure_daily_loader(tasks):
+    started = time.perf_counter()
+    result = build_daily_load(date(2031, 1, 1)).apply().get()
+    elapsed = time.perf_counter() - started
+    return {"rows": result['rows_inserted'], "rows_per_second": round(result['rows_inserted'] / elapsed, 1)}
+
+
+def measure_csv_import(client, rows):
+    manager = {"Authorization": f"Bearer {create_access_token(identity=2, additional_claims={'role': 'manager'})}"}
+    payload = ("title,description,status,priority,due_date\n" + "".join(
+        f"Imported {i},imported description {i},pending,{i % 5 + 1},2030-01-01\n" for i in range(rows)
+    )).encode('utf-8')
+    started = time.perf_counter()
+    response = client.post(
+        '/api/tasks/upload-csv',
+        data={'file': (BytesIO(payload), 'tasks.csv')},
+        headers=manager,
+        content_type='multipart/form-data'
+    )
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 201, response.data[:200]
+    return {"rows": rows, "rows_per_second": round(rows / elapsed, 1)}
+
+
+def run(tasks=5000, days=20, iterations=50, csv_rows=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, 'benchmark.db'))
+        with app.app_context():
+            seed(tasks, days)
+            cache.clear()
+            client = app.test_client()
+            counter = QueryCounter(db.engine)
+
+            results = {"routes": {}, "throughput": {}}
+            for name, request_fn in route_scenarios(client, tasks, days).items():
+                results['routes'][name] = measure_route(counter, request_fn, iterations)
+            results['throughput']['daily_task_loader'] = measure_daily_loader(tasks)
+            results['throughput']['csv_import'] = measure_csv_import(client, csv_rows)
+            db.engine.dispose()
+        return results
+
+
+def compare(results, baseline, latency_tolerance=0.3, latency_floor_ms=1.0, throughput_tolerance=0.3):
+    """Return a list of human-readable regressions of ``results`` against ``baseline``.
+
+    A route regresses when it issues more SQL statements than the baseline,
+    or when its p50 grows by more than ``latency_tolerance`` and by more
+    than ``latency_floor_ms``. The gate uses the median because tail
+    percentiles over a few dozen samples are too noisy to fail a run on.
+    Throughput regresses when it drops by more than ``throughput_tolerance``.
+    """
+    failures = []
+    for name, base in baseline.get('routes', {}).items():
+        current = results['routes'].get(name)
+        if current is None:
+            failures.append(f"{name}: missing from this run")
+            continue
+        if current['queries_per_request'] > base['queries_per_request']:
+            failures.append(
+                f"{name}: {current['queries_per_request']} queries/request "
+                f"(baseline {base['queries_per_request']})"
+            )
+        if latency_tolerance is not None:
+            limit = max(base['p50_ms'] * (1 + latency_tolerance), base['p50_ms'] + latency_floor_ms)
+            if current['p50_ms'] > limit:
+                failures.append(f"{name}: p50 {current['p50_ms']}ms (baseline {base['p50_ms']}ms)")
+
+    for name, base in baseline.get('throughput', {}).items():
+        current = results['throughput'].get(name)
+        if current is None:
+            failures.append(f"{name}: missing from this run")
+        elif throughput_tolerance is not None and \
+                current['rows_per_second'] < base['rows_per_second'] * (1 - throughput_tolerance):
+            failures.append(
+                f"{name}: {current['rows_per_second']} rows/s (baseline {base['rows_per_second']})"
+            )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--csv-rows', type=int, default=20000)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--latency-tolerance', type=float, default=0.3)
+    parser.add_argument('--throughput-tolerance', type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    results = run(args.tasks, args.days, args.iterations, args.csv_rows)
+    print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 1
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    failures = compare(results, baseline, args.latency_tolerance, throughput_tolerance=args.throughput_tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
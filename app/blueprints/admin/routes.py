@@ -0,0 +1,68 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from app.extensions import db
+from app.web_extensions import limiter
+from app.services.auth_service import HashingBusy
+from app.services.user_service import bulk_create_users
+from app.utils.decorators import role_required
+import csv
+import io
+
+admin_bp = Blueprint('admin', __name__)
+
+def _json_user_rows(users):
+    for index, user in enumerate(users, start=1):
+        yield index, user if isinstance(user, dict) else {}
+
+def _csv_user_rows(reader):
+    for row in reader:
+        yield reader.line_num, row
+
+@admin_bp.route('/users/bulk', methods=['POST'])
+@jwt_required()
+@role_required('admin')
+@limiter.limit("10 per minute")
+def bulk_create_users_route():
+    """Provision many users from a JSON list or an uploaded CSV file."""
+    batch_size = current_app.config['USER_IMPORT_BATCH_SIZE']
+    max_errors = current_app.config['USER_IMPORT_MAX_ERRORS']
+    text_stream = None
+    
+    if 'file' in request.files:
+        text_stream = io.TextIOWrapper(request.files['file'].stream, encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(text_stream)
+        missing = [c for c in ('username', 'email', 'password') if c not in (reader.fieldnames or [])]
+        if missing:
+            text_stream.detach()
+            return jsonify({"error": f"Missing required columns: {', '.join(missing)}"}), 400
+        rows = _csv_user_rows(reader)
+    else:
+        data = request.get_json(silent=True)
+        users = data.get('users') if isinstance(data, dict) else data
+        if not isinstance(users, list):
+            return jsonify({"error": "Provide a CSV file or a JSON list of users"}), 400
+        rows = _json_user_rows(users)
+    
+    try:
+        result = bulk_create_users(rows, batch_size=batch_size, max_errors=max_errors)
+    
+    except HashingBusy:
+        db.session.rollback()
+        response = jsonify({"error": "Server busy, please retry"})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return jsonify({"error": "File must be UTF-8 encoded"}), 400
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+    
+    finally:
+        if text_stream is not None:
+            text_stream.detach()
+    
+    status_code = 201 if result['created'] else 200
+    return jsonify(result), status_code
@@ -1,15 +1,22 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_jwt_extended import create_access_token, jwt_required
 from app.blueprints.auth.models import User, RoleEnum
-from app.extensions import db, limiter
-from app.utils.decorators import role_required
+from app.extensions import db, password_hasher
+from app.web_extensions import limiter
+from app.services.auth_service import HashingBusy
+from app.services.user_service import current_user_context
+from app.utils.decorators import role_required, read_only
 from app.utils.validators import validate_email, validate_password
 from datetime import timedelta
 import re
 
 auth_bp = Blueprint('auth', __name__)
 
+def _hashing_busy():
+    response = jsonify({"error": "Server busy, please retry"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @auth_bp.route('/register', methods=['POST'])
 @limiter.limit("5 per minute")
 def register():
@@ -34,10 +41,15 @@ def register():
         return jsonify({"error": "Username already taken"}), 409
     
     
+    try:
+        password_hash = password_hasher.hash(data['password'])
+    except HashingBusy:
+        return _hashing_busy()
+    
     new_user = User(
         username=data['username'],
         email=data['email'],
-        password_hash=generate_password_hash(data['password']),
+        password_hash=password_hash,
         role=RoleEnum.USER
     )
     
@@ -57,11 +69,18 @@ def login():
     
     user = User.query.filter_by(email=data['email']).first()
     
-    if not user or not check_password_hash(user.password_hash, data['password']):
-        return jsonify({"error": "Invalid credentials"}), 401
-    
-    if not user.is_active:
-        return jsonify({"error": "Account is disabled"}), 403
+    try:
+        if not user or not password_hasher.verify(user.password_hash, data['password']):
+            return jsonify({"error": "Invalid credentials"}), 401
+        
+        if not user.is_active:
+            return jsonify({"error": "Account is disabled"}), 403
+        
+        if password_hasher.needs_rehash(user.password_hash):
+            user.password_hash = password_hasher.hash(data['password'])
+            db.session.commit()
+    except HashingBusy:
+        return _hashing_busy()
     
    
     access_token = create_access_token(
@@ -78,10 +97,10 @@ def login():
 
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
+@read_only
 def profile():
     """Get current user's profile."""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user_context()
     
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -89,5 +108,5 @@ def profile():
     return jsonify({
         "username": user.username,
         "email": user.email,
-        "role": user.role.value
+        "role": user.role
     }), 200
\ No newline at end of file
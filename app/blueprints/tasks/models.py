@@ -1,6 +1,7 @@
 from app.extensions import db
 from datetime import datetime
 from enum import Enum
+from sqlalchemy import DDL, event
 
 class TaskStatus(Enum):
     PENDING = 'pending'
@@ -34,6 +35,41 @@ class TaskManager(db.Model):
     def __repr__(self):
         return f'<TaskManager {self.title}>'
 
+# Full-text index over active tasks. PostgreSQL uses a partial GIN index on
+# this expression, so every write path keeps it current; queries must use
+# the identical expression. SQLite uses an FTS5 table fed by triggers.
+SEARCH_DOCUMENT_SQL = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+_SEARCH_INDEX_DDL = {
+    'postgresql': [
+        f"CREATE INDEX IF NOT EXISTS idx_task_manager_search ON task_manager "
+        f"USING GIN ({SEARCH_DOCUMENT_SQL}) WHERE is_active",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5("
+        "title, description, content='task_manager', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS task_search_ai AFTER INSERT ON task_manager WHEN new.is_active BEGIN "
+        "INSERT INTO task_search(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS task_search_ad AFTER DELETE ON task_manager WHEN old.is_active BEGIN "
+        "INSERT INTO task_search(task_search, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS task_search_au AFTER UPDATE OF title, description, is_active "
+        "ON task_manager BEGIN "
+        "INSERT INTO task_search(task_search, rowid, title, description) "
+        "SELECT 'delete', old.id, old.title, old.description WHERE old.is_active; "
+        "INSERT INTO task_search(rowid, title, description) "
+        "SELECT new.id, new.title, new.description WHERE new.is_active; END",
+    ],
+}
+
+def search_index_ddl(dialect):
+    """DDL statements that create the full-text index on ``dialect`` (empty if unsupported)."""
+    return _SEARCH_INDEX_DDL.get(dialect, [])
+
+for _dialect, _statements in _SEARCH_INDEX_DDL.items():
+    for _statement in _statements:
+        event.listen(TaskManager.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
+
 class TaskLogger(db.Model):
     __tablename__ = 'task_logger'
     
@@ -47,12 +83,53 @@ class TaskLogger(db.Model):
     __table_args__ = (
         db.Index('idx_task_logger_task_id', 'task_id'),
         db.Index('idx_task_logger_log_date', 'log_date'),
+        db.Index('idx_task_logger_log_date_id', 'log_date', 'id'),
         db.UniqueConstraint('task_id', 'log_date', name='uq_task_logger_task_date'),
     )
     
     def __repr__(self):
         return f'<TaskLogger task_id={self.task_id} date={self.log_date}>'
 
+class TaskStatusHistory(db.Model):
+    """Run-length-encoded status history: one row per status a task held.
+
+    The task had ``status`` on every day in [valid_from, valid_to); an open
+    interval (valid_to is NULL) is the current status of an active task.
+    """
+    __tablename__ = 'task_status_history'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, db.ForeignKey('task_manager.id'), nullable=False)
+    status = db.Column(db.Enum(TaskStatus), nullable=False)
+    valid_from = db.Column(db.Date, nullable=False)
+    valid_to = db.Column(db.Date)
+    
+    __table_args__ = (
+        db.Index('idx_task_status_history_task_valid_to', 'task_id', 'valid_to'),
+        db.Index('idx_task_status_history_valid_from', 'valid_from', 'valid_to'),
+        db.UniqueConstraint('task_id', 'valid_from', name='uq_task_status_history_task_from'),
+    )
+    
+    def __repr__(self):
+        return f'<TaskStatusHistory task_id={self.task_id} {self.valid_from}..{self.valid_to}>'
+
+class TaskStatusRollup(db.Model):
+    """Number of tasks logged per day by status, priority and creator.
+
+    Kept in step with the daily view by the loader and by task writes, so
+    dashboards read a few rows per day instead of scanning task_logger.
+    """
+    __tablename__ = 'task_status_rollup'
+    
+    log_date = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.Enum(TaskStatus), primary_key=True)
+    priority = db.Column(db.Integer, primary_key=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<TaskStatusRollup {self.log_date} {self.status} p{self.priority} count={self.task_count}>'
+
 class TaskAuditLog(db.Model):
     __tablename__ = 'task_audit_log'
     
@@ -1,13 +1,38 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, abort, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatus, TaskAuditLog
-from app.extensions import db, cache, limiter
-from app.utils.decorators import role_required
-from app.utils.validators import validate_task_data
-from datetime import datetime
-import csv
-from io import StringIO
-from sqlalchemy import or_
+from app.blueprints.tasks.models import TaskManager, TaskLogger
+from app.extensions import db, cache
+from app.web_extensions import limiter
+from app.utils.decorators import role_required, conditional_get, read_only
+from app.utils.db_routing import read_from_primary
+from app.utils.validators import parse_task_data
+from app.services.task_service import (
+    import_tasks_from_csv, CsvImportError, diff_task_update,
+    create_tasks_batch, update_tasks_batch, writes_daily_logs, rollup_moves
+)
+from app.services.audit_service import audit_writer, serialize_audit_event, hot_cutoff
+from app.repositories.task_repository import (
+    paginate_task_logs, get_task_log_detail, keyset_task_logs,
+    count_task_logs, estimate_task_log_count, keyset_audit_events,
+    task_export_query, task_log_export_query, stream_rows
+)
+from app.services.export_service import export_chunks, EXPORT_FORMATS
+from app.repositories.search_repository import search_terms, search_tasks
+from app.repositories.rollup_repository import adjust_rollup, rollup_stats, ROLLUP_DIMENSIONS
+from app.repositories.status_history_repository import (
+    open_status_intervals, record_status_transitions, close_status_intervals,
+    paginate_daily_status, keyset_daily_status, count_daily_status, daily_status_export_query,
+    get_status_interval_detail
+)
+from app.utils.exceptions import InvalidInput
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.utils.cache_versions import (
+    task_list_cache_key, invalidate_task_log_date, invalidate_task, invalidate_tasks,
+    task_list_etag
+)
+from app.services.task_cache import task_log_cache
+from datetime import datetime, date, timedelta
+import math
 
 tasks_bp = Blueprint('tasks', __name__)
 
@@ -25,113 +50,291 @@ def upload_csv():
         return jsonify({"error": "File must be a CSV"}), 400
     
     user_id = get_jwt_identity()
+    progress = {}
     
     try:
-        
-        stream = StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        tasks = []
-        for row in csv_reader:
-            
-            if not all(k in row for k in ['title', 'description', 'status']):
-                continue
-            
-            
-            task = TaskManager(
-                title=row['title'],
-                description=row['description'],
-                status=TaskStatus(row['status']),
-                created_by=user_id,
-                updated_by=user_id
-            )
-            
-            if 'due_date' in row and row['due_date']:
-                task.due_date = datetime.strptime(row['due_date'], '%Y-%m-%d')
-            
-            if 'priority' in row and row['priority']:
-                task.priority = int(row['priority'])
-            
-            db.session.add(task)
-            tasks.append(task)
-        
-        db.session.commit()
-        
-       
-        for task in tasks:
-            audit_log = TaskAuditLog(
-                task_id=task.id,
-                user_id=user_id,
-                action='create',
-                new_value=f"Task created via CSV upload: {task.title}"
-            )
-            db.session.add(audit_log)
-        
-        db.session.commit()
-        
-        return jsonify({"message": f"{len(tasks)} tasks created successfully"}), 201
+        result = import_tasks_from_csv(
+            file.stream,
+            user_id,
+            batch_size=current_app.config['CSV_IMPORT_BATCH_SIZE'],
+            max_errors=current_app.config['CSV_IMPORT_MAX_ERRORS'],
+            result=progress
+        )
+    
+    except CsvImportError as e:
+        db.session.rollback()
+        # Batches before the error are already committed.
+        invalidate_task_log_date(datetime.utcnow().date())
+        return jsonify({"error": str(e), "created": progress.get('created', 0), "batches": progress.get('batches', 0)}), 400
     
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+        invalidate_task_log_date(datetime.utcnow().date())
+        return jsonify({"error": str(e), "created": progress.get('created', 0), "batches": progress.get('batches', 0)}), 500
+    
+    if result['created']:
+        invalidate_task_log_date(datetime.utcnow().date())
+    status_code = 201 if result['created'] or not result['failed'] else 400
+    return jsonify({
+        "message": f"{result['created']} tasks created successfully",
+        **result
+    }), status_code
 
 @tasks_bp.route('/tasks', methods=['GET'])
 @jwt_required()
-@cache.cached(timeout=60, query_string=True)
+@conditional_get(task_list_etag)
+@cache.cached(timeout=60, make_cache_key=task_list_cache_key, response_filter=read_from_primary)
+@read_only
 def get_tasks():
     """Get paginated list of tasks with optional date filter."""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     date_filter = request.args.get('date', None)
     
-    query = TaskLogger.query
+    page = max(page, 1)
+    if per_page < 1:
+        per_page = 10
     
+    filter_date = None
     if date_filter:
         try:
             filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
-            query = query.filter_by(log_date=filter_date)
         except ValueError:
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
     
-  
-    paginated_tasks = query.paginate(page=page, per_page=per_page, error_out=False)
-    
-    tasks_data = []
-    for task in paginated_tasks.items:
-        tasks_data.append({
-            "id": task.id,
-            "task_id": task.task_id,
-            "status": task.status.value,
-            "log_date": task.log_date.isoformat(),
-            "title": task.task.title,
-            "description": task.task.description
-        })
+    if 'cursor' in request.args:
+        return _get_tasks_by_cursor(per_page, filter_date)
+    
+    if writes_daily_logs():
+        rows, total = paginate_task_logs(page, per_page, filter_date)
+    else:
+        rows, total = paginate_daily_status(
+            page, per_page, datetime.utcnow().date(), filter_date,
+            days=current_app.config['TASK_HISTORY_VIEW_DAYS']
+        )
+    
+    tasks_data = [_serialize_task_log_row(row) for row in rows]
     
     return jsonify({
         "tasks": tasks_data,
-        "total": paginated_tasks.total,
-        "pages": paginated_tasks.pages,
+        "total": total,
+        "pages": math.ceil(total / per_page),
         "current_page": page
     }), 200
 
+def _serialize_task_log_row(row):
+    return {
+        "id": row.id,
+        "task_id": row.task_id,
+        "status": row.status.value,
+        "log_date": row.log_date.isoformat(),
+        "title": row.title,
+        "description": row.description
+    }
+
+def _get_tasks_by_cursor(per_page, filter_date):
+    """Keyset-paginated listing, selected by passing a ``cursor`` parameter.
+    
+    An empty cursor starts at the newest log. ``total=estimate`` or
+    ``total=exact`` opts into a row count; by default none is computed.
+    """
+    cursor = request.args.get('cursor')
+    total_mode = request.args.get('total', 'none')
+    if total_mode not in ('none', 'estimate', 'exact'):
+        return jsonify({"error": "total must be one of none, estimate, exact"}), 400
+    
+    after = None
+    if cursor:
+        try:
+            log_date, log_id = decode_cursor(cursor)
+            after = (date.fromisoformat(log_date), int(log_id))
+        except (InvalidInput, ValueError, TypeError):
+            return jsonify({"error": "Invalid cursor"}), 400
+    
+    daily_logs = writes_daily_logs()
+    if daily_logs:
+        rows = keyset_task_logs(per_page + 1, after, filter_date)
+    else:
+        rows = keyset_daily_status(
+            per_page + 1, datetime.utcnow().date(), after, filter_date,
+            days=current_app.config['TASK_HISTORY_VIEW_DAYS']
+        )
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    
+    response = {
+        "tasks": [_serialize_task_log_row(row) for row in rows],
+        "next_cursor": encode_cursor([rows[-1].log_date.isoformat(), rows[-1].id]) if has_more else None,
+        "per_page": per_page
+    }
+    if not daily_logs and total_mode != 'none':
+        response["estimated_total" if total_mode == 'estimate' else "total"] = count_daily_status(
+            datetime.utcnow().date(), filter_date, days=current_app.config['TASK_HISTORY_VIEW_DAYS']
+        )
+    elif total_mode == 'estimate':
+        response["estimated_total"] = estimate_task_log_count(filter_date)
+    elif total_mode == 'exact':
+        response["total"] = count_task_logs(filter_date)
+    
+    return jsonify(response), 200
+
+@tasks_bp.route('/export/<dataset>', methods=['GET'])
+@jwt_required()
+@role_required('manager')
+@limiter.limit("5 per minute")
+@read_only
+def export(dataset):
+    """Stream ``tasks`` or daily ``logs`` as CSV or NDJSON.
+
+    ``start``/``end`` (inclusive, YYYY-MM-DD) filter tasks by creation day
+    and logs by log_date. Rows are read through a server-side cursor and
+    written as they arrive, so memory stays flat for any export size.
+    """
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        start = date.fromisoformat(request.args['start']) if request.args.get('start') else None
+        end = date.fromisoformat(request.args['end']) if request.args.get('end') else None
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    if dataset == 'tasks':
+        query = task_export_query(
+            datetime.combine(start, datetime.min.time()) if start else None,
+            datetime.combine(end + timedelta(days=1), datetime.min.time()) if end else None
+        )
+    elif dataset == 'logs' and writes_daily_logs():
+        query = task_log_export_query(start, end)
+    elif dataset == 'logs':
+        query = daily_status_export_query(datetime.utcnow().date(), start, end)
+    else:
+        abort(404)
+    
+    columns = list(query.selected_columns.keys()) if query is not None else ['id']
+    rows = stream_rows(query, current_app.config['EXPORT_BATCH_SIZE']) if query is not None else []
+    filename = f"{dataset}-{start or 'all'}-{end or 'all'}.{fmt}"
+    return Response(
+        stream_with_context(export_chunks(rows, columns, fmt)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@tasks_bp.route('/search', methods=['GET'])
+@jwt_required()
+@read_only
+def search():
+    """Full-text search over active task titles and descriptions.
+
+    Every word in ``q`` must match. Results are ranked best first and paged
+    with ``cursor``; ``limit`` caps the page size.
+    """
+    terms = search_terms(request.args.get('q', ''))
+    if not terms:
+        return jsonify({"error": "q must contain at least one word"}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            rank, task_id = decode_cursor(cursor)
+            after = (float(rank), int(task_id))
+        except (InvalidInput, ValueError, TypeError):
+            return jsonify({"error": "Invalid cursor"}), 400
+    
+    rows = search_tasks(terms, limit + 1, after)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    return jsonify({
+        "tasks": [
+            {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "status": row.status.value,
+                "priority": row.priority,
+                "due_date": row.due_date.isoformat() if row.due_date else None,
+                "rank": row.rank
+            }
+            for row in rows
+        ],
+        "next_cursor": encode_cursor([rows[-1].rank, rows[-1].id]) if has_more else None
+    }), 200
+
+@tasks_bp.route('/stats', methods=['GET'])
+@jwt_required()
+@read_only
+def get_task_stats():
+    """Per-day task counts from the rollup table.
+
+    ``start``/``end`` (inclusive, YYYY-MM-DD) default to the last 30 days;
+    ``group_by`` is a comma-separated subset of status, priority and
+    created_by; ``created_by`` filters to one creator.
+    """
+    try:
+        end = date.fromisoformat(request.args['end']) if request.args.get('end') else datetime.utcnow().date()
+        start = date.fromisoformat(request.args['start']) if request.args.get('start') else end - timedelta(days=29)
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    if start > end:
+        return jsonify({"error": "start must not be after end"}), 400
+    max_days = current_app.config.get('STATS_MAX_DAYS', 366)
+    if (end - start).days >= max_days:
+        return jsonify({"error": f"Date range may span at most {max_days} days"}), 400
+    
+    group_by = [dimension for dimension in request.args.get('group_by', 'status').split(',') if dimension]
+    if not group_by or any(dimension not in ROLLUP_DIMENSIONS for dimension in group_by):
+        return jsonify({"error": f"group_by must be a subset of {', '.join(ROLLUP_DIMENSIONS)}"}), 400
+    
+    days = {}
+    for row in rollup_stats(start, end, group_by, request.args.get('created_by', type=int)):
+        day = days.setdefault(row.log_date, {"log_date": row.log_date.isoformat(), "total": 0, "counts": []})
+        counts = {dimension: getattr(row, dimension) for dimension in group_by}
+        if 'status' in counts:
+            counts['status'] = counts['status'].value
+        day['counts'].append({**counts, "count": int(row.count)})
+        day['total'] += int(row.count)
+    
+    return jsonify({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "group_by": group_by,
+        "days": list(days.values())
+    }), 200
+
 @tasks_bp.route('/task/<int:task_logger_id>', methods=['GET'])
 @jwt_required()
+@conditional_get(task_log_cache.etag)
+@read_only
 def get_task(task_logger_id):
     """Get details of a specific task."""
-    task_log = TaskLogger.query.get_or_404(task_logger_id)
-    
-    return jsonify({
+    payload = task_log_cache.get(task_logger_id, _task_log_payload)
+    if payload is None:
+        abort(404)
+    return jsonify(payload), 200
+
+def _task_log_payload(task_logger_id):
+    if writes_daily_logs():
+        task_log = get_task_log_detail(task_logger_id)
+    else:
+        # The listing hands out interval ids in this mode.
+        task_log = get_status_interval_detail(task_logger_id)
+    if task_log is None:
+        return None
+    return {
         "id": task_log.id,
         "task_id": task_log.task_id,
         "status": task_log.status.value,
         "log_date": task_log.log_date.isoformat(),
         "notes": task_log.notes,
-        "title": task_log.task.title,
-        "description": task_log.task.description,
-        "priority": task_log.task.priority,
-        "due_date": task_log.task.due_date.isoformat() if task_log.task.due_date else None,
+        "title": task_log.title,
+        "description": task_log.description,
+        "priority": task_log.priority,
+        "due_date": task_log.due_date.isoformat() if task_log.due_date else None,
         "created_at": task_log.created_at.isoformat()
-    }), 200
+    }
 
 @tasks_bp.route('/task', methods=['POST'])
 @jwt_required()
@@ -141,50 +344,51 @@ def create_task():
     user_id = get_jwt_identity()
     
 
-    errors = validate_task_data(data)
+    payload, errors = parse_task_data(data)
     if errors:
         return jsonify({"errors": errors}), 400
     
     try:
       
         new_task = TaskManager(
-            title=data['title'],
-            description=data.get('description', ''),
-            status=TaskStatus(data.get('status', 'pending')),
-            priority=data.get('priority', 1),
+            **payload.model_dump(),
             created_by=user_id,
             updated_by=user_id
         )
         
-        if 'due_date' in data:
-            new_task.due_date = datetime.fromisoformat(data['due_date'])
-        
         db.session.add(new_task)
-        db.session.commit()
+        db.session.flush()
+        task_id = new_task.id
         
+        log_date = datetime.utcnow().date()
+        if writes_daily_logs():
+            log_entry = TaskLogger(
+                task_id=new_task.id,
+                status=new_task.status,
+                log_date=log_date,
+                notes="Initial task creation"
+            )
+            db.session.add(log_entry)
+        # Intervals are written in 'daily' mode too (one more INSERT) so
+        # switching TASK_HISTORY_STORE needs no backfill of recent tasks.
+        open_status_intervals([(task_id, new_task.status)], log_date)
+        # One upsert so /stats counts the new task today without scanning
+        # task_logger or waiting for the daily loader.
+        adjust_rollup([(log_date, new_task.status, new_task.priority, user_id, 1)])
         
-        log_entry = TaskLogger(
-            task_id=new_task.id,
-            status=new_task.status,
-            log_date=datetime.utcnow().date(),
-            notes="Initial task creation"
-        )
-        db.session.add(log_entry)
-        
-       
-        audit_log = TaskAuditLog(
+        audit_writer.record(
             task_id=new_task.id,
             user_id=user_id,
             action='create',
             new_value=f"Task created: {new_task.title}"
         )
-        db.session.add(audit_log)
         
         db.session.commit()
+        invalidate_task_log_date(log_date)
         
         return jsonify({
             "message": "Task created successfully",
-            "task_id": new_task.id
+            "task_id": task_id
         }), 201
     
     except Exception as e:
@@ -205,51 +409,42 @@ def update_task(task_id):
     if user_role != 'admin' and task.created_by != user_id:
         return jsonify({"error": "Not authorized to update this task"}), 403
     
+    if not task.is_active:
+        return jsonify({"error": "Task is deleted"}), 400
+    
     
-    errors = validate_task_data(data, update=True)
+    payload, errors = parse_task_data(data, update=True)
     if errors:
         return jsonify({"errors": errors}), 400
     
     try:
         
-        changes = []
-        
-        if 'title' in data and task.title != data['title']:
-            changes.append(f"title: {task.title} → {data['title']}")
-            task.title = data['title']
-        
-        if 'description' in data and task.description != data['description']:
-            changes.append(f"description updated")
-            task.description = data['description']
-        
-        if 'status' in data and task.status != TaskStatus(data['status']):
-            changes.append(f"status: {task.status.value} → {data['status']}")
-            task.status = TaskStatus(data['status'])
-        
-        if 'priority' in data and task.priority != int(data['priority']):
-            changes.append(f"priority: {task.priority} → {data['priority']}")
-            task.priority = int(data['priority'])
-        
-        if 'due_date' in data:
-            new_due_date = datetime.fromisoformat(data['due_date']) if data['due_date'] else None
-            if task.due_date != new_due_date:
-                changes.append(f"due_date: {task.due_date} → {new_due_date}")
-                task.due_date = new_due_date
+        changes, values = diff_task_update(task, payload.model_dump(exclude_unset=True))
+        old_title = task.title
+        today = datetime.utcnow().date()
+        adjust_rollup(rollup_moves(task, values, today))
+        for column, value in values.items():
+            setattr(task, column, value)
         
         task.updated_by = user_id
+        if 'status' in values:
+            record_status_transitions([(task_id, values['status'])], today)
         
         if changes:
-            
-            audit_log = TaskAuditLog(
+            audit_writer.record(
                 task_id=task.id,
                 user_id=user_id,
                 action='update',
-                old_value="\n".join([f"Before: {task.title}"]),
+                old_value=f"Before: {old_title}",
                 new_value="Changes:\n" + "\n".join(changes)
             )
-            db.session.add(audit_log)
         
         db.session.commit()
+        if changes:
+            invalidate_task(task_id, listing='title' in values or 'description' in values)
+        if 'status' in values and not writes_daily_logs():
+            # The interval-backed listing shows today's status live.
+            invalidate_task_log_date(today)
         
         return jsonify({"message": "Task updated successfully"}), 200
     
@@ -257,6 +452,76 @@ def update_task(task_id):
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+def _batch_items():
+    """Return the ``tasks`` list of a batch request body, or an error response."""
+    data = request.get_json(silent=True)
+    items = data.get('tasks') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({"error": "Body must be an object with a non-empty 'tasks' list"}), 400)
+    max_items = current_app.config.get('TASK_BATCH_MAX_ITEMS', 500)
+    if len(items) > max_items:
+        return None, (jsonify({"error": f"A batch may contain at most {max_items} tasks"}), 400)
+    return items, None
+
+@tasks_bp.route('/batch', methods=['POST'])
+@jwt_required()
+@limiter.limit("30 per minute")
+def create_tasks():
+    """Create up to TASK_BATCH_MAX_ITEMS tasks in one transaction.
+
+    Invalid items are reported per item; the valid ones are still created.
+    """
+    items, error = _batch_items()
+    if error:
+        return error
+    user_id = get_jwt_identity()
+
+    try:
+        results, log_date = create_tasks_batch(items, user_id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    created = sum(result['status'] == 'created' for result in results)
+    if created:
+        invalidate_task_log_date(log_date)
+    return jsonify({
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }), 201 if created else 400
+
+@tasks_bp.route('/batch', methods=['PATCH'])
+@jwt_required()
+@limiter.limit("30 per minute")
+def update_tasks():
+    """Update up to TASK_BATCH_MAX_ITEMS tasks, each identified by ``id``, in one transaction."""
+    items, error = _batch_items()
+    if error:
+        return error
+    user_id = get_jwt_identity()
+    user_role = get_jwt().get('role')
+
+    try:
+        results, changed_ids, listing_changed = update_tasks_batch(items, user_id, user_role == 'admin')
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    if changed_ids:
+        invalidate_tasks(changed_ids, listing=listing_changed)
+        if not writes_daily_logs():
+            invalidate_task_log_date(datetime.utcnow().date())
+
+    applied = sum(result['status'] in ('updated', 'unchanged') for result in results)
+    return jsonify({
+        "updated": len(changed_ids),
+        "failed": len(results) - applied,
+        "results": results
+    }), 200 if applied else 400
+
 @tasks_bp.route('/task/<int:task_id>', methods=['DELETE'])
 @jwt_required()
 @role_required('manager')
@@ -273,20 +538,67 @@ def delete_task(task_id):
         
         task.is_active = False
         task.updated_by = user_id
+        # The task still counts for the day it was deleted on. Closed in
+        # 'daily' mode too, like create_task opens it.
+        close_status_intervals([task_id], datetime.utcnow().date() + timedelta(days=1))
         
-        
-        audit_log = TaskAuditLog(
+        audit_writer.record(
             task_id=task.id,
             user_id=user_id,
             action='delete',
             new_value=f"Task marked as inactive: {task.title}"
         )
-        db.session.add(audit_log)
         
         db.session.commit()
+        invalidate_task(task_id)
         
         return jsonify({"message": "Task deleted successfully"}), 200
     
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@tasks_bp.route('/audit', methods=['GET'])
+@jwt_required()
+@role_required('manager')
+@read_only
+def get_audit_log():
+    """Keyset-paginated audit history, newest first.
+
+    Optional filters: ``task_id``, ``start`` (inclusive) and ``end``
+    (exclusive) as ISO dates or datetimes. Only the hot table is read;
+    months moved out by ``archive_audit_log`` live in the archive files.
+    ``archived_before`` is the hot cutoff and ``partial`` is true when the
+    range reaches back past it, so events may be missing from the pages.
+    """
+    limit = request.args.get('limit', 50, type=int)
+    limit = min(max(limit, 1), current_app.config['AUDIT_PAGE_MAX_SIZE'])
+    task_id = request.args.get('task_id', type=int)
+    
+    try:
+        start = datetime.fromisoformat(request.args['start']) if request.args.get('start') else None
+        end = datetime.fromisoformat(request.args['end']) if request.args.get('end') else None
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use ISO format (YYYY-MM-DD)"}), 400
+    
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            timestamp, event_id = decode_cursor(cursor)
+            after = (datetime.fromisoformat(timestamp), int(event_id))
+        except (InvalidInput, ValueError, TypeError):
+            return jsonify({"error": "Invalid cursor"}), 400
+    
+    rows = keyset_audit_events(limit + 1, task_id, start, end, after)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    cutoff = hot_cutoff(current_app.config['AUDIT_HOT_MONTHS'])
+    
+    return jsonify({
+        "events": [serialize_audit_event(row) for row in rows],
+        "next_cursor": encode_cursor([rows[-1].timestamp.isoformat(), rows[-1].id]) if has_more else None,
+        "limit": limit,
+        "archived_before": cutoff.isoformat(),
+        "partial": start is None or start < cutoff
+    }), 200
@@ -7,12 +7,95 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URI')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DB_CONNECT_RETRIES = int(os.getenv('DB_CONNECT_RETRIES', 5))
+    # Optional read replica for @read_only views; without it every query uses the primary.
+    SQLALCHEMY_BINDS = {'replica': os.getenv('DATABASE_REPLICA_URI')} if os.getenv('DATABASE_REPLICA_URI') else {}
+    DB_READ_YOUR_WRITES_SECONDS = int(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 5))
+    DB_REPLICA_RETRY_AFTER = int(os.getenv('DB_REPLICA_RETRY_AFTER', 30))
+    # Pool sizing per process type. Gunicorn sync workers serve one request at
+    # a time, Celery workers run long batch statements. DB_POOL_PROFILE picks
+    # one; unset, create_app uses the profile named after its role.
+    DB_POOL_PROFILE = os.getenv('DB_POOL_PROFILE')
+    DB_POOL_PROFILES = {
+        'web': {
+            'pool_size': int(os.getenv('WEB_DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.getenv('WEB_DB_MAX_OVERFLOW', 20)),
+            'pool_recycle': int(os.getenv('WEB_DB_POOL_RECYCLE', 3600)),
+            'pool_timeout': int(os.getenv('WEB_DB_POOL_TIMEOUT', 10)),
+            'pool_pre_ping': True,
+        },
+        'worker': {
+            'pool_size': int(os.getenv('WORKER_DB_POOL_SIZE', 2)),
+            'max_overflow': int(os.getenv('WORKER_DB_MAX_OVERFLOW', 2)),
+            'pool_recycle': int(os.getenv('WORKER_DB_POOL_RECYCLE', 3600)),
+            'pool_timeout': int(os.getenv('WORKER_DB_POOL_TIMEOUT', 60)),
+            'pool_pre_ping': True,
+        },
+    }
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))
     REDIS_URL = os.getenv('REDIS_URL')
-    CELERY_BROKER_URL = os.getenv('REDIS_URL')
-    CELERY_RESULT_BACKEND = os.getenv('REDIS_URL')
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'RedisCache')
+    CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', os.getenv('REDIS_URL'))
+    CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', os.getenv('REDIS_URL'))
+    # Run tasks in the calling process, e.g. to try the daily loader locally.
+    CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'false').lower() == 'true'
     RATE_LIMIT_DEFAULT = "200 per day;50 per hour"
+    RATELIMIT_HEADERS_ENABLED = True
+    # Shared across workers and hosts; see app.utils.rate_limit.LeasedRedisStorage.
+    RATELIMIT_STORAGE_URI = os.getenv(
+        'RATELIMIT_STORAGE_URI', f"leased+{REDIS_URL}" if REDIS_URL else 'memory://'
+    )
+    RATELIMIT_STRATEGY = 'moving-window'
+    RATELIMIT_STORAGE_OPTIONS = {
+        'lease_fraction': float(os.getenv('RATELIMIT_LEASE_FRACTION', 0.1)),
+        'lease_ttl': float(os.getenv('RATELIMIT_LEASE_TTL', 1.0)),
+        'fail_open_for': float(os.getenv('RATELIMIT_FAIL_OPEN_FOR', 30)),
+        'socket_timeout': float(os.getenv('RATELIMIT_REDIS_TIMEOUT', 0.05)),
+        'socket_connect_timeout': float(os.getenv('RATELIMIT_REDIS_TIMEOUT', 0.05)),
+    }
+    RATELIMIT_SWALLOW_ERRORS = True
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_CONCURRENCY = int(os.getenv('PASSWORD_HASH_MAX_CONCURRENCY', 4))
+    PASSWORD_HASH_WAIT_TIMEOUT = float(os.getenv('PASSWORD_HASH_WAIT_TIMEOUT', 5))
+    USER_CACHE_LOCAL_SIZE = int(os.getenv('USER_CACHE_LOCAL_SIZE', 1024))
+    USER_CACHE_LOCAL_TTL = int(os.getenv('USER_CACHE_LOCAL_TTL', 30))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 300))
+    # Pub/sub channel telling other processes to drop a changed user's context.
+    USER_CACHE_PUBSUB_URL = os.getenv('USER_CACHE_PUBSUB_URL', REDIS_URL)
+    TASK_CACHE_LOCAL_SIZE = int(os.getenv('TASK_CACHE_LOCAL_SIZE', 2048))
+    TASK_CACHE_LOCAL_TTL = int(os.getenv('TASK_CACHE_LOCAL_TTL', 30))
+    TASK_CACHE_TTL = int(os.getenv('TASK_CACHE_TTL', 300))
+    # Lifetime of cache version keys; keep it above every TTL of a value
+    # cached under a version (TASK_CACHE_TTL, the task log owner's day).
+    CACHE_VERSION_TTL = int(os.getenv('CACHE_VERSION_TTL', 2 * 86400))
+    # Pub/sub channel for dropping other processes' in-memory task payloads.
+    TASK_CACHE_PUBSUB_URL = os.getenv('TASK_CACHE_PUBSUB_URL', REDIS_URL)
+    TASK_BATCH_MAX_ITEMS = int(os.getenv('TASK_BATCH_MAX_ITEMS', 500))
+    CSV_IMPORT_BATCH_SIZE = int(os.getenv('CSV_IMPORT_BATCH_SIZE', 1000))
+    CSV_IMPORT_MAX_ERRORS = int(os.getenv('CSV_IMPORT_MAX_ERRORS', 1000))
+    USER_IMPORT_BATCH_SIZE = int(os.getenv('USER_IMPORT_BATCH_SIZE', 500))
+    USER_IMPORT_MAX_ERRORS = int(os.getenv('USER_IMPORT_MAX_ERRORS', 1000))
+    # 'async' buffers audit events in process memory after commit and loses
+    # the unflushed ones (up to AUDIT_FLUSH_INTERVAL seconds) if the process
+    # dies; 'sync' writes them in the request transaction.
+    AUDIT_LOG_MODE = os.getenv('AUDIT_LOG_MODE', 'sync')
+    AUDIT_BUFFER_SIZE = int(os.getenv('AUDIT_BUFFER_SIZE', 500))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', 1.0))
+    AUDIT_HOT_MONTHS = int(os.getenv('AUDIT_HOT_MONTHS', 3))
+    # Absolute path on storage shared by every worker (a mounted volume, not
+    # a container's own disk); archive_audit_log refuses to run without it.
+    AUDIT_ARCHIVE_DIR = os.getenv('AUDIT_ARCHIVE_DIR')
+    AUDIT_ARCHIVE_BATCH_SIZE = int(os.getenv('AUDIT_ARCHIVE_BATCH_SIZE', 10000))
+    AUDIT_PAGE_MAX_SIZE = int(os.getenv('AUDIT_PAGE_MAX_SIZE', 200))
+    TASK_HISTORY_STORE = os.getenv('TASK_HISTORY_STORE', 'daily')
+    # Days an unfiltered listing covers when TASK_HISTORY_STORE is 'intervals'.
+    TASK_HISTORY_VIEW_DAYS = int(os.getenv('TASK_HISTORY_VIEW_DAYS', 31))
+    STATS_MAX_DAYS = int(os.getenv('STATS_MAX_DAYS', 366))
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 5000))
+    DAILY_LOADER_CHUNK_SIZE = int(os.getenv('DAILY_LOADER_CHUNK_SIZE', 50000))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -20,6 +103,14 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    RATELIMIT_ENABLED = False
+    RATELIMIT_STORAGE_URI = 'memory://'
+    RATELIMIT_STORAGE_OPTIONS = {}
+    TASK_CACHE_PUBSUB_URL = None
+    USER_CACHE_PUBSUB_URL = None
+    CACHE_TYPE = 'SimpleCache'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    PASSWORD_HASH_WORKERS = 0
 
 class ProductionConfig(Config):
     pass
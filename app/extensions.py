@@ -1,39 +1,103 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
 from flask_caching import Cache
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-import redis
-from sqlalchemy import create_engine
-from sqlalchemy.exc import OperationalError
+from flask import current_app, has_app_context
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
 from sqlalchemy.pool import QueuePool
+from app.utils.metrics import registry
+from app.services.auth_service import PasswordHasher
+from app.utils.db_routing import RoutingSession
 import time
 import os
 
-db = SQLAlchemy()
-migrate = Migrate()
-jwt = JWTManager()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 cache = Cache()
-limiter = Limiter(key_func=get_remote_address)
+password_hasher = PasswordHasher()
+
+pool_checkout_wait = registry.histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting to check a connection out of the pool.'
+)
+pool_checkout_timeouts = registry.counter(
+    'db_pool_checkout_timeouts_total',
+    'Checkouts that gave up after pool_timeout.'
+)
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - started)
+
+def pool_status(engine, max_overflow=None):
+    """Return size/checked-out/overflow numbers for a queue-pooled engine.
+    
+    ``max_overflow`` defaults to the value configured in
+    SQLALCHEMY_ENGINE_OPTIONS. The numbers describe this process's pool.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    if max_overflow is None:
+        max_overflow = current_app.config['SQLALCHEMY_ENGINE_OPTIONS'].get('max_overflow', 10)
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(max_overflow, 0)
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "utilization": round(checked_out / capacity, 4) if capacity else 0.0
+    }
+
+def _pool_gauge(field):
+    def collect():
+        if not has_app_context():
+            return None
+        status = pool_status(db.engine)
+        return status[field] if status else None
+    return collect
+
+# Every process has its own pool, and a scrape is answered by one process,
+# so these gauges describe that process's pool only, not the deployment's.
+registry.gauge('db_pool_size', 'Configured number of persistent connections in this process.', _pool_gauge('size'))
+registry.gauge('db_pool_checked_out', 'Connections checked out in this process.', _pool_gauge('checked_out'))
+registry.gauge('db_pool_overflow', 'Overflow connections open in this process.', _pool_gauge('overflow'))
+registry.gauge('db_pool_utilization', "This process's checked-out connections over size + max_overflow.", _pool_gauge('utilization'))
+
+def _engine_options(app):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from the configured pool profile.
+    
+    Explicit SQLALCHEMY_ENGINE_OPTIONS win over the profile. In-memory SQLite
+    keeps Flask-SQLAlchemy's StaticPool, which takes no pool sizing options.
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+    
+    profile = app.config['DB_POOL_PROFILES'][app.config['DB_POOL_PROFILE']]
+    return {"poolclass": InstrumentedQueuePool, **profile, **options}
 
 def initialize_db(app):
-    max_retries = 5
+    max_retries = app.config.get('DB_CONNECT_RETRIES', 5)
     retry_delay = 2
     
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options(app)
+    db.init_app(app)
+    
     for attempt in range(max_retries):
         try:
-           
-            engine = create_engine(
-                app.config['SQLALCHEMY_DATABASE_URI'],
-                poolclass=QueuePool,
-                pool_size=10,
-                max_overflow=20,
-                pool_recycle=3600,
-                pool_pre_ping=True
-            )
-            db.init_app(app)
-            migrate.init_app(app, db)
+            with app.app_context():
+                with db.engine.connect() as connection:
+                    connection.execute(text('SELECT 1'))
             break
         except OperationalError as e:
             if attempt == max_retries - 1:
@@ -41,13 +105,31 @@ def initialize_db(app):
             time.sleep(retry_delay)
             retry_delay *= 2
 
+def initialize_cache(app):
+    app.config['CACHE_REDIS_URL'] = app.config['REDIS_URL']
+    cache.init_app(app)
+
 def initialize_extensions(app):
+    """Initialize everything the web process uses to serve requests."""
+    from flask_migrate import Migrate
+    from app.web_extensions import jwt, limiter
+    
     initialize_db(app)
+    Migrate(app, db)
     jwt.init_app(app)
+    password_hasher.init_app(app)
     
+    from app.services.user_service import user_cache
+    from app.services.audit_service import audit_writer
+    from app.services.task_cache import task_log_cache
+    user_cache.init_app(app)
+    audit_writer.init_app(app)
+    task_log_cache.init_app(app)
     
-    app.config['CACHE_REDIS_URL'] = app.config['REDIS_URL']
-    cache.init_app(app)
-    
-   
-    limiter.init_app(app)
\ No newline at end of file
+    initialize_cache(app)
+    limiter.init_app(app)
+
+def initialize_worker_extensions(app):
+    """Initialize only what Celery tasks use: the database and the cache."""
+    initialize_db(app)
+    initialize_cache(app)
@@ -0,0 +1,55 @@
+"""Rebuild task_status_rollup for past days.
+
+    python -m app.migration.backfill_status_rollup [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+
+Each day is rebuilt and committed on its own, from task_logger or, with
+TASK_HISTORY_STORE = 'intervals', from task_status_history. Priorities are
+the tasks' current ones; task_logger never recorded them.
+"""
+import argparse
+import json
+from datetime import date, timedelta
+from flask import current_app
+from sqlalchemy import select, func
+from app.extensions import db
+from app.blueprints.tasks.models import TaskLogger, TaskStatusHistory
+from app.repositories.rollup_repository import rebuild_rollup_from_daily_logs, rebuild_rollup_from_intervals
+
+
+def backfill_status_rollup(start=None, end=None):
+    """Rebuild the rollup for every day in [start, end]. Returns the number of days rebuilt."""
+    intervals = current_app.config.get('TASK_HISTORY_STORE', 'daily') == 'intervals'
+    if start is None or end is None:
+        column = TaskStatusHistory.valid_from if intervals else TaskLogger.log_date
+        first, last = db.session.execute(select(func.min(column), func.max(column))).one()
+        if first is None:
+            return 0
+        start = start or first
+        end = end or (date.today() if intervals else last)
+
+    rebuild = rebuild_rollup_from_intervals if intervals else rebuild_rollup_from_daily_logs
+    days = 0
+    day = start
+    while day <= end:
+        rebuild(day)
+        db.session.commit()
+        days += 1
+        day += timedelta(days=1)
+    return days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--start', type=date.fromisoformat)
+    parser.add_argument('--end', type=date.fromisoformat)
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        print(json.dumps({"days": backfill_status_rollup(args.start, args.end)}))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
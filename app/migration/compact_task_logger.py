@@ -0,0 +1,107 @@
+"""Compact task_logger's one-row-per-day history into task_status_history intervals.
+
+    python -m app.migration.compact_task_logger [--chunk-size N] [--prune]
+
+Runs in task id ranges, one transaction per range, so it can be stopped
+and rerun. A task's daily rows are only converted for days before its
+earliest existing interval, so history already written by the
+application is kept and a second run adds nothing. ``--prune`` deletes the
+converted ``task_logger`` rows; only use it once TASK_HISTORY_STORE is
+'intervals' everywhere.
+"""
+import argparse
+import json
+from datetime import timedelta
+from itertools import groupby
+from sqlalchemy import select, insert, delete, func
+from app.extensions import db
+from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatusHistory
+from app.repositories.status_history_repository import first_interval_starts
+
+ONE_DAY = timedelta(days=1)
+
+
+def _intervals(logs, latest, history_starts):
+    """Turn task_logger rows sorted by (task_id, log_date) into interval rows.
+
+    Consecutive days with the same status become one interval and a missing
+    day ends it. A task's last interval stays open when the task is active,
+    was logged on the latest log date and has no later history; otherwise
+    it ends where the existing history begins, or the day after its last log.
+    """
+    intervals = []
+    for task_id, rows in groupby(logs, key=lambda row: row.task_id):
+        runs = []
+        for row in rows:
+            if runs and runs[-1]['status'] == row.status and runs[-1]['last'] + ONE_DAY == row.log_date:
+                runs[-1]['last'] = row.log_date
+            else:
+                runs.append({"status": row.status, "first": row.log_date, "last": row.log_date})
+        is_active = row.is_active
+
+        for run in runs:
+            intervals.append({
+                "task_id": task_id,
+                "status": run['status'],
+                "valid_from": run['first'],
+                "valid_to": run['last'] + ONE_DAY,
+            })
+        existing_start = history_starts.get(task_id)
+        if existing_start is not None:
+            intervals[-1]['valid_to'] = min(intervals[-1]['valid_to'], existing_start)
+        elif is_active and runs[-1]['last'] == latest:
+            intervals[-1]['valid_to'] = None
+    return intervals
+
+
+def compact_task_logs(chunk_size=1000, prune=False):
+    """Build task_status_history from task_logger. Returns counts of what was done."""
+    latest, min_task, max_task = db.session.execute(
+        select(func.max(TaskLogger.log_date), func.min(TaskLogger.task_id), func.max(TaskLogger.task_id))
+    ).one()
+    result = {"log_rows": 0, "intervals": 0, "pruned": 0, "chunks": 0}
+    if latest is None:
+        return result
+
+    for id_from in range(min_task, max_task + 1, chunk_size):
+        id_to = id_from + chunk_size
+        history_starts = first_interval_starts(id_from, id_to)
+        logs = [
+            row for row in db.session.execute(
+                select(TaskLogger.task_id, TaskLogger.status, TaskLogger.log_date, TaskManager.is_active)
+                .join(TaskManager, TaskManager.id == TaskLogger.task_id)
+                .where(TaskLogger.task_id >= id_from, TaskLogger.task_id < id_to)
+                .order_by(TaskLogger.task_id, TaskLogger.log_date)
+            )
+            if row.task_id not in history_starts or row.log_date < history_starts[row.task_id]
+        ]
+        intervals = _intervals(logs, latest, history_starts)
+        if intervals:
+            db.session.execute(insert(TaskStatusHistory.__table__), intervals)
+        if prune:
+            result['pruned'] += db.session.execute(
+                delete(TaskLogger).where(TaskLogger.task_id >= id_from, TaskLogger.task_id < id_to)
+            ).rowcount
+        db.session.commit()
+
+        result['log_rows'] += len(logs)
+        result['intervals'] += len(intervals)
+        result['chunks'] += 1
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--prune', action='store_true')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        print(json.dumps(compact_task_logs(args.chunk_size, args.prune), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,21 @@
+"""Create the task full-text index on an existing database.
+
+    python -m app.migration.rebuild_search_index
+
+Only needed for databases whose task_manager table predates the index;
+new databases get it from create_all.
+"""
+from app.repositories.search_repository import rebuild_search_index
+
+
+def main(argv=None):
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        rebuild_search_index()
+    print("Search index rebuilt")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
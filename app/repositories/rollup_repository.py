@@ -0,0 +1,93 @@
+from collections import Counter
+from sqlalchemy import select, delete, func, literal, or_, Date
+from app.extensions import db
+from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatusHistory, TaskStatusRollup
+from app.repositories.task_repository import dialect_insert
+
+ROLLUP_KEY = ('log_date', 'status', 'priority', 'created_by')
+ROLLUP_DIMENSIONS = ('status', 'priority', 'created_by')
+
+
+def _adding_on_conflict(stmt):
+    """Make a rollup INSERT add its task_count to rows that already exist."""
+    return stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={"task_count": TaskStatusRollup.__table__.c.task_count + stmt.excluded.task_count}
+    )
+
+
+def _counts_by_key(log_date, model, *conditions):
+    """SELECT of rollup rows for log_date counted from task_logger or task_status_history."""
+    priority = func.coalesce(TaskManager.priority, 1)
+    return (
+        select(literal(log_date, Date), model.status, priority, TaskManager.created_by, func.count())
+        .join(TaskManager, TaskManager.id == model.task_id)
+        .where(*conditions)
+        .group_by(model.status, priority, TaskManager.created_by)
+    )
+
+
+def adjust_rollup(changes):
+    """Apply (log_date, status, priority, created_by, delta) changes with one upsert."""
+    totals = Counter()
+    for log_date, status, priority, created_by, delta in changes:
+        totals[(log_date, status, priority or 1, created_by)] += delta
+    rows = [dict(zip(ROLLUP_KEY, key), task_count=delta) for key, delta in totals.items() if delta]
+    if rows:
+        db.session.execute(_adding_on_conflict(dialect_insert(TaskStatusRollup.__table__)), rows)
+
+
+def rollup_daily_logs_created_at(log_date, id_from, id_to, created_at):
+    """Add the task_logger rows written for log_date at ``created_at`` to the rollup.
+
+    The daily loader stamps every row of a run with the same created_at, so
+    this counts exactly the rows that run inserted for [id_from, id_to) and a
+    rerun that inserts nothing adds nothing.
+    """
+    source = _counts_by_key(
+        log_date, TaskLogger,
+        TaskLogger.log_date == log_date,
+        TaskLogger.created_at == created_at,
+        TaskLogger.task_id >= id_from,
+        TaskLogger.task_id < id_to,
+    )
+    db.session.execute(_adding_on_conflict(
+        dialect_insert(TaskStatusRollup.__table__).from_select([*ROLLUP_KEY, 'task_count'], source)
+    ))
+
+
+def _replace_rollup(log_date, source):
+    db.session.execute(delete(TaskStatusRollup).where(TaskStatusRollup.log_date == log_date))
+    db.session.execute(
+        TaskStatusRollup.__table__.insert().from_select([*ROLLUP_KEY, 'task_count'], source)
+    )
+
+
+def rebuild_rollup_from_intervals(log_date):
+    """Replace log_date's rollup with counts of the status intervals covering that day."""
+    _replace_rollup(log_date, _counts_by_key(
+        log_date, TaskStatusHistory,
+        TaskStatusHistory.valid_from <= log_date,
+        or_(TaskStatusHistory.valid_to.is_(None), TaskStatusHistory.valid_to > log_date),
+    ))
+
+
+def rebuild_rollup_from_daily_logs(log_date):
+    """Replace log_date's rollup with counts of its task_logger rows."""
+    _replace_rollup(log_date, _counts_by_key(log_date, TaskLogger, TaskLogger.log_date == log_date))
+
+
+def rollup_stats(start, end, group_by=('status',), created_by=None):
+    """Return (log_date, *group_by, count) rows for log dates in [start, end], by date."""
+    columns = [getattr(TaskStatusRollup, dimension) for dimension in group_by]
+    total = func.sum(TaskStatusRollup.task_count)
+    query = (
+        select(TaskStatusRollup.log_date, *columns, total.label('count'))
+        .where(TaskStatusRollup.log_date >= start, TaskStatusRollup.log_date <= end)
+        .group_by(TaskStatusRollup.log_date, *columns)
+        .having(total != 0)
+        .order_by(TaskStatusRollup.log_date, *columns)
+    )
+    if created_by is not None:
+        query = query.where(TaskStatusRollup.created_by == created_by)
+    return db.session.execute(query).all()
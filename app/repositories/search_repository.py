@@ -0,0 +1,83 @@
+import re
+from sqlalchemy import select, text, func, cast, literal_column, and_, or_, table, column, Float
+from app.extensions import db
+from app.blueprints.tasks.models import TaskManager, SEARCH_DOCUMENT_SQL, search_index_ddl
+
+SEARCH_RESULT_COLUMNS = (
+    TaskManager.id,
+    TaskManager.title,
+    TaskManager.description,
+    TaskManager.status,
+    TaskManager.priority,
+    TaskManager.due_date,
+)
+
+_TOKEN = re.compile(r'\w+')
+_task_search = table('task_search', column('rowid'))
+
+
+def search_terms(query):
+    """Split a user query into the words the index can match."""
+    return _TOKEN.findall(query)
+
+
+def _ranked_matches(terms):
+    """Subquery of (id, rank) for active tasks matching every term; higher rank is better."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        document = literal_column(SEARCH_DOCUMENT_SQL)
+        tsquery = func.plainto_tsquery('english', ' '.join(terms))
+        return (
+            select(TaskManager.id.label('id'), cast(func.ts_rank_cd(document, tsquery), Float(53)).label('rank'))
+            .where(TaskManager.is_active, document.op('@@')(tsquery))
+            .subquery()
+        )
+    if dialect == 'sqlite':
+        # Quote every term so FTS5 query syntax in user input is matched literally.
+        match = ' '.join(f'"{term}"' for term in terms)
+        return (
+            select(_task_search.c.rowid.label('id'), (-func.bm25(literal_column('task_search'))).label('rank'))
+            .where(text('task_search MATCH :match').bindparams(match=match))
+            .subquery()
+        )
+    raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+
+def search_tasks(terms, limit, after=None):
+    """Return up to ``limit`` active tasks matching ``terms``, best match first.
+
+    ``after`` is the (rank, id) of the last row of the previous page.
+    """
+    matches = _ranked_matches(terms)
+    query = (
+        select(*SEARCH_RESULT_COLUMNS, matches.c.rank)
+        .join(matches, matches.c.id == TaskManager.id)
+        .where(TaskManager.is_active.is_(True))
+        .order_by(matches.c.rank.desc(), TaskManager.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        rank, task_id = after
+        query = query.where(or_(
+            matches.c.rank < rank,
+            and_(matches.c.rank == rank, TaskManager.id < task_id),
+        ))
+    return db.session.execute(query).all()
+
+
+def rebuild_search_index():
+    """Create the full-text index if missing and, on SQLite, reload it from task_manager.
+
+    Needed once for databases created before the index existed; after that
+    the index follows every write by itself.
+    """
+    dialect = db.session.get_bind().dialect.name
+    for statement in search_index_ddl(dialect):
+        db.session.execute(text(statement))
+    if dialect == 'sqlite':
+        db.session.execute(text("INSERT INTO task_search(task_search) VALUES ('delete-all')"))
+        db.session.execute(text(
+            "INSERT INTO task_search(rowid, title, description) "
+            "SELECT id, title, description FROM task_manager WHERE is_active"
+        ))
+    db.session.commit()
@@ -0,0 +1,258 @@
+from datetime import timedelta
+from sqlalchemy import select, insert, update, delete, func, literal, null, and_, or_, exists, Date
+from app.extensions import db
+from app.blueprints.tasks.models import TaskManager, TaskStatusHistory
+
+
+def open_status_intervals(entries, on_date):
+    """Start an open interval on ``on_date`` for each (task_id, status) pair."""
+    if entries:
+        db.session.execute(insert(TaskStatusHistory.__table__), [
+            {"task_id": task_id, "status": status, "valid_from": on_date}
+            for task_id, status in entries
+        ])
+
+
+def close_status_intervals(task_ids, on_date):
+    """End the open interval of each task so its last day is the one before ``on_date``."""
+    if task_ids:
+        db.session.execute(
+            update(TaskStatusHistory)
+            .where(TaskStatusHistory.task_id.in_(task_ids), TaskStatusHistory.valid_to.is_(None))
+            .values(valid_to=on_date)
+        )
+
+
+def record_status_transitions(entries, on_date):
+    """Move each (task_id, status) pair to its new status from ``on_date`` on.
+
+    Three set-based statements regardless of the number of tasks. A second
+    change on the same day replaces that day's interval instead of adding
+    a zero-length one.
+    """
+    if not entries:
+        return
+    task_ids = [task_id for task_id, _ in entries]
+    db.session.execute(
+        delete(TaskStatusHistory).where(
+            TaskStatusHistory.task_id.in_(task_ids),
+            TaskStatusHistory.valid_to.is_(None),
+            TaskStatusHistory.valid_from >= on_date,
+        )
+    )
+    close_status_intervals(task_ids, on_date)
+    open_status_intervals(entries, on_date)
+
+
+def open_missing_status_intervals(on_date, id_from, id_to):
+    """Open an interval on ``on_date`` for active tasks in [id_from, id_to) that have none.
+
+    Catches tasks written by paths that bypass the service layer. Returns
+    the number of intervals opened.
+    """
+    has_open_interval = exists().where(
+        TaskStatusHistory.task_id == TaskManager.id,
+        TaskStatusHistory.valid_to.is_(None),
+    )
+    source = (
+        select(TaskManager.id, TaskManager.status, literal(on_date, Date))
+        .where(
+            TaskManager.is_active.is_(True),
+            TaskManager.id >= id_from,
+            TaskManager.id < id_to,
+            ~has_open_interval,
+        )
+    )
+    stmt = insert(TaskStatusHistory.__table__).from_select(['task_id', 'status', 'valid_from'], source)
+    return db.session.execute(stmt).rowcount
+
+
+def first_interval_starts(id_from, id_to):
+    """Return {task_id: earliest valid_from} for tasks in [id_from, id_to) that have history."""
+    return dict(db.session.execute(
+        select(TaskStatusHistory.task_id, func.min(TaskStatusHistory.valid_from))
+        .where(TaskStatusHistory.task_id >= id_from, TaskStatusHistory.task_id < id_to)
+        .group_by(TaskStatusHistory.task_id)
+    ).all())
+
+
+def _date_series(start, end):
+    """Recursive CTE with one ``log_date`` row per day in [start, end]."""
+    days = select(literal(start, Date).label('log_date')).cte('days', recursive=True)
+    if db.session.get_bind().dialect.name == 'sqlite':
+        following = func.date(days.c.log_date, '+1 day')
+    else:
+        following = days.c.log_date + 1
+    return days.union_all(
+        select(following).where(days.c.log_date < literal(end, Date))
+    )
+
+
+def _daily_view(start, end):
+    """Materialize the per-day listing rows ``get_tasks`` expects from the intervals.
+
+    Each row carries the interval id as ``id``; it is unique per log_date,
+    so (log_date, id) keeps working as a keyset.
+    """
+    days = _date_series(start, end)
+    return (
+        select(
+            TaskStatusHistory.id,
+            TaskStatusHistory.task_id,
+            TaskStatusHistory.status,
+            days.c.log_date.label('log_date'),
+            TaskManager.title,
+            TaskManager.description,
+        )
+        .select_from(days)
+        .join(TaskStatusHistory, and_(
+            TaskStatusHistory.valid_from <= days.c.log_date,
+            or_(TaskStatusHistory.valid_to.is_(None), TaskStatusHistory.valid_to > days.c.log_date),
+        ))
+        .join(TaskManager, TaskManager.id == TaskStatusHistory.task_id)
+    )
+
+
+def _covers(day):
+    """Intervals whose task had their status on ``day``."""
+    return and_(
+        TaskStatusHistory.valid_from <= day,
+        or_(TaskStatusHistory.valid_to.is_(None), TaskStatusHistory.valid_to > day),
+    )
+
+
+def _history_bounds(today):
+    """Return the first day with history and ``today``, or (None, None) when there is none."""
+    first = db.session.execute(select(func.min(TaskStatusHistory.valid_from))).scalar_one()
+    if first is None or first > today:
+        return None, None
+    return first, today
+
+
+def _view_bounds(log_date, today, days):
+    """Return the (start, end) days a listing covers, or (None, None) when there are none.
+
+    Without a date filter the listing covers the last ``days`` days up to
+    ``today``, so the view never expands a task's whole history.
+    """
+    if log_date is not None:
+        return log_date, log_date
+    first, last = _history_bounds(today)
+    if first is None:
+        return None, None
+    return max(first, today - timedelta(days=days - 1)), last
+
+
+def _previous_covered_day(day, start):
+    """The latest day before ``day`` and not before ``start`` that some interval covers, or None."""
+    previous = day - timedelta(days=1)
+    if previous < start:
+        return None
+    if db.session.execute(select(exists().where(_covers(previous)))).scalar():
+        return previous
+    last_end = db.session.execute(
+        select(func.max(TaskStatusHistory.valid_to)).where(TaskStatusHistory.valid_to <= previous)
+    ).scalar_one()
+    if last_end is None or last_end - timedelta(days=1) < start:
+        return None
+    return last_end - timedelta(days=1)
+
+
+def count_daily_status(today, log_date=None, days=31):
+    """Number of daily rows the intervals expand to, for one day or the last ``days`` days."""
+    start, end = _view_bounds(log_date, today, days)
+    if start is None:
+        return 0
+    view = _daily_view(start, end).subquery()
+    return db.session.execute(select(func.count()).select_from(view)).scalar_one()
+
+
+def paginate_daily_status(page, per_page, today, log_date=None, days=31):
+    """Offset page of the daily view, in the same (rows, total) shape as paginate_task_logs."""
+    start, end = _view_bounds(log_date, today, days)
+    if start is None:
+        return [], 0
+    view = _daily_view(start, end).subquery()
+    total = db.session.execute(select(func.count()).select_from(view)).scalar_one()
+    rows = db.session.execute(
+        select(view)
+        .order_by(view.c.log_date, view.c.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    ).all()
+    return rows, total
+
+
+def keyset_daily_status(limit, today, after=None, log_date=None, days=31):
+    """Keyset page of the daily view ordered by (log_date, id) descending, like keyset_task_logs.
+
+    Seeks one day at a time, newest first, reading only the intervals that
+    cover that day, and skips days no interval covers.
+    """
+    start, end = _view_bounds(log_date, today, days)
+    if start is None:
+        return []
+    day, before_id = end, None
+    if after is not None:
+        if after[0] < start:
+            return []
+        if after[0] <= end:
+            day, before_id = after
+    rows = []
+    while day is not None and len(rows) < limit:
+        query = (
+            select(
+                TaskStatusHistory.id,
+                TaskStatusHistory.task_id,
+                TaskStatusHistory.status,
+                literal(day, Date).label('log_date'),
+                TaskManager.title,
+                TaskManager.description,
+            )
+            .join(TaskManager, TaskManager.id == TaskStatusHistory.task_id)
+            .where(_covers(day))
+            .order_by(TaskStatusHistory.id.desc())
+            .limit(limit - len(rows))
+        )
+        if before_id is not None:
+            query = query.where(TaskStatusHistory.id < before_id)
+        rows.extend(db.session.execute(query).all())
+        day, before_id = _previous_covered_day(day, start), None
+    return rows
+
+
+def get_status_interval_detail(interval_id):
+    """Return the detail row for a daily view id, shaped like get_task_log_detail's, or None.
+
+    An interval stands for every day it covers, so ``log_date`` is the day
+    it started. Intervals have no notes.
+    """
+    return db.session.execute(
+        select(
+            TaskStatusHistory.id,
+            TaskStatusHistory.task_id,
+            TaskStatusHistory.status,
+            TaskStatusHistory.valid_from.label('log_date'),
+            TaskManager.title,
+            TaskManager.description,
+            null().label('notes'),
+            TaskManager.created_at,
+            TaskManager.priority,
+            TaskManager.due_date,
+        )
+        .join(TaskManager, TaskManager.id == TaskStatusHistory.task_id)
+        .where(TaskStatusHistory.id == interval_id)
+    ).first()
+
+
+def daily_status_export_query(today, start=None, end=None):
+    """Daily view rows for log dates in [start, end] ordered by (log_date, id), or None if empty.
+
+    Open bounds default to the first day with history and ``today``.
+    """
+    first, last = _history_bounds(today)
+    start, end = start or first, end or last
+    if start is None or end is None or start > end:
+        return None
+    view = _daily_view(start, end).subquery()
+    return select(view).order_by(view.c.log_date, view.c.id)
@@ -0,0 +1,288 @@
+import json
+from sqlalchemy import select, insert, delete, func, literal, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskAuditLog
+
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def dialect_insert(table):
+    """Build the current dialect's INSERT, which supports ON CONFLICT clauses."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        raise NotImplementedError(f"Upsert is not supported on {dialect}")
+    return _DIALECT_INSERTS[dialect](table)
+
+
+def _insert_ignoring_duplicates(table, index_elements):
+    """Build an INSERT that skips rows violating the given unique key."""
+    return dialect_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def active_task_id_bounds():
+    """Return (min_id, max_id) of active tasks, or (None, None) if there are none."""
+    return db.session.execute(
+        select(func.min(TaskManager.id), func.max(TaskManager.id))
+        .where(TaskManager.is_active.is_(True))
+    ).one()
+
+
+def insert_missing_daily_logs(log_date, id_from, id_to, notes, created_at):
+    """Insert one TaskLogger row per active task in [id_from, id_to) for log_date.
+
+    Runs as a single INSERT ... SELECT; rows that already exist are skipped by
+    ``uq_task_logger_task_date``. Returns the number of rows inserted.
+    """
+    source = (
+        select(
+            TaskManager.id,
+            TaskManager.status,
+            literal(log_date, TaskLogger.log_date.type),
+            literal(notes, TaskLogger.notes.type),
+            literal(created_at, TaskLogger.created_at.type),
+        )
+        .where(
+            TaskManager.is_active.is_(True),
+            TaskManager.id >= id_from,
+            TaskManager.id < id_to,
+        )
+    )
+    stmt = _insert_ignoring_duplicates(
+        TaskLogger.__table__, ['task_id', 'log_date']
+    ).from_select(['task_id', 'status', 'log_date', 'notes', 'created_at'], source)
+    return db.session.execute(stmt).rowcount
+
+
+TASK_LOG_LISTING_COLUMNS = (
+    TaskLogger.id,
+    TaskLogger.task_id,
+    TaskLogger.status,
+    TaskLogger.log_date,
+    TaskManager.title,
+    TaskManager.description,
+)
+
+TASK_LOG_DETAIL_COLUMNS = TASK_LOG_LISTING_COLUMNS + (
+    TaskLogger.notes,
+    TaskLogger.created_at,
+    TaskManager.priority,
+    TaskManager.due_date,
+)
+
+
+def count_task_logs(log_date=None):
+    """Return the exact number of task logs, optionally for one day."""
+    query = select(func.count()).select_from(TaskLogger)
+    if log_date is not None:
+        query = query.where(TaskLogger.log_date == log_date)
+    return db.session.execute(query).scalar_one()
+
+
+def paginate_task_logs(page, per_page, log_date=None):
+    """Return (rows, total) for one page of the task log listing.
+
+    The page is fetched with a single joined, column-projected query, so the
+    parent TaskManager is never lazy loaded per row.
+    """
+    conditions = []
+    if log_date is not None:
+        conditions.append(TaskLogger.log_date == log_date)
+
+    total = count_task_logs(log_date)
+
+    rows = db.session.execute(
+        select(*TASK_LOG_LISTING_COLUMNS)
+        .join(TaskManager, TaskManager.id == TaskLogger.task_id)
+        .where(*conditions)
+        .order_by(TaskLogger.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    ).all()
+
+    return rows, total
+
+
+def get_task_log_detail(task_logger_id):
+    """Return the detail row for one task log, or None if it does not exist."""
+    return db.session.execute(
+        select(*TASK_LOG_DETAIL_COLUMNS)
+        .join(TaskManager, TaskManager.id == TaskLogger.task_id)
+        .where(TaskLogger.id == task_logger_id)
+    ).first()
+
+
+def keyset_task_logs(limit, after=None, log_date=None):
+    """Return up to ``limit`` listing rows ordered by (log_date, id) descending.
+
+    ``after`` is the (log_date, id) of the last row of the previous page; the
+    seek predicate is served by ``idx_task_logger_log_date_id`` so deep pages
+    cost the same as the first one.
+    """
+    query = (
+        select(*TASK_LOG_LISTING_COLUMNS)
+        .join(TaskManager, TaskManager.id == TaskLogger.task_id)
+        .order_by(TaskLogger.log_date.desc(), TaskLogger.id.desc())
+        .limit(limit)
+    )
+    if log_date is not None:
+        query = query.where(TaskLogger.log_date == log_date)
+    if after is not None:
+        query = query.where(tuple_(TaskLogger.log_date, TaskLogger.id) < tuple_(*after))
+    return db.session.execute(query).all()
+
+
+def estimate_task_log_count(log_date=None):
+    """Return the planner's row estimate for the listing on PostgreSQL.
+
+    Other databases fall back to an exact COUNT, which is cheap at the sizes
+    they are used for locally.
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return count_task_logs(log_date)
+
+    if log_date is None:
+        plan = db.session.execute(
+            text("EXPLAIN (FORMAT JSON) SELECT 1 FROM task_logger")
+        ).scalar_one()
+    else:
+        plan = db.session.execute(
+            text("EXPLAIN (FORMAT JSON) SELECT 1 FROM task_logger WHERE log_date = :log_date"),
+            {"log_date": log_date}
+        ).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def insert_audit_events(events):
+    """Bulk insert audit events (dicts of TaskAuditLog columns) with one Core INSERT."""
+    if events:
+        db.session.execute(insert(TaskAuditLog.__table__), events)
+
+
+AUDIT_EVENT_COLUMNS = (
+    TaskAuditLog.id,
+    TaskAuditLog.task_id,
+    TaskAuditLog.user_id,
+    TaskAuditLog.action,
+    TaskAuditLog.old_value,
+    TaskAuditLog.new_value,
+    TaskAuditLog.timestamp,
+)
+
+
+def keyset_audit_events(limit, task_id=None, start=None, end=None, after=None):
+    """Return up to ``limit`` audit events ordered by (timestamp, id) descending.
+
+    ``start`` is inclusive and ``end`` exclusive. ``after`` is the
+    (timestamp, id) of the last row of the previous page. Filtering by task
+    is served by ``idx_task_audit_task_id`` and time-only reads by
+    ``idx_task_audit_timestamp``.
+    """
+    query = (
+        select(*AUDIT_EVENT_COLUMNS)
+        .order_by(TaskAuditLog.timestamp.desc(), TaskAuditLog.id.desc())
+        .limit(limit)
+    )
+    if task_id is not None:
+        query = query.where(TaskAuditLog.task_id == task_id)
+    if start is not None:
+        query = query.where(TaskAuditLog.timestamp >= start)
+    if end is not None:
+        query = query.where(TaskAuditLog.timestamp < end)
+    if after is not None:
+        query = query.where(tuple_(TaskAuditLog.timestamp, TaskAuditLog.id) < tuple_(*after))
+    return db.session.execute(query).all()
+
+
+def oldest_audit_timestamp():
+    """Return the timestamp of the oldest audit event still in the hot table."""
+    return db.session.execute(select(func.min(TaskAuditLog.timestamp))).scalar_one()
+
+
+def audit_events_between(start, end, limit, after_id=0):
+    """Return up to ``limit`` audit events in [start, end) with id > after_id, by id."""
+    return db.session.execute(
+        select(*AUDIT_EVENT_COLUMNS)
+        .where(
+            TaskAuditLog.timestamp >= start,
+            TaskAuditLog.timestamp < end,
+            TaskAuditLog.id > after_id,
+        )
+        .order_by(TaskAuditLog.id)
+        .limit(limit)
+    ).all()
+
+
+def delete_audit_events_between(start, end, id_from, id_to):
+    """Delete audit events in [start, end) whose id is in [id_from, id_to]. Returns the count."""
+    return db.session.execute(
+        delete(TaskAuditLog).where(
+            TaskAuditLog.timestamp >= start,
+            TaskAuditLog.timestamp < end,
+            TaskAuditLog.id >= id_from,
+            TaskAuditLog.id <= id_to,
+        )
+    ).rowcount
+
+
+TASK_EXPORT_COLUMNS = (
+    TaskManager.id,
+    TaskManager.title,
+    TaskManager.description,
+    TaskManager.status,
+    TaskManager.priority,
+    TaskManager.due_date,
+    TaskManager.is_active,
+    TaskManager.created_at,
+    TaskManager.updated_at,
+    TaskManager.created_by,
+    TaskManager.updated_by,
+)
+
+TASK_LOG_EXPORT_COLUMNS = (
+    TaskLogger.id,
+    TaskLogger.task_id,
+    TaskLogger.status,
+    TaskLogger.log_date,
+    TaskLogger.notes,
+    TaskLogger.created_at,
+)
+
+
+def task_export_query(start=None, end=None):
+    """Tasks created in [start, end), ordered by id."""
+    query = select(*TASK_EXPORT_COLUMNS).order_by(TaskManager.id)
+    if start is not None:
+        query = query.where(TaskManager.created_at >= start)
+    if end is not None:
+        query = query.where(TaskManager.created_at < end)
+    return query
+
+
+def task_log_export_query(start=None, end=None):
+    """Task logs with log_date in [start, end], in idx_task_logger_log_date_id order."""
+    query = select(*TASK_LOG_EXPORT_COLUMNS).order_by(TaskLogger.log_date, TaskLogger.id)
+    if start is not None:
+        query = query.where(TaskLogger.log_date >= start)
+    if end is not None:
+        query = query.where(TaskLogger.log_date <= end)
+    return query
+
+
+def stream_rows(query, batch_size=5000):
+    """Yield the rows of ``query`` through a server-side cursor, ``batch_size`` at a time.
+
+    ``yield_per`` turns on ``stream_results``, so drivers that support it
+    (psycopg2 named cursors) never hold more than one batch in memory.
+    """
+    result = db.session.execute(query.execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
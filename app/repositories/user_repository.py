@@ -0,0 +1,35 @@
+from sqlalchemy import select, insert, or_
+from app.extensions import db
+from app.blueprints.auth.models import User
+
+USER_CONTEXT_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.role,
+    User.is_active,
+)
+
+
+def fetch_user_context_row(user_id):
+    """Return the columns cached for the acting user, or None if the user does not exist."""
+    return db.session.execute(
+        select(*USER_CONTEXT_COLUMNS).where(User.id == user_id)
+    ).first()
+
+
+def find_taken_identities(emails, usernames):
+    """Return (emails, usernames) from the given sets that already belong to a user."""
+    if not emails and not usernames:
+        return set(), set()
+    rows = db.session.execute(
+        select(User.email, User.username).where(
+            or_(User.email.in_(emails), User.username.in_(usernames))
+        )
+    ).all()
+    return {row.email for row in rows} & emails, {row.username for row in rows} & usernames
+
+
+def insert_users(rows):
+    """Bulk insert user rows with one Core INSERT."""
+    db.session.execute(insert(User.__table__), rows)
@@ -0,0 +1,275 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.blueprints.tasks.models import TaskAuditLog
+from app.repositories.task_repository import (
+    insert_audit_events, oldest_audit_timestamp, audit_events_between, delete_audit_events_between
+)
+from app.tasks.audit_writer import write_audit_events
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = '_pending_audit_events'
+
+
+class AuditWriter:
+    """Writes TaskAuditLog rows either inside the request transaction or in batches.
+
+    ``AUDIT_LOG_MODE = 'sync'`` adds each row to the current session, so it
+    commits with the mutation it describes. ``'async'`` keeps events on the
+    session until it commits, then moves them into a process buffer. The
+    buffer is flushed when it holds ``AUDIT_BUFFER_SIZE`` events or its
+    oldest event is ``AUDIT_FLUSH_INTERVAL`` seconds old. Each flush becomes
+    one ``write_audit_events`` Celery task, which acknowledges late and
+    retries; if the broker cannot be reached, the batch is inserted
+    directly, and if that fails too it goes back into the buffer.
+
+    Async mode is not at-least-once: between the commit and a successful
+    flush the events exist only in this process's memory, so a process that
+    dies in that window (up to ``AUDIT_FLUSH_INTERVAL`` seconds, longer while
+    both the broker and the database are down) loses them. Use ``'sync'``
+    where every event must survive.
+    """
+
+    def __init__(self, app=None):
+        self.mode = 'sync'
+        self.max_size = 500
+        self.interval = 1.0
+        self._app = None
+        self._buffer = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._app = app
+        self.mode = app.config.get('AUDIT_LOG_MODE', 'sync')
+        self.max_size = app.config.get('AUDIT_BUFFER_SIZE', 500)
+        self.interval = app.config.get('AUDIT_FLUSH_INTERVAL', 1.0)
+        if not self._listening:
+            event.listen(Session, 'after_commit', self._after_commit)
+            event.listen(Session, 'after_rollback', self._after_rollback)
+            atexit.register(self.flush)
+            self._listening = True
+
+    def record(self, task_id, user_id, action, old_value=None, new_value=None):
+        """Record one audit event for the current session's transaction."""
+        if self.mode == 'sync':
+            db.session.add(TaskAuditLog(
+                task_id=task_id,
+                user_id=user_id,
+                action=action,
+                old_value=old_value,
+                new_value=new_value
+            ))
+            return
+
+        db.session.info.setdefault(_PENDING_KEY, []).append({
+            "task_id": task_id,
+            "user_id": user_id,
+            "action": action,
+            "old_value": old_value,
+            "new_value": new_value,
+            "timestamp": datetime.utcnow().isoformat(),
+        })
+
+    def record_many(self, events):
+        """Record many audit events (dicts of TaskAuditLog columns) at once.
+
+        In sync mode they are bulk inserted in the current transaction.
+        """
+        if self.mode == 'sync':
+            insert_audit_events(events)
+            return
+
+        timestamp = datetime.utcnow().isoformat()
+        db.session.info.setdefault(_PENDING_KEY, []).extend(
+            {"old_value": None, "new_value": None, **item, "timestamp": timestamp}
+            for item in events
+        )
+
+    def _after_commit(self, session):
+        events = session.info.pop(_PENDING_KEY, None)
+        if events:
+            self.enqueue(events)
+
+    def _after_rollback(self, session):
+        session.info.pop(_PENDING_KEY, None)
+
+    def enqueue(self, events):
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.extend(events)
+            full = len(self._buffer) >= self.max_size
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    def _ensure_thread(self):
+        # Threads do not survive fork, so each gunicorn worker starts its own.
+        pid = os.getpid()
+        if self._thread is not None and self._thread_pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._thread_pid != pid or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread_pid = pid
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            with self._lock:
+                due = self._buffer and (
+                    len(self._buffer) >= self.max_size
+                    or time.monotonic() - self._oldest >= self.interval
+                )
+            if due:
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Failed to flush audit events")
+
+    def flush(self):
+        """Ship every buffered event now. Returns the number of events flushed."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._oldest = None
+        if not batch:
+            return 0
+
+        try:
+            write_audit_events.delay(batch)
+        except Exception:
+            logger.exception("Audit broker unavailable, writing %d events directly", len(batch))
+            with self._app.app_context():
+                try:
+                    insert_audit_events([
+                        {**item, "timestamp": datetime.fromisoformat(item['timestamp'])}
+                        for item in batch
+                    ])
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    self._requeue(batch)
+                    raise
+        return len(batch)
+
+    def _requeue(self, batch):
+        # Ahead of newer events, and aged from now so the next try waits an interval.
+        with self._lock:
+            self._buffer[:0] = batch
+            self._oldest = time.monotonic()
+
+
+audit_writer = AuditWriter()
+
+
+def month_start(moment):
+    """Return midnight on the first day of moment's month."""
+    return datetime(moment.year, moment.month, 1)
+
+
+def next_month(start):
+    """Return the first day of the month after ``start``."""
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+
+def hot_cutoff(hot_months, now=None):
+    """Start of the oldest of the last ``hot_months`` months; the current month is the first."""
+    cutoff = month_start(now or datetime.utcnow())
+    for _ in range(hot_months - 1):
+        cutoff = month_start(cutoff - timedelta(days=1))
+    return cutoff
+
+
+def serialize_audit_event(row):
+    return {
+        "id": row.id,
+        "task_id": row.task_id,
+        "user_id": row.user_id,
+        "action": row.action,
+        "old_value": row.old_value,
+        "new_value": row.new_value,
+        "timestamp": row.timestamp.isoformat(),
+    }
+
+
+def archive_audit_month(start, archive_dir, batch_size=10000):
+    """Move one calendar month of audit events out of task_audit_log into a gzip file.
+
+    Events are streamed by id into ``task_audit_log-YYYY-MM.<first>-<last>.ndjson.gz``,
+    written under a temporary name and renamed once complete. Only then are
+    they deleted from the table, one committed id range per read batch, so a
+    crash never loses events; at worst a rerun archives the rest of the month
+    into a second file. Returns (path, events archived); path is None when
+    the month holds no events.
+    """
+    end = next_month(start)
+    os.makedirs(archive_dir, exist_ok=True)
+    tmp_path = os.path.join(archive_dir, f".task_audit_log-{start:%Y-%m}.{os.getpid()}.tmp")
+    id_ranges = []
+    count = 0
+
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as archive:
+        after_id = 0
+        while True:
+            rows = audit_events_between(start, end, batch_size, after_id)
+            if not rows:
+                break
+            for row in rows:
+                archive.write(json.dumps(serialize_audit_event(row)) + '\n')
+            id_ranges.append((rows[0].id, rows[-1].id))
+            after_id = rows[-1].id
+            count += len(rows)
+    db.session.rollback()
+
+    if not count:
+        os.remove(tmp_path)
+        return None, 0
+
+    path = os.path.join(
+        archive_dir, f"task_audit_log-{start:%Y-%m}.{id_ranges[0][0]}-{id_ranges[-1][1]}.ndjson.gz"
+    )
+    os.replace(tmp_path, path)
+
+    for id_from, id_to in id_ranges:
+        delete_audit_events_between(start, end, id_from, id_to)
+        db.session.commit()
+    return path, count
+
+
+def archive_audit_events_before(cutoff, archive_dir, batch_size=10000):
+    """Archive every whole month of audit events older than ``cutoff``, oldest first.
+
+    ``cutoff`` is rounded down to the start of its month. Returns one
+    {"month", "path", "events"} entry per archived month.
+    """
+    cutoff = month_start(cutoff)
+    oldest = oldest_audit_timestamp()
+    archived = []
+    if oldest is None:
+        return archived
+
+    start = month_start(oldest)
+    while start < cutoff:
+        path, count = archive_audit_month(start, archive_dir, batch_size)
+        if count:
+            archived.append({"month": f"{start:%Y-%m}", "path": path, "events": count})
+        start = next_month(start)
+    return archived
@@ -0,0 +1,112 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+
+class HashingBusy(Exception):
+    """Raised when every hashing slot stays taken for longer than the wait timeout."""
+    pass
+
+
+def _canonical_method(method):
+    """Spell out the defaults werkzeug fills in, e.g. "pbkdf2" -> "pbkdf2:sha256:600000".
+
+    The result is the prefix werkzeug writes before the first ``$`` of a hash.
+    """
+    name, *args = method.split(':')
+    if name == 'pbkdf2':
+        args += ['sha256', str(DEFAULT_PBKDF2_ITERATIONS)][len(args):]
+    elif name == 'scrypt' and not args:
+        args = ['32768', '8', '1']
+    return ':'.join([name, *args])
+
+
+class PasswordHasher:
+    """Password hashing that runs outside the request thread.
+
+    Hashes are computed in a bounded process pool, and at most
+    ``PASSWORD_HASH_MAX_CONCURRENCY`` hashes per web process may be queued
+    or running at once. Requests beyond that wait up to
+    ``PASSWORD_HASH_WAIT_TIMEOUT`` seconds and then get ``HashingBusy``.
+    This keeps a login spike from using up every worker thread. With
+    ``PASSWORD_HASH_WORKERS = 0`` hashing runs inline, still behind the
+    concurrency cap.
+    """
+
+    def __init__(self, app=None):
+        self.method = 'pbkdf2:sha256:600000'
+        self.workers = 0
+        self.wait_timeout = 5.0
+        self._slots = threading.BoundedSemaphore(4)
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', self.workers)
+        self.wait_timeout = app.config.get('PASSWORD_HASH_WAIT_TIMEOUT', self.wait_timeout)
+        self._slots = threading.BoundedSemaphore(
+            app.config.get('PASSWORD_HASH_MAX_CONCURRENCY', 4)
+        )
+
+    def _get_executor(self):
+        # Pools do not survive fork, so each gunicorn worker builds its own.
+        pid = os.getpid()
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != pid:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._executor_pid = pid
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise HashingBusy()
+        try:
+            if not self.workers:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """Hash a password with the configured method."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords):
+        """Hash a batch of passwords, spread across every pool worker.
+
+        The whole batch uses a single concurrency slot.
+        """
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise HashingBusy()
+        try:
+            if not self.workers:
+                return [generate_password_hash(password, self.method) for password in passwords]
+            chunksize = max(1, len(passwords) // (self.workers * 4))
+            return list(self._get_executor().map(
+                generate_password_hash, passwords, [self.method] * len(passwords),
+                chunksize=chunksize
+            ))
+        finally:
+            self._slots.release()
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash."""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash was made with different parameters than the current method.
+
+        Compares the hash's method prefix as text; nothing is hashed.
+        """
+        return password_hash.split('$', 1)[0] != _canonical_method(self.method)
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
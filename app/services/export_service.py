@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def export_chunks(rows, columns, fmt, rows_per_chunk=1000):
+    """Serialize ``rows`` to CSV or NDJSON, yielding one string per ``rows_per_chunk`` rows.
+
+    The CSV header goes out on its own first, so clients get a byte before
+    the first query batch arrives. Memory stays at one chunk whatever the
+    number of rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+
+    def drain():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    if writer is not None:
+        writer.writerow(columns)
+        yield drain()
+
+    pending = 0
+    for row in rows:
+        values = [_plain(value) for value in row]
+        if writer is not None:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, values))) + '\n')
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield drain()
+            pending = 0
+
+    if pending:
+        yield drain()
@@ -0,0 +1,187 @@
+import logging
+import os
+from flask import has_app_context
+from app.extensions import cache
+from app.utils.cache_versions import (
+    get_versions, task_namespace, remember_task_log_owner, task_log_owner, task_log_etag
+)
+from app.utils.db_routing import read_from_primary
+from app.utils.lru import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'tasks:invalidate'
+
+
+class LocalInvalidationBus:
+    """Stand-in for Redis pub/sub when there is a single process.
+
+    The caches' ``invalidate`` drops the publishing process's entries
+    itself, so there is nobody left to tell.
+    """
+
+    def subscribe(self, handler, on_lost=None):
+        pass
+
+    def publish(self, message):
+        pass
+
+    def close(self):
+        pass
+
+
+class RedisInvalidationBus:
+    """Broadcasts invalidations to every process over a Redis pub/sub channel.
+
+    Each subscriber listens on a daemon thread. If the connection drops,
+    ``on_lost`` is called so the owner can stop trusting its local tier.
+    """
+
+    def __init__(self, url, channel=INVALIDATION_CHANNEL):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        self.channel = channel
+        self._thread = None
+
+    def subscribe(self, handler, on_lost=None):
+        def lost(error, pubsub, thread):
+            logger.warning("Task cache invalidation channel lost: %s", error)
+            thread.stop()
+            if on_lost is not None:
+                on_lost()
+
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: lambda message: handler(message['data'].decode())})
+        self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True, exception_handler=lost)
+
+    def publish(self, message):
+        try:
+            self._redis.publish(self.channel, message)
+        except self._errors as e:
+            logger.warning("Could not broadcast task cache invalidation: %s", e)
+
+    def close(self):
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+class TaskLogCache:
+    """Read-through cache of GET /task/<id> payloads: process LRU, Redis, then the database.
+
+    Entries carry the owning task's version from ``cache_versions``. Redis
+    entries are only trusted while that version is current, so the bump in
+    ``invalidate_tasks`` retires them in every process. LRU entries are
+    trusted without a round trip and are dropped when the invalidation
+    arrives on the pub/sub channel; ``TASK_CACHE_LOCAL_TTL`` bounds how long
+    a lost message can leave one stale. A hit in the LRU costs neither a
+    query nor a network call.
+    """
+
+    def __init__(self, app=None):
+        self.local = TTLLRUCache()
+        self.redis_ttl = 300
+        self.bus = LocalInvalidationBus()
+        self._subscribed_pid = None
+        self._invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.local = TTLLRUCache(
+            maxsize=app.config.get('TASK_CACHE_LOCAL_SIZE', 2048),
+            ttl=app.config.get('TASK_CACHE_LOCAL_TTL', 30)
+        )
+        self.redis_ttl = app.config.get('TASK_CACHE_TTL', 300)
+        self.bus.close()
+        url = app.config.get('TASK_CACHE_PUBSUB_URL')
+        self.bus = RedisInvalidationBus(url) if url else LocalInvalidationBus()
+        self._subscribed_pid = None
+
+    @staticmethod
+    def _redis_key(task_logger_id):
+        return f'task_log:{task_logger_id}'
+
+    def _subscribed(self):
+        # Subscriber threads do not survive fork, so each worker process subscribes itself.
+        if self._subscribed_pid == os.getpid():
+            return True
+        try:
+            self.bus.subscribe(self._on_message, on_lost=self._on_lost)
+        except Exception as e:
+            logger.warning("Task cache invalidation channel unavailable, skipping the local tier: %s", e)
+            return False
+        self.local.clear()
+        self._subscribed_pid = os.getpid()
+        return True
+
+    def _on_message(self, message):
+        task_ids = {int(task_id) for task_id in message.split(',') if task_id}
+        self._invalidations += 1
+        self.local.delete_where(lambda entry: entry['task_id'] in task_ids)
+
+    def _on_lost(self):
+        self._subscribed_pid = None
+        self.local.clear()
+
+    def local_entry(self, task_logger_id):
+        """The LRU entry for a task log, or None; never touches the network."""
+        if self._subscribed_pid != os.getpid():
+            return None
+        return self.local.get(task_logger_id)
+
+    def get(self, task_logger_id, load):
+        """Return the payload for a task log, calling ``load(task_logger_id)`` on a miss.
+
+        Returns None when ``load`` does. A payload is only cached when the
+        task's version was read before it was loaded, so a concurrent
+        update cannot leave it stored under the newer version, and only
+        kept in the LRU when no invalidation arrived meanwhile. Payloads
+        read from the replica are returned without being cached.
+        """
+        use_local = self._subscribed()
+        invalidations = self._invalidations
+        entry = self.local.get(task_logger_id) if use_local else None
+        if entry is not None:
+            return entry['payload']
+
+        entry = cache.get(self._redis_key(task_logger_id))
+        task_id = entry['task_id'] if entry is not None else task_log_owner(task_logger_id)
+        version = get_versions(task_namespace(task_id))[0] if task_id is not None else None
+        if entry is not None and entry['version'] == version:
+            if use_local and self._invalidations == invalidations:
+                self.local.set(task_logger_id, entry)
+            return entry['payload']
+
+        payload = load(task_logger_id)
+        if payload is None:
+            return None
+        if version is None or payload['task_id'] != task_id or not read_from_primary():
+            remember_task_log_owner(task_logger_id, payload['task_id'])
+            return payload
+
+        entry = {"task_id": task_id, "version": version, "payload": payload}
+        if use_local and self._invalidations == invalidations:
+            self.local.set(task_logger_id, entry)
+        cache.set(self._redis_key(task_logger_id), entry, timeout=self.redis_ttl)
+        return payload
+
+    def etag(self, task_logger_id):
+        """ETag for GET /task/<id>, answered from the LRU when it has the entry."""
+        entry = self.local_entry(task_logger_id)
+        if entry is not None:
+            return f"log-{task_logger_id}.{entry['version']}"
+        return task_log_etag(task_logger_id)
+
+    def invalidate(self, *task_ids):
+        """Drop cached payloads of these tasks here and tell the other processes."""
+        if not task_ids:
+            return
+        message = ','.join(str(int(task_id)) for task_id in task_ids)
+        self._on_message(message)
+        if has_app_context():
+            self.bus.publish(message)
+
+
+task_log_cache = TaskLogCache()
@@ -0,0 +1,320 @@
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import insert, select, update
+from app.extensions import db
+from app.blueprints.tasks.models import TaskManager, TaskLogger
+from app.services.audit_service import audit_writer
+from app.repositories.status_history_repository import open_status_intervals, record_status_transitions
+from app.repositories.rollup_repository import adjust_rollup
+from app.utils.validators import parse_task_batch
+
+CSV_REQUIRED_COLUMNS = ('title', 'description', 'status')
+
+
+def writes_daily_logs():
+    """Whether TaskLogger still gets one row per task per day (TASK_HISTORY_STORE = 'daily').
+
+    Status intervals are written in both modes, so switching to
+    'intervals' only needs the compaction migration for older history.
+    """
+    return current_app.config.get('TASK_HISTORY_STORE', 'daily') == 'daily'
+
+
+def rollup_moves(task, values, on_date):
+    """Rollup changes for a status or priority update made on ``on_date``.
+
+    task_logger rows are snapshots, so with TASK_HISTORY_STORE = 'daily'
+    updates leave the rollup alone; with 'intervals' today's counts follow
+    the task.
+    """
+    if writes_daily_logs() or not {'status', 'priority'} & values.keys():
+        return []
+    return [
+        (on_date, task.status, task.priority, task.created_by, -1),
+        (on_date, values.get('status', task.status), values.get('priority', task.priority), task.created_by, 1),
+    ]
+
+
+_TASK_VALUE_COLUMNS = ('title', 'description', 'status', 'priority', 'due_date')
+
+
+def _task_values_key(values):
+    """What identifies an inserted task row; the database drops a due_date's offset."""
+    key = [values[column] for column in _TASK_VALUE_COLUMNS]
+    if key[-1] is not None:
+        key[-1] = key[-1].replace(tzinfo=None)
+    return tuple(key)
+
+
+def _insert_task_rows(rows):
+    """Bulk insert task rows with one multi-row INSERT and return their ids in input order.
+
+    ``returning(..., sort_by_parameter_order=True)`` makes SQLite fall back
+    to one INSERT per row, so RETURNING is left unordered and ids are
+    matched back to rows by their values. Rows with equal values are
+    interchangeable; any row that still has no match takes the leftover
+    ids in ascending order.
+    """
+    table = TaskManager.__table__
+    returned = db.session.execute(
+        insert(table).returning(table.c.id, *(table.c[column] for column in _TASK_VALUE_COLUMNS)),
+        rows
+    ).mappings().all()
+
+    ids_by_key = defaultdict(list)
+    for row in sorted(returned, key=lambda row: row['id']):
+        ids_by_key[_task_values_key(row)].append(row['id'])
+    task_ids = []
+    for row in rows:
+        ids = ids_by_key.get(_task_values_key(row))
+        task_ids.append(ids.pop(0) if ids else None)
+    leftovers = iter(sorted(task_id for ids in ids_by_key.values() for task_id in ids))
+    return [task_id if task_id is not None else next(leftovers) for task_id in task_ids]
+
+
+class CsvImportError(Exception):
+    """Raised when an uploaded CSV cannot be imported at all."""
+    pass
+
+
+def _csv_row_payload(row):
+    """Map a CSV row onto the task schema's input; blank optional cells count as absent."""
+    data = {"title": (row.get('title') or '').strip(), "status": (row.get('status') or '').strip()}
+    data['description'] = row.get('description') or ''
+    for column in ('priority', 'due_date'):
+        if (row.get(column) or '').strip():
+            data[column] = row[column].strip()
+    return data
+
+
+def _insert_csv_batch(payloads, user_id):
+    """Bulk insert a batch of validated tasks plus their status intervals and audit rows, and commit."""
+    rows = [
+        {**payload.model_dump(), "created_by": user_id, "updated_by": user_id}
+        for payload in payloads
+    ]
+
+    task_ids = _insert_task_rows(rows)
+
+    audit_writer.record_many([
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "action": 'create',
+            "new_value": f"Task created via CSV upload: {values['title']}"
+        }
+        for task_id, values in zip(task_ids, rows)
+    ])
+    today = datetime.utcnow().date()
+    open_status_intervals([(task_id, values['status']) for task_id, values in zip(task_ids, rows)], today)
+    if not writes_daily_logs():
+        adjust_rollup([(today, values['status'], values['priority'], user_id, 1) for values in rows])
+    db.session.commit()
+    return len(task_ids)
+
+
+def import_tasks_from_csv(binary_stream, user_id, batch_size=1000, max_errors=1000, result=None):
+    """Stream tasks from a CSV file into the database in fixed-size batches.
+
+    Rows are decoded one at a time and validated a batch at a time with
+    ``parse_task_batch``, so memory use depends on ``batch_size`` and not on
+    the size of the upload. The valid rows of each batch are inserted with
+    Core bulk inserts and committed together with their audit rows.
+
+    Counts are kept in ``result`` (a new dict if not given) as batches
+    commit, so a caller that passes its own dict can still report what was
+    imported when the import raises.
+    """
+    text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text_stream)
+    result = {} if result is None else result
+    result.update(created=0, failed=0, batches=0, errors=[])
+
+    try:
+        fieldnames = reader.fieldnames or []
+        missing = [column for column in CSV_REQUIRED_COLUMNS if column not in fieldnames]
+        if missing:
+            raise CsvImportError(f"Missing required columns: {', '.join(missing)}")
+
+        batch = []
+
+        def flush(batch):
+            parsed = parse_task_batch([data for _, data in batch])
+            valid = [payload for payload, _ in parsed if payload is not None]
+            for (line_num, _), (payload, errors) in zip(batch, parsed):
+                if errors:
+                    result['failed'] += 1
+                    if len(result['errors']) < max_errors:
+                        result['errors'].append({"row": line_num, "errors": errors})
+            if valid:
+                result['created'] += _insert_csv_batch(valid, user_id)
+                result['batches'] += 1
+
+        for row in reader:
+            batch.append((reader.line_num, _csv_row_payload(row)))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+
+        if batch:
+            flush(batch)
+
+        result['errors_truncated'] = result['failed'] > len(result['errors'])
+        return result
+
+    except UnicodeDecodeError:
+        raise CsvImportError(
+            f"File must be UTF-8 encoded ({result['created']} tasks imported before the error)"
+        )
+
+    finally:
+        # Leave the underlying upload stream open for werkzeug to clean up.
+        text_stream.detach()
+
+
+def diff_task_update(task, values):
+    """Compare parsed update values with a task and return (changes, values).
+
+    ``values`` are the fields that were sent, already typed (see
+    ``TaskUpdateSchema``). Returns the human-readable audit lines and the
+    subset of columns that actually change. ``task`` may be a TaskManager
+    or any row with the same attributes.
+    """
+    changed = {column: value for column, value in values.items() if getattr(task, column) != value}
+    changes = []
+
+    if 'title' in changed:
+        changes.append(f"title: {task.title} → {changed['title']}")
+    if 'description' in changed:
+        changes.append("description updated")
+    if 'status' in changed:
+        changes.append(f"status: {task.status.value} → {changed['status'].value}")
+    if 'priority' in changed:
+        changes.append(f"priority: {task.priority} → {changed['priority']}")
+    if 'due_date' in changed:
+        changes.append(f"due_date: {task.due_date} → {changed['due_date']}")
+
+    return changes, changed
+
+
+def create_tasks_batch(items, user_id):
+    """Validate and insert many tasks in the current transaction.
+
+    Tasks, their initial TaskLogger rows, status intervals and audit rows
+    are written with one bulk INSERT each. Returns (results, log_date), with one result
+    per item in input order. The caller commits.
+    """
+    results = [None] * len(items)
+    rows = []
+    indexes = []
+
+    for index, (payload, errors) in enumerate(parse_task_batch(items)):
+        if errors:
+            results[index] = {"index": index, "status": 'invalid', "errors": errors}
+            continue
+        rows.append({**payload.model_dump(), "created_by": user_id, "updated_by": user_id})
+        indexes.append(index)
+
+    log_date = datetime.utcnow().date()
+    if rows:
+        task_ids = _insert_task_rows(rows)
+
+        if writes_daily_logs():
+            db.session.execute(insert(TaskLogger.__table__), [
+                {"task_id": task_id, "status": row['status'], "log_date": log_date, "notes": "Initial task creation"}
+                for task_id, row in zip(task_ids, rows)
+            ])
+        open_status_intervals([(task_id, row['status']) for task_id, row in zip(task_ids, rows)], log_date)
+        adjust_rollup([(log_date, row['status'], row['priority'], user_id, 1) for row in rows])
+        audit_writer.record_many([
+            {"task_id": task_id, "user_id": user_id, "action": 'create', "new_value": f"Task created: {row['title']}"}
+            for task_id, row in zip(task_ids, rows)
+        ])
+        for index, task_id in zip(indexes, task_ids):
+            results[index] = {"index": index, "status": 'created', "task_id": task_id}
+
+    return results, log_date
+
+
+def update_tasks_batch(items, user_id, is_admin):
+    """Validate and apply many task updates in the current transaction.
+
+    Referenced tasks are loaded with one query and changed with one bulk
+    UPDATE by primary key. Returns (results, changed_task_ids,
+    listing_changed); the caller commits.
+    """
+    results = [None] * len(items)
+    wanted = {}
+
+    payloads = parse_task_batch([
+        {key: value for key, value in data.items() if key != 'id'} if isinstance(data, dict) else data
+        for data in items
+    ], update=True)
+
+    for index, (data, (payload, errors)) in enumerate(zip(items, payloads)):
+        # bool is an int subclass; {"id": true} must not update task 1.
+        if not isinstance(data, dict) or not isinstance(data.get('id'), int) or isinstance(data['id'], bool):
+            results[index] = {"index": index, "status": 'invalid', "errors": ["Each item needs an integer id"]}
+            continue
+        if data['id'] in wanted:
+            results[index] = {"index": index, "status": 'invalid', "errors": ["Duplicate id in batch"]}
+            continue
+        if errors:
+            results[index] = {"index": index, "status": 'invalid', "errors": errors}
+            continue
+        wanted[data['id']] = (index, payload.model_dump(exclude_unset=True))
+
+    current = {
+        row.id: row for row in db.session.execute(
+            select(
+                TaskManager.id, TaskManager.created_by, TaskManager.title, TaskManager.description,
+                TaskManager.status, TaskManager.priority, TaskManager.due_date, TaskManager.is_active
+            ).where(TaskManager.id.in_(list(wanted)))
+        )
+    } if wanted else {}
+
+    now = datetime.utcnow()
+    updates = []
+    audit_events = []
+    rollup_changes = []
+    listing_changed = False
+    for task_id, (index, payload) in wanted.items():
+        task = current.get(task_id)
+        if task is None:
+            results[index] = {"index": index, "status": 'not_found', "task_id": task_id}
+            continue
+        if not is_admin and task.created_by != user_id:
+            results[index] = {"index": index, "status": 'forbidden', "task_id": task_id}
+            continue
+        if not task.is_active:
+            results[index] = {"index": index, "status": 'invalid', "task_id": task_id, "errors": ["Task is deleted"]}
+            continue
+
+        changes, values = diff_task_update(task, payload)
+        results[index] = {"index": index, "status": 'updated' if changes else 'unchanged', "task_id": task_id}
+        if not changes:
+            continue
+        listing_changed = listing_changed or 'title' in values or 'description' in values
+        updates.append({"id": task_id, "updated_by": user_id, "updated_at": now, **values})
+        rollup_changes.extend(rollup_moves(task, values, now.date()))
+        audit_events.append({
+            "task_id": task_id,
+            "user_id": user_id,
+            "action": 'update',
+            "old_value": f"Before: {task.title}",
+            "new_value": "Changes:\n" + "\n".join(changes),
+        })
+
+    if updates:
+        db.session.execute(update(TaskManager), updates)
+        record_status_transitions(
+            [(row['id'], row['status']) for row in updates if 'status' in row],
+            now.date()
+        )
+        adjust_rollup(rollup_changes)
+        audit_writer.record_many(audit_events)
+
+    return results, [row['id'] for row in updates], listing_changed
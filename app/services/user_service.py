@@ -0,0 +1,243 @@
+import logging
+import os
+from collections import namedtuple
+from flask import g, has_app_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import cache, db, password_hasher
+from app.blueprints.auth.models import User, RoleEnum
+from app.repositories.user_repository import (
+    fetch_user_context_row, find_taken_identities, insert_users
+)
+from app.utils.validators import validate_email, validate_password
+from app.utils.db_routing import read_from_primary
+from app.utils.lru import TTLLRUCache
+from app.services.task_cache import LocalInvalidationBus, RedisInvalidationBus
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'users:invalidate'
+
+UserContext = namedtuple('UserContext', ['id', 'username', 'email', 'role', 'is_active'])
+
+
+class UserContextCache:
+    """Three-tier lookup of the acting user: request memo, process LRU, Redis.
+
+    Entries are invalidated on commit of any change to a ``User`` row, and
+    the change is broadcast on ``USER_CACHE_PUBSUB_URL`` so every other
+    process drops its LRU copy too. Without a channel, or while it is down,
+    the LRU is skipped. ``USER_CACHE_LOCAL_TTL`` still bounds how long a
+    lost message can leave a deactivation or role change unnoticed.
+    Contexts read from the replica are only memoized for the request.
+    """
+
+    def __init__(self, app=None):
+        self.local = TTLLRUCache()
+        self.redis_ttl = 300
+        self.bus = LocalInvalidationBus()
+        self._subscribed_pid = None
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.local = TTLLRUCache(
+            maxsize=app.config.get('USER_CACHE_LOCAL_SIZE', 1024),
+            ttl=app.config.get('USER_CACHE_LOCAL_TTL', 30)
+        )
+        self.redis_ttl = app.config.get('USER_CACHE_TTL', 300)
+        self.bus.close()
+        url = app.config.get('USER_CACHE_PUBSUB_URL')
+        self.bus = RedisInvalidationBus(url, INVALIDATION_CHANNEL) if url else LocalInvalidationBus()
+        self._subscribed_pid = None
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._collect_changed_users)
+            event.listen(Session, 'after_commit', self._invalidate_changed_users)
+            event.listen(Session, 'after_rollback', self._discard_changed_users)
+            self._listening = True
+
+    @staticmethod
+    def _redis_key(user_id):
+        return f'user:{user_id}'
+
+    def _subscribed(self):
+        # Subscriber threads do not survive fork, so each worker process subscribes itself.
+        if self._subscribed_pid == os.getpid():
+            return True
+        try:
+            self.bus.subscribe(self._on_message, on_lost=self._on_lost)
+        except Exception as e:
+            logger.warning("User cache invalidation channel unavailable, skipping the local tier: %s", e)
+            return False
+        self.local.clear()
+        self._subscribed_pid = os.getpid()
+        return True
+
+    def _on_message(self, message):
+        for user_id in message.split(','):
+            if user_id:
+                self.local.delete(int(user_id))
+
+    def _on_lost(self):
+        self._subscribed_pid = None
+        self.local.clear()
+
+    def get(self, user_id):
+        """Return the UserContext for user_id, or None if there is no such user."""
+        user_id = int(user_id)
+        memo = g.setdefault('_user_contexts', {})
+        if user_id in memo:
+            return memo[user_id]
+
+        use_local = self._subscribed()
+        context = self.local.get(user_id) if use_local else None
+        if context is None:
+            context = cache.get(self._redis_key(user_id))
+            if context is None:
+                row = fetch_user_context_row(user_id)
+                if row is not None:
+                    context = UserContext(row.id, row.username, row.email, row.role.value, row.is_active)
+                    if not read_from_primary():
+                        memo[user_id] = context
+                        return context
+                    cache.set(self._redis_key(user_id), context, timeout=self.redis_ttl)
+            if context is not None and use_local:
+                self.local.set(user_id, context)
+
+        memo[user_id] = context
+        return context
+
+    def invalidate(self, *user_ids):
+        """Drop cached contexts for the given users here and tell the other processes."""
+        for user_id in user_ids:
+            self.local.delete(int(user_id))
+            if has_app_context():
+                cache.delete(self._redis_key(user_id))
+                g.get('_user_contexts', {}).pop(int(user_id), None)
+        if user_ids and has_app_context():
+            self.bus.publish(','.join(str(int(user_id)) for user_id in user_ids))
+
+    def _collect_changed_users(self, session, flush_context):
+        changed = session.info.setdefault('_changed_user_ids', set())
+        for instance in list(session.dirty) + list(session.deleted):
+            if isinstance(instance, User) and instance.id is not None:
+                changed.add(instance.id)
+
+    def _invalidate_changed_users(self, session):
+        changed = session.info.pop('_changed_user_ids', None)
+        if changed:
+            self.invalidate(*changed)
+
+    def _discard_changed_users(self, session):
+        session.info.pop('_changed_user_ids', None)
+
+
+user_cache = UserContextCache()
+
+
+def current_user_context():
+    """UserContext of the JWT identity on the current request."""
+    return user_cache.get(get_jwt_identity())
+
+
+def _validate_user_row(row):
+    """Return (values, errors) for one bulk-provisioning row; values is None when a field is not text."""
+    errors = [
+        f"{name.capitalize()} must be a string"
+        for name in ('username', 'email', 'password', 'role')
+        if row.get(name) is not None and not isinstance(row[name], str)
+    ]
+    if errors:
+        return None, errors
+
+    username = (row.get('username') or '').strip()
+    email = (row.get('email') or '').strip()
+    password = row.get('password') or ''
+
+    if not username or len(username) > 80:
+        errors.append("Username must be between 1 and 80 characters")
+    if not validate_email(email):
+        errors.append("Invalid email format")
+    if not validate_password(password):
+        errors.append("Password must be at least 8 characters")
+    try:
+        role = RoleEnum((row.get('role') or RoleEnum.USER.value).strip())
+    except ValueError:
+        errors.append(f"Invalid role: {row.get('role')!r}")
+        role = None
+
+    return {"username": username, "email": email, "password": password, "role": role}, errors
+
+
+def _provision_batch(batch, seen_emails, seen_usernames, result, max_errors):
+    def report(row_number, status, errors):
+        result[status] += 1
+        if len(result['errors']) < max_errors:
+            result['errors'].append({"row": row_number, "status": status, "errors": errors})
+
+    taken_emails, taken_usernames = find_taken_identities(
+        {values['email'] for _, values in batch},
+        {values['username'] for _, values in batch}
+    )
+
+    accepted = []
+    for row_number, values in batch:
+        errors = []
+        if values['email'] in taken_emails or values['email'] in seen_emails:
+            errors.append("Email already registered")
+        if values['username'] in taken_usernames or values['username'] in seen_usernames:
+            errors.append("Username already taken")
+        seen_emails.add(values['email'])
+        seen_usernames.add(values['username'])
+        if errors:
+            report(row_number, 'conflicts', errors)
+        else:
+            accepted.append(values)
+
+    if not accepted:
+        return
+
+    hashes = password_hasher.hash_many([values['password'] for values in accepted])
+    insert_users([
+        {
+            "username": values['username'],
+            "email": values['email'],
+            "password_hash": password_hash,
+            "role": values['role'],
+        }
+        for values, password_hash in zip(accepted, hashes)
+    ])
+    db.session.commit()
+    result['created'] += len(accepted)
+
+
+def bulk_create_users(rows, batch_size=500, max_errors=1000):
+    """Create users from an iterable of (row_number, dict) pairs in batches.
+
+    Each batch costs one uniqueness query, one parallel hashing call and one
+    INSERT. Rows that are invalid or collide with an existing user, or with
+    an earlier row of the same upload, are reported instead of inserted.
+    """
+    result = {"created": 0, "conflicts": 0, "invalid": 0, "errors": []}
+    seen_emails, seen_usernames = set(), set()
+    batch = []
+
+    for row_number, row in rows:
+        values, errors = _validate_user_row(row)
+        if errors:
+            result['invalid'] += 1
+            if len(result['errors']) < max_errors:
+                result['errors'].append({"row": row_number, "status": 'invalid', "errors": errors})
+            continue
+        batch.append((row_number, values))
+        if len(batch) >= batch_size:
+            _provision_batch(batch, seen_emails, seen_usernames, result, max_errors)
+            batch = []
+
+    if batch:
+        _provision_batch(batch, seen_emails, seen_usernames, result, max_errors)
+
+    result['errors_truncated'] = result['conflicts'] + result['invalid'] > len(result['errors'])
+    return result
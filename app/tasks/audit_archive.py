@@ -0,0 +1,41 @@
+# app/tasks/audit_archive.py
+from app.tasks.celery import celery
+from app.services.audit_service import archive_audit_events_before, hot_cutoff
+from flask import current_app
+import os
+import time
+
+
+@celery.task(bind=True)
+def archive_audit_log(self, hot_months=None):
+    """Move audit events older than AUDIT_HOT_MONTHS whole months into gzip archives.
+
+    Meant to run monthly from beat. Archives are NDJSON files in
+    AUDIT_ARCHIVE_DIR, one per month (or more if a run was interrupted).
+    The rows are deleted once archived, so nothing is moved unless
+    AUDIT_ARCHIVE_DIR is an absolute path; it should be storage every
+    worker shares and that outlives them, not a worker's own disk.
+    """
+    started = time.perf_counter()
+    archive_dir = current_app.config['AUDIT_ARCHIVE_DIR']
+    if not archive_dir or not os.path.isabs(archive_dir):
+        return {
+            "status": "error",
+            "message": "AUDIT_ARCHIVE_DIR must be an absolute path on shared storage",
+        }
+    if hot_months is None:
+        hot_months = current_app.config['AUDIT_HOT_MONTHS']
+
+    cutoff = hot_cutoff(hot_months)
+    archived = archive_audit_events_before(
+        cutoff,
+        archive_dir,
+        current_app.config['AUDIT_ARCHIVE_BATCH_SIZE'],
+    )
+    return {
+        "status": "success",
+        "cutoff": cutoff.isoformat(),
+        "months": archived,
+        "events_archived": sum(month['events'] for month in archived),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
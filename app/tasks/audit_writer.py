@@ -0,0 +1,22 @@
+# app/tasks/audit_writer.py
+from app.tasks.celery import celery
+from app.extensions import db
+from app.repositories.task_repository import insert_audit_events
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+
+@celery.task(bind=True, acks_late=True, max_retries=5)
+def write_audit_events(self, events):
+    """Bulk insert a batch of audit events shipped by the buffered audit writer."""
+    try:
+        insert_audit_events([
+            {**event, "timestamp": datetime.fromisoformat(event['timestamp'])}
+            for event in events
+        ])
+        db.session.commit()
+        return {"status": "success", "events_written": len(events)}
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        self.retry(exc=e, countdown=30)
+        return {"status": "error", "message": str(e)}
@@ -1,25 +1,27 @@
-# # app/tasks/celery.py
-# from celery import Celery
-
-# celery = Celery('myapp')
-
-# def init_celery(app):
-#     celery.conf.update(app.config)
-#     TaskBase = celery.Task
-
-#     class ContextTask(TaskBase):
-#         def __call__(self, *args, **kwargs):
-#             with app.app_context():
-#                 return TaskBase.__call__(self, *args, **kwargs)
+# app/tasks/celery.py
+from celery import Celery
 
-#     celery.Task = ContextTask
+# Loaded by the worker at startup; web processes import the tasks they send.
+TASK_MODULES = (
+    'app.tasks.daily_task_loader',
+    'app.tasks.audit_writer',
+    'app.tasks.audit_archive',
+)
 
-from celery import Celery
+celery = Celery('app')
 
-celery = Celery('myapp', broker='redis://redis:6379/0')  # 👈 use Docker service name
+def configure_celery(app):
+    """Take the broker and result backend from ``app.config``; enough to send tasks."""
+    celery.conf.update(
+        broker_url=app.config['CELERY_BROKER_URL'],
+        result_backend=app.config['CELERY_RESULT_BACKEND'],
+        task_always_eager=app.config['CELERY_TASK_ALWAYS_EAGER'],
+    )
 
 def init_celery(app):
-    celery.conf.update(app.config)
+    """Configure Celery for a worker: run every task inside ``app``'s context."""
+    configure_celery(app)
+    celery.conf.include = TASK_MODULES
 
     class ContextTask(celery.Task):
         def __call__(self, *args, **kwargs):
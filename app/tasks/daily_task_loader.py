@@ -1,81 +1,120 @@
-# from celery import Celery
-# from app.extensions import db, cache
-# from app.blueprints.tasks.models import TaskManager, TaskLogger
-# from datetime import datetime, date
-# from sqlalchemy.exc import SQLAlchemyError
-# import time
-
-# celery = Celery(__name__)
-
-# @celery.task(bind=True, max_retries=3)
-# def daily_task_loader(self):
-#     """Celery task to transfer active tasks from TaskManager to TaskLogger daily."""
-#     try:
-#         today = date.today()
-        
-#         # Get all active tasks
-#         active_tasks = TaskManager.query.filter_by(is_active=True).all()
-        
-#         for task in active_tasks:
-#             # Check if log already exists for today
-#             existing_log = TaskLogger.query.filter_by(
-#                 task_id=task.id,
-#                 log_date=today
-#             ).first()
-            
-#             if not existing_log:
-#                 # Create new log entry
-#                 log_entry = TaskLogger(
-#                     task_id=task.id,
-#                     status=task.status,
-#                     log_date=today,
-#                     notes=f"Automated daily log for {today}"
-#                 )
-#                 db.session.add(log_entry)
-        
-#         db.session.commit()
-#         cache.clear()  # Clear cache to reflect new logs
-        
-#         return {"status": "success", "tasks_processed": len(active_tasks)}
-    
-#     except SQLAlchemyError as e:
-#         db.session.rollback()
-#         self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
-#         return {"status": "error", "message": str(e)}
-
-
-# new code
 # app/tasks/daily_task_loader.py
 from app.tasks.celery import celery
-from app.extensions import db, cache
-from app.blueprints.tasks.models import TaskManager, TaskLogger
-from datetime import date
+from app.extensions import db
+from app.repositories.task_repository import active_task_id_bounds, insert_missing_daily_logs
+from app.repositories.status_history_repository import open_missing_status_intervals
+from app.repositories.rollup_repository import rollup_daily_logs_created_at, rebuild_rollup_from_intervals
+from app.services.task_service import writes_daily_logs
+from app.utils.cache_versions import invalidate_task_log_date
+from celery import chord
+from datetime import date, datetime
+from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
+import time
+
 
 @celery.task(bind=True, max_retries=3)
-def daily_task_loader(self):
+def load_daily_chunk(self, log_date, id_from, id_to, created_at):
+    """Log and open status intervals for the active tasks in [id_from, id_to).
+
+    One transaction per chunk. Every row of a run is stamped with the
+    same ``created_at`` and existing rows are skipped, so a retried or
+    repeated chunk adds nothing twice.
+    """
     try:
-        today = date.today()
-        active_tasks = TaskManager.query.filter_by(is_active=True).all()
+        today = date.fromisoformat(log_date)
+        now = datetime.fromisoformat(created_at)
+        rows_inserted = 0
+        if writes_daily_logs():
+            rows_inserted = insert_missing_daily_logs(
+                today, id_from, id_to, f"Automated daily log for {today}", now
+            )
+            if rows_inserted:
+                rollup_daily_logs_created_at(today, id_from, id_to, now)
+        intervals_opened = open_missing_status_intervals(today, id_from, id_to)
+        db.session.commit()
+        return {"rows_inserted": rows_inserted, "intervals_opened": intervals_opened}
 
-        for task in active_tasks:
-            existing_log = TaskLogger.query.filter_by(task_id=task.id, log_date=today).first()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise self.retry(exc=e, countdown=60)
 
-            if not existing_log:
-                log_entry = TaskLogger(
-                    task_id=task.id,
-                    status=task.status,
-                    log_date=today,
-                    notes=f"Automated daily log for {today}"
-                )
-                db.session.add(log_entry)
 
-        db.session.commit()
-        cache.clear()
+@celery.task(bind=True, max_retries=3)
+def finish_daily_load(self, results, log_date, started_at):
+    """Chord callback: add up the chunk results and invalidate the day's listings once.
+
+    With TASK_HISTORY_STORE = 'intervals' the day's rollup is rebuilt from
+    the intervals here, after every chunk has opened its missing ones, and
+    the listings are invalidated even when nothing was written.
+    """
+    try:
+        today = date.fromisoformat(log_date)
+        rows_inserted = sum(result['rows_inserted'] for result in results)
+        intervals_opened = sum(result['intervals_opened'] for result in results)
 
-        return {"status": "success", "tasks_processed": len(active_tasks)}
+        if not writes_daily_logs():
+            rebuild_rollup_from_intervals(today)
+            db.session.commit()
+
+        # In intervals mode today's rows exist from midnight without any
+        # write, so listings cached or ETag'd yesterday must go regardless.
+        if rows_inserted or intervals_opened or not writes_daily_logs():
+            invalidate_task_log_date(today)
+
+        return {
+            "status": "success",
+            "log_date": log_date,
+            "rows_inserted": rows_inserted,
+            "intervals_opened": intervals_opened,
+            "chunks": len(results),
+            "duration_ms": round((time.time() - started_at) * 1000, 2)
+        }
 
     except SQLAlchemyError as e:
         db.session.rollback()
-        self.retry(exc=e, countdown=60 * 5)
-        return {"status": "error", "message": str(e)}
+        raise self.retry(exc=e, countdown=60)
+
+
+def build_daily_load(today, chunk_size=None):
+    """Return the canvas that loads ``today``: one chunk task per id range, then the callback.
+
+    Chunks are DAILY_LOADER_CHUNK_SIZE ids wide and independent, so they
+    run in parallel on however many workers there are. Calling
+    ``.apply()`` on the result runs everything eagerly in this process.
+    """
+    chunk_size = chunk_size or current_app.config['DAILY_LOADER_CHUNK_SIZE']
+    log_date = today.isoformat()
+    created_at = datetime.utcnow().isoformat()
+    started_at = time.time()
+
+    min_id, max_id = active_task_id_bounds()
+    if min_id is None:
+        return finish_daily_load.si([], log_date, started_at)
+    return chord(
+        [
+            load_daily_chunk.si(log_date, id_from, id_from + chunk_size, created_at)
+            for id_from in range(min_id, max_id + 1, chunk_size)
+        ],
+        finish_daily_load.s(log_date, started_at)
+    )
+
+
+@celery.task(bind=True)
+def daily_task_loader(self, log_date=None):
+    """Copy every active task into TaskLogger for the day, fanned out over id ranges.
+
+    Every active task also gets an open status interval if it has none.
+    With TASK_HISTORY_STORE = 'intervals' that is all it does: the
+    intervals already describe the day, so no daily rows are written.
+    This task only plans the run; ``finish_daily_load`` reports the counts.
+    """
+    today = date.fromisoformat(log_date) if log_date else date.today()
+    load = build_daily_load(today)
+    result = load.apply_async()
+    return {
+        "status": "dispatched",
+        "log_date": today.isoformat(),
+        "chunks": len(load.tasks) if isinstance(load, chord) else 0,
+        "result_id": result.id,
+    }
@@ -1,7 +1,10 @@
 import pytest
+from flask_jwt_extended import create_access_token
 from app import create_app
-from app.extensions import db as _db
-from flask_migrate import upgrade
+from app.extensions import db as _db, cache
+from app.blueprints.auth.models import User, RoleEnum
+from app.services.user_service import user_cache
+from app.services.task_cache import task_log_cache
 
 @pytest.fixture(scope='session')
 def app():
@@ -13,9 +16,8 @@ def app():
 @pytest.fixture(scope='session')
 def db(app):
     """Create database for the tests."""
-    _db.app = app
     with app.app_context():
-        upgrade()
+        _db.create_all()
     yield _db
     _db.session.close()
     _db.drop_all()
@@ -27,17 +29,80 @@ def client(app):
 
 @pytest.fixture(scope='function')
 def session(db):
-    """Creates a new database session for a test."""
-    connection = db.engine.connect()
-    transaction = connection.begin()
+    """Provides a database session and empties every table afterwards."""
+    yield db.session
     
-    options = dict(bind=connection, binds={})
-    session = db.create_scoped_session(options=options)
+    db.session.rollback()
+    for table in reversed(db.metadata.sorted_tables):
+        db.session.execute(table.delete())
+    db.session.commit()
+    db.session.remove()
+    cache.clear()
+    user_cache.local.clear()
+    task_log_cache.local.clear()
+
+@pytest.fixture(scope='function')
+def make_user(session):
+    """Factory that inserts a user and returns it."""
+    def _make_user(username='manager', role=RoleEnum.MANAGER):
+        user = User(
+            username=username,
+            email=f'{username}@example.com',
+            password_hash='not-a-real-hash',
+            role=role
+        )
+        session.add(user)
+        session.commit()
+        return user
+    return _make_user
+
+@pytest.fixture(scope='function')
+def auth_headers(make_user):
+    """Factory that returns JWT headers for a freshly created user."""
+    def _auth_headers(username='manager', role=RoleEnum.MANAGER):
+        user = make_user(username, role)
+        token = create_access_token(
+            identity=user.id,
+            additional_claims={"role": role.value}
+        )
+        return {"Authorization": f"Bearer {token}"}
+    return _auth_headers
+
+@pytest.fixture(scope='function')
+def query_counter(db):
+    """Counts SQL statements executed on the engine while the fixture is active."""
+    from sqlalchemy import event
+    
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
     
-    db.session = session
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+@pytest.fixture(scope='function')
+def seed_task_logs(session, make_user):
+    """Factory that inserts tasks with one log row each and returns the logs."""
+    from datetime import date
+    from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatus
     
-    yield session
+    seeder = []
     
-    transaction.rollback()
-    connection.close()
-    session.remove()
\ No newline at end of file
+    def _seed_task_logs(count, log_date=date(2030, 1, 1), user=None):
+        if user is None:
+            if not seeder:
+                seeder.append(make_user('seeder'))
+            user = seeder[0]
+        logs = []
+        for i in range(count):
+            task = TaskManager(title=f"Task {i}", description=f"Description {i}", created_by=user.id)
+            session.add(task)
+            session.flush()
+            log = TaskLogger(task_id=task.id, status=TaskStatus.PENDING, log_date=log_date)
+            session.add(log)
+            logs.append(log)
+        session.commit()
+        return logs
+    return _seed_task_logs
@@ -0,0 +1,44 @@
+from io import BytesIO
+from app.blueprints.auth.models import User, RoleEnum
+
+def test_bulk_create_users_json(app, client, session, auth_headers, make_user, monkeypatch):
+    """Test bulk provisioning inserts in batches and reports conflicts per row."""
+    monkeypatch.setitem(app.config, 'USER_IMPORT_BATCH_SIZE', 2)
+    headers = auth_headers('root', RoleEnum.ADMIN)
+    make_user('existing', RoleEnum.USER)
+    
+    response = client.post('/api/admin/users/bulk', headers=headers, json={'users': [
+        {'username': 'alice', 'email': 'alice@example.com', 'password': 'password1'},
+        {'username': 'bob', 'email': 'bob@example.com', 'password': 'password2', 'role': 'manager'},
+        {'username': 'existing', 'email': 'new@example.com', 'password': 'password3'},
+        {'username': 'alice2', 'email': 'alice@example.com', 'password': 'password4'},
+        {'username': 'carol', 'email': 'not-an-email', 'password': 'short'},
+        {'username': ['dave'], 'email': 'dave@example.com', 'password': 12345678, 'role': 1},
+    ]})
+    
+    assert response.status_code == 201
+    body = response.get_json()
+    assert (body['created'], body['conflicts'], body['invalid']) == (2, 2, 2)
+    assert {(e['row'], e['status']) for e in body['errors']} == {
+        (3, 'conflicts'), (4, 'conflicts'), (5, 'invalid'), (6, 'invalid')
+    }
+    assert body['errors'][-1]['errors'] == [
+        "Username must be a string", "Password must be a string", "Role must be a string"
+    ]
+    assert User.query.filter_by(username='bob').one().role == RoleEnum.MANAGER
+
+def test_bulk_create_users_csv(client, session, auth_headers):
+    """Test bulk provisioning from a CSV upload."""
+    headers = auth_headers('root', RoleEnum.ADMIN)
+    csv_bytes = b"username,email,password\ndave,dave@example.com,password1\n"
+    
+    response = client.post(
+        '/api/admin/users/bulk',
+        data={'file': (BytesIO(csv_bytes), 'users.csv')},
+        headers=headers,
+        content_type='multipart/form-data'
+    )
+    
+    assert response.status_code == 201
+    assert response.get_json()['created'] == 1
+    assert User.query.filter_by(email='dave@example.com').count() == 1
@@ -0,0 +1,18 @@
+import pytest
+from app import create_app
+from app.benchmarks.startup import probe
+
+def test_worker_profile_skips_web_setup():
+    """Test the worker app loads its tasks but no blueprints, JWT, rate limiter, CORS or Alembic."""
+    worker = probe('worker', 'testing')
+    
+    assert worker['blueprints'] == []
+    assert sorted(worker['extensions']) == ['cache', 'sqlalchemy']
+    assert worker['db_pool_profile'] == 'worker'
+    assert 'app.tasks.daily_task_loader' in worker['task_modules']
+    assert not {'flask_cors', 'flask_migrate', 'flask_jwt_extended', 'flask_limiter'} & set(worker['packages'])
+
+def test_create_app_rejects_unknown_role():
+    """Test an unknown process role fails fast."""
+    with pytest.raises(ValueError):
+        create_app('testing', role='scheduler')
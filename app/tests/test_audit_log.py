@@ -0,0 +1,69 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from app.blueprints.tasks.models import TaskManager, TaskAuditLog
+from app.tasks.audit_archive import archive_audit_log
+
+def _seed_audit_events(session, user, timestamps):
+    task = TaskManager(title="Audited task", created_by=user.id)
+    session.add(task)
+    session.flush()
+    for timestamp in timestamps:
+        session.add(TaskAuditLog(task_id=task.id, user_id=user.id, action='update', timestamp=timestamp))
+    session.commit()
+    return task.id
+
+def test_audit_log_endpoint_pages_by_task_and_time(client, session, make_user, auth_headers):
+    """Test the audit endpoint filters by task and time range and pages with a cursor."""
+    headers = auth_headers()
+    user = make_user('auditor')
+    base = datetime(2030, 1, 1)
+    task_id = _seed_audit_events(session, user, [base + timedelta(hours=i) for i in range(5)])
+    _seed_audit_events(session, user, [base])
+    
+    seen = []
+    url = f'/api/tasks/audit?task_id={task_id}&start=2030-01-01T01:00:00&end=2030-01-02&limit=2'
+    cursor = None
+    while True:
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''), headers=headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        seen.extend(event['timestamp'] for event in body['events'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+    
+    assert seen == [(base + timedelta(hours=i)).isoformat() for i in range(4, 0, -1)]
+    assert body['partial'] is False
+    assert client.get('/api/tasks/audit?start=2020-01-01', headers=headers).get_json()['partial'] is True
+    assert client.get('/api/tasks/audit', headers=headers).get_json()['partial'] is True
+    assert client.get('/api/tasks/audit?start=yesterday', headers=headers).status_code == 400
+
+def test_archive_moves_old_months_to_gzip_files(app, session, make_user, monkeypatch, tmp_path):
+    """Test archival writes whole old months to gzip NDJSON and keeps hot months in the table."""
+    monkeypatch.setitem(app.config, 'AUDIT_ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setitem(app.config, 'AUDIT_ARCHIVE_BATCH_SIZE', 2)
+    user = make_user()
+    now = datetime.utcnow()
+    _seed_audit_events(session, user, [datetime(2020, 1, 5), datetime(2020, 1, 20), datetime(2020, 1, 31, 23), datetime(2020, 3, 1), now])
+    
+    result = archive_audit_log.run(hot_months=1)
+    
+    assert result['events_archived'] == 4
+    assert [month['month'] for month in result['months']] == ['2020-01', '2020-03']
+    assert TaskAuditLog.query.count() == 1
+    with gzip.open(result['months'][0]['path'], 'rt', encoding='utf-8') as archive:
+        events = [json.loads(line) for line in archive]
+    assert [event['timestamp'] for event in events] == ['2020-01-05T00:00:00', '2020-01-20T00:00:00', '2020-01-31T23:00:00']
+    
+    assert archive_audit_log.run(hot_months=1)['events_archived'] == 0
+
+def test_archive_requires_an_absolute_archive_dir(app, session, make_user, monkeypatch):
+    """Test archival deletes nothing when AUDIT_ARCHIVE_DIR is unset or relative."""
+    user = make_user()
+    _seed_audit_events(session, user, [datetime(2020, 1, 5)])
+    
+    for archive_dir in (None, 'archive/audit'):
+        monkeypatch.setitem(app.config, 'AUDIT_ARCHIVE_DIR', archive_dir)
+        assert archive_audit_log.run(hot_months=1)['status'] == 'error'
+    assert TaskAuditLog.query.count() == 1
@@ -23,4 +23,94 @@ def test_login(client, session):
         'password': 'securepassword'
     })
     assert response.status_code == 200
-    assert b'access_token' in response.data
\ No newline at end of file
+    assert b'access_token' in response.data
+
+def test_login_rehashes_outdated_hash(client, session):
+    """Test a successful login upgrades a hash made with old parameters."""
+    from werkzeug.security import generate_password_hash
+    from app.blueprints.auth.models import User
+    
+    user = User(
+        username='legacy',
+        email='legacy@example.com',
+        password_hash=generate_password_hash('securepassword', 'pbkdf2:sha256:500')
+    )
+    session.add(user)
+    session.commit()
+    
+    response = client.post('/api/auth/login', json={
+        'email': 'legacy@example.com',
+        'password': 'securepassword'
+    })
+    assert response.status_code == 200
+    
+    session.refresh(user)
+    assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+
+def test_password_hasher_process_pool():
+    """Test hashing through the process pool and the concurrency cap."""
+    import threading
+    import pytest
+    from app.services.auth_service import PasswordHasher, HashingBusy
+    
+    hasher = PasswordHasher()
+    hasher.method = 'pbkdf2:sha256:1000'
+    hasher.workers = 1
+    try:
+        password_hash = hasher.hash('securepassword')
+        assert hasher.verify(password_hash, 'securepassword')
+        assert not hasher.verify(password_hash, 'wrongpassword')
+        assert not hasher.needs_rehash(password_hash)
+        assert hasher.needs_rehash(password_hash.replace(':1000$', ':999$', 1))
+    finally:
+        hasher.shutdown()
+    
+    hasher._slots = threading.BoundedSemaphore(1)
+    hasher.wait_timeout = 0.01
+    hasher._slots.acquire()
+    with pytest.raises(HashingBusy):
+        hasher.hash('securepassword')
+
+def test_profile_uses_user_cache_and_invalidates_on_change(client, session, auth_headers, query_counter):
+    """Test profile reads are cached and a committed role change is seen at once."""
+    from app.blueprints.auth.models import User, RoleEnum
+    
+    headers = auth_headers('cached', RoleEnum.USER)
+    
+    query_counter.clear()
+    assert client.get('/api/auth/profile', headers=headers).get_json()['role'] == 'user'
+    assert client.get('/api/auth/profile', headers=headers).get_json()['role'] == 'user'
+    assert len(query_counter) == 1
+    
+    user = User.query.filter_by(username='cached').one()
+    user.role = RoleEnum.MANAGER
+    session.commit()
+    
+    assert client.get('/api/auth/profile', headers=headers).get_json()['role'] == 'manager'
+
+def test_user_cache_invalidation_reaches_other_processes(app, session, make_user):
+    """Test a user change published by one process drops the context from another's LRU."""
+    from flask import g
+    from app.services.user_service import UserContextCache
+    
+    class MemoryBus:
+        handlers = []
+        def subscribe(self, handler, on_lost=None):
+            self.handlers.append(handler)
+        def publish(self, message):
+            for handler in self.handlers:
+                handler(message)
+        def close(self):
+            pass
+    
+    user = make_user('broadcast')
+    here, there = UserContextCache(), UserContextCache()
+    here.bus, there.bus = MemoryBus(), MemoryBus()
+    # The session-wide app context keeps the request memo alive between tests.
+    g.pop('_user_contexts', None)
+    there.get(user.id)
+    assert there.local.get(user.id) is not None
+    
+    here.invalidate(user.id)
+    
+    assert there.local.get(user.id) is None
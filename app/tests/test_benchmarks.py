@@ -0,0 +1,15 @@
+import copy
+from app.benchmarks.suite import run, compare
+
+def test_benchmark_suite_flags_query_regressions():
+    """Test the benchmark suite runs end to end and its regression gate trips."""
+    results = run(tasks=60, days=2, iterations=3, csv_rows=50)
+    
+    # Warm-up reads fill the task log cache, so measured reads never query.
+    assert results['routes']['tasks.get_task']['queries_per_request'] == 0
+    assert compare(results, results, latency_tolerance=None, throughput_tolerance=None) == []
+    
+    baseline = copy.deepcopy(results)
+    baseline['routes']['tasks.get_tasks.page']['queries_per_request'] -= 1
+    failures = compare(results, baseline, latency_tolerance=None, throughput_tolerance=None)
+    assert failures == ["tasks.get_tasks.page: 2 queries/request (baseline 1)"]
@@ -0,0 +1,49 @@
+from datetime import date
+from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatus
+from app.tasks.celery import celery
+from app.tasks.daily_task_loader import daily_task_loader, build_daily_load
+from app.utils.cache_versions import get_versions, task_list_namespace
+
+def test_daily_task_loader_is_set_based_and_idempotent(app, session, make_user, monkeypatch):
+    """Test the loader logs each active task once per day, chunk by chunk."""
+    monkeypatch.setitem(app.config, 'DAILY_LOADER_CHUNK_SIZE', 3)
+    monkeypatch.setattr(celery.conf, 'task_always_eager', True)
+    user = make_user()
+    for i in range(7):
+        session.add(TaskManager(
+            title=f"Task {i}",
+            status=TaskStatus.IN_PROGRESS,
+            is_active=i != 6,
+            created_by=user.id
+        ))
+    session.commit()
+    
+    result = build_daily_load(date(2030, 1, 1)).apply().get()
+    
+    assert result['status'] == 'success'
+    assert result['rows_inserted'] == 6
+    assert result['chunks'] == 2
+    logs = TaskLogger.query.filter_by(log_date=date(2030, 1, 1)).all()
+    assert len(logs) == 6
+    assert all(log.status == TaskStatus.IN_PROGRESS for log in logs)
+    
+    result = daily_task_loader.run(log_date='2030-01-01')
+    
+    assert result['status'] == 'dispatched'
+    assert result['chunks'] == 2
+    assert TaskLogger.query.count() == 6
+
+def test_intervals_mode_rollover_invalidates_listings(app, session, make_user, monkeypatch):
+    """Test a load that opens no intervals still moves the listings past yesterday's view."""
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_STORE', 'intervals')
+    monkeypatch.setattr(celery.conf, 'task_always_eager', True)
+    session.add(TaskManager(title="Ongoing", created_by=make_user().id))
+    session.commit()
+    build_daily_load(date(2030, 1, 1)).apply().get()
+    before = get_versions(task_list_namespace(), task_list_namespace(date(2030, 1, 2)))
+    
+    result = build_daily_load(date(2030, 1, 2)).apply().get()
+    
+    assert result['intervals_opened'] == 0
+    after = get_versions(task_list_namespace(), task_list_namespace(date(2030, 1, 2)))
+    assert all(new > old for new, old in zip(after, before))
@@ -0,0 +1,91 @@
+import pytest
+from datetime import date
+from flask import g
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert, text, update
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, cache
+from app.blueprints.auth.models import User, RoleEnum
+from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatus
+from app.utils import db_routing
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """An app whose primary and replica are two SQLite files with the same schema."""
+    class ReplicaConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_BINDS = {'replica': f"sqlite:///{tmp_path / 'replica.db'}"}
+        JWT_SECRET_KEY = TestingConfig.JWT_SECRET_KEY or 'replica-secret'
+
+    monkeypatch.setattr(db_routing, '_replica_down_until', 0.0)
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica'])
+        for engine in db.engines.values():
+            with engine.begin() as connection:
+                connection.execute(insert(User.__table__), {
+                    "id": 1, "username": 'reader', "email": 'reader@example.com',
+                    "password_hash": 'not-a-real-hash', "role": RoleEnum.MANAGER
+                })
+                connection.execute(insert(TaskManager.__table__), {"id": 1, "title": 'Replicated', "created_by": 1})
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app registered a metadata for the bind; the session app has no such engine.
+    db.metadatas.pop('replica', None)
+
+def _add_log(engine, log_id, status=TaskStatus.PENDING):
+    with engine.begin() as connection:
+        connection.execute(insert(TaskLogger.__table__), {
+            "id": log_id, "task_id": 1, "status": status, "log_date": date(2030, 1, 1)
+        })
+
+def test_read_only_views_use_replica_until_own_write(replica_app):
+    """Test reads hit the replica, stick to the primary after a write and fall back when it breaks."""
+    client = replica_app.test_client()
+    token = create_access_token(identity=1, additional_claims={"role": 'manager'})
+    headers = {"Authorization": f"Bearer {token}"}
+    _add_log(db.engines['replica'], 50)
+
+    assert client.get('/api/tasks/task/50', headers=headers).status_code == 200
+
+    response = client.put('/api/tasks/task/1', json={'title': 'Renamed'}, headers=headers)
+    assert response.status_code == 200
+    assert client.get('/api/tasks/task/50', headers=headers).status_code == 404
+
+    cache.clear()
+    assert client.get('/api/tasks/task/50', headers=headers).status_code == 200
+
+    _add_log(db.engine, 60)
+    with db.engines['replica'].begin() as connection:
+        connection.execute(text('DROP TABLE task_logger'))
+    assert client.get('/api/tasks/task/60', headers=headers).status_code == 200
+    assert not db_routing.replica_available()
+
+def test_stale_replica_results_are_not_cached_or_tagged(replica_app, monkeypatch):
+    """Test replica reads carry no ETag and leave no cache entry behind for later primary reads."""
+    client = replica_app.test_client()
+    token = create_access_token(identity=1, additional_claims={"role": 'manager'})
+    headers = {"Authorization": f"Bearer {token}"}
+    _add_log(db.engines['replica'], 70)
+    _add_log(db.engine, 70, TaskStatus.COMPLETED)
+    with db.engine.begin() as connection:
+        connection.execute(update(User.__table__).values(email='moved@example.com'))
+    
+    stale = [client.get(path, headers=headers) for path in ('/api/tasks/task/70', '/api/tasks/tasks', '/api/auth/profile')]
+    assert stale[0].get_json()['status'] == 'pending'
+    assert stale[1].get_json()['tasks'][0]['status'] == 'pending'
+    assert stale[2].get_json()['email'] == 'reader@example.com'
+    assert [response.headers.get('ETag') for response in stale[:2]] == [None, None]
+    
+    monkeypatch.setattr(db_routing, '_replica_down_until', float('inf'))
+    # The fixture's app context outlives requests, and with it the request memo in ``g``.
+    g.pop('_user_contexts', None)
+    fresh = [client.get(path, headers=headers) for path in ('/api/tasks/task/70', '/api/tasks/tasks', '/api/auth/profile')]
+    assert fresh[0].get_json()['status'] == 'completed'
+    assert fresh[1].get_json()['tasks'][0]['status'] == 'completed'
+    assert fresh[2].get_json()['email'] == 'moved@example.com'
+    assert all(response.headers.get('ETag') for response in fresh[:2])
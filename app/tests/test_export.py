@@ -0,0 +1,33 @@
+import csv
+import io
+import json
+from datetime import date
+
+def test_export_streams_tasks_as_csv(client, session, auth_headers):
+    """Test the task export streams a header chunk first and every row as CSV."""
+    headers = auth_headers()
+    client.post('/api/tasks/batch', json={'tasks': [{'title': f'Export {i}', 'description': 'a, "quoted" text'} for i in range(3)]}, headers=headers)
+    
+    response = client.get('/api/tasks/export/tasks?format=csv', headers=headers, buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    chunks = list(response.response)
+    assert chunks[0].startswith(b'id,title,description,status')
+    
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+    assert [row['title'] for row in rows] == ['Export 0', 'Export 1', 'Export 2']
+    assert rows[0]['description'] == 'a, "quoted" text'
+    assert rows[0]['status'] == 'pending'
+
+def test_export_logs_as_ndjson_for_a_date_range(client, session, auth_headers, seed_task_logs):
+    """Test the log export filters by log_date and writes one JSON object per line."""
+    headers = auth_headers()
+    seed_task_logs(2, log_date=date(2030, 1, 1))
+    seed_task_logs(1, log_date=date(2030, 2, 1))
+    
+    response = client.get('/api/tasks/export/logs?format=ndjson&start=2030-01-01&end=2030-01-31', headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['log_date'] for line in lines] == ['2030-01-01', '2030-01-01']
+    assert client.get('/api/tasks/export/logs?format=xml', headers=headers).status_code == 400
+    assert client.get('/api/tasks/export/users', headers=headers).status_code == 404
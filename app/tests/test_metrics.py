@@ -0,0 +1,41 @@
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, pool_status, pool_checkout_wait
+
+def test_pool_profile_and_checkout_metrics(tmp_path):
+    """Test file-backed databases get the instrumented, profile-sized pool."""
+    class PooledConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'pool.db'}"
+        DB_POOL_PROFILE = 'worker'
+    
+    app = create_app(PooledConfig)
+    with app.app_context():
+        waits_before = pool_checkout_wait.count()
+        with db.engine.connect():
+            status = pool_status(db.engine)
+        
+        assert status['size'] == PooledConfig.DB_POOL_PROFILES['worker']['pool_size']
+        assert status['checked_out'] == 1
+        assert pool_checkout_wait.count() > waits_before
+        
+        body = app.test_client().get('/metrics').get_data(as_text=True)
+        assert 'db_pool_checkout_wait_seconds_count' in body
+        assert 'db_pool_utilization 0.0' in body
+        db.engine.dispose()
+
+def test_request_instrumentation(client, session, auth_headers, seed_task_logs):
+    """Test responses carry Server-Timing and feed the per-endpoint histograms."""
+    headers = auth_headers()
+    seed_task_logs(3)
+    
+    response = client.get('/api/tasks/tasks?per_page=2', headers=headers)
+    timing = response.headers['Server-Timing']
+    assert 'db;dur=' in timing and '"2 queries"' in timing
+    assert '"0 hits, 3 misses"' in timing
+    
+    response = client.get('/api/tasks/tasks?per_page=2', headers=headers)
+    assert '"0 queries"' in response.headers['Server-Timing']
+    
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{endpoint="tasks.get_tasks",method="GET"}' in body
+    assert 'cache_requests_total{endpoint="tasks.get_tasks",result="hit"}' in body
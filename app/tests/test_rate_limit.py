@@ -0,0 +1,127 @@
+import threading
+import time
+import pytest
+from app.utils import rate_limit
+from app.utils.rate_limit import LeasedRedisStorage, rate_limit_key, rate_limit_fail_open_total
+
+def test_rate_limit_key_uses_jwt_identity(app, session, auth_headers):
+    """Test users behind one address get their own key and other calls fall back to the IP."""
+    keys = []
+    for headers in (auth_headers('first'), auth_headers('second'), {'Authorization': 'Bearer not-a-token'}, {}):
+        with app.test_request_context(headers=headers):
+            keys.append(rate_limit_key())
+    
+    assert keys[0].startswith('user:') and keys[1].startswith('user:')
+    assert keys[0] != keys[1]
+    assert keys[2:] == ['ip:127.0.0.1', 'ip:127.0.0.1']
+
+def test_leased_storage_fails_open_without_retrying_redis():
+    """Test an unreachable Redis lets hits through and is skipped until the cool-down ends."""
+    storage = LeasedRedisStorage(
+        'leased+redis://127.0.0.1:1/0', fail_open_for=60,
+        socket_timeout=0.05, socket_connect_timeout=0.05
+    )
+    before = rate_limit_fail_open_total.value()
+    
+    assert storage.acquire_entry('LIMITER/user:1/export', 5, 60) is True
+    assert storage._failing_open(time.time())
+    started = time.perf_counter()
+    assert all(storage.acquire_entry('LIMITER/user:1/export', 5, 60) for _ in range(10))
+    assert time.perf_counter() - started < 0.05
+    assert storage.get_moving_window('LIMITER/user:1/export', 5, 60)[1] == 0
+    assert rate_limit_fail_open_total.value() == before + 11
+
+class ListLeasedStorage(LeasedRedisStorage):
+    """Runs ACQUIRE_LEASE_SCRIPT's steps on a Python list to test the lease bookkeeping.
+
+    The script itself is covered by ``test_lease_script_on_fake_redis``.
+    """
+
+    def __init__(self, **options):
+        super().__init__('leased+redis://127.0.0.1:1/0', **options)
+        self.entries = {}
+
+    def _reserve(self, key, stamp, limit, expiry, block, amount, release):
+        entries = self.entries.setdefault(key, [])
+        released_stamp, unspent = release
+        for _ in range(unspent):
+            if released_stamp in entries:
+                entries.remove(released_stamp)
+        now = float(stamp)
+        in_window = [value for value in entries[:limit] if float(value) >= now - expiry]
+        oldest = in_window[-1] if in_window else stamp
+        granted = min(block, limit - len(in_window))
+        if granted < amount:
+            return 0, len(in_window), oldest
+        entries[:0] = [stamp] * granted
+        del entries[limit:]
+        return granted, len(in_window) + granted, oldest
+
+def test_leased_storage_counts_sparse_hits_once(monkeypatch):
+    """Test unspent lease entries are given back, so sparse hits count one each and bursts still cap."""
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, 'time', lambda: clock[0])
+    storage = ListLeasedStorage(lease_fraction=0.5, lease_ttl=1.0)
+
+    for _ in range(5):
+        assert storage.acquire_entry('LIMITER/user:1/tasks', 20, 3600)
+        clock[0] += 10
+    assert storage.acquire_entry('LIMITER/user:1/tasks', 20, 3600)
+    assert len(storage.entries['LIMITER/user:1/tasks']) == 6
+
+    allowed = sum(storage.acquire_entry('LIMITER/user:2/tasks', 20, 3600) for _ in range(30))
+    assert allowed == 20
+    assert len(storage.entries['LIMITER/user:2/tasks']) == 20
+
+def test_leased_storage_gives_back_an_expired_lease_once(monkeypatch):
+    """Test two hits that find the same expired lease do not both give back its unspent entries."""
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, 'time', lambda: clock[0])
+    storage = ListLeasedStorage(lease_fraction=0.5, lease_ttl=1.0)
+    key = 'LIMITER/user:1/tasks'
+    for _ in range(4):
+        storage.acquire_entry(key, 20, 3600)
+    clock[0] += 10
+    spent = len(storage.entries[key]) - storage._leases[key].remaining
+    
+    reserve = storage._reserve
+    first_inside, second_done = threading.Event(), threading.Event()
+    def interleaved(*args):
+        if not first_inside.is_set():
+            first_inside.set()
+            second_done.wait(1)
+        return reserve(*args)
+    storage._reserve = interleaved
+    
+    first = threading.Thread(target=storage.acquire_entry, args=(key, 20, 3600))
+    first.start()
+    first_inside.wait(1)
+    storage.acquire_entry(key, 20, 3600)
+    second_done.set()
+    first.join()
+    
+    assert len(storage.entries[key]) == spent + 2
+
+def test_lease_script_on_fake_redis(monkeypatch):
+    """Test the real ACQUIRE_LEASE_SCRIPT gives back unspent entries and caps bursts (needs fakeredis and lupa)."""
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    import redis
+    pool = redis.ConnectionPool(connection_class=fakeredis.FakeConnection, server=fakeredis.FakeServer())
+    storage = LeasedRedisStorage('leased+redis://fake', lease_fraction=0.5, lease_ttl=1.0, connection_pool=pool)
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, 'time', lambda: clock[0])
+    
+    # Four quick hits grow the lease to four entries with three unspent.
+    for _ in range(4):
+        assert storage.acquire_entry('sparse', 20, 3600)
+    for _ in range(2):
+        clock[0] += 10
+        assert storage.acquire_entry('sparse', 20, 3600)
+    assert storage.storage.llen(storage.prefixed_key('sparse')) == 6
+    
+    allowed = sum(storage.acquire_entry('burst', 20, 3600) for _ in range(30))
+    assert allowed == 20
+    assert storage.storage.llen(storage.prefixed_key('burst')) == 20
+    clock[0] += 3600.5
+    assert storage.acquire_entry('burst', 20, 3600)
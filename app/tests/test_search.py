@@ -0,0 +1,47 @@
+from io import BytesIO
+
+def _search(client, headers, query, **params):
+    response = client.get('/api/tasks/search', query_string={'q': query, **params}, headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_search_index_follows_every_write_path(client, session, auth_headers):
+    """Test tasks from create, CSV import and update are searchable and deleted ones are not."""
+    headers = auth_headers()
+    task_id = client.post('/api/tasks/task', json={'title': 'Invoice reconciliation'}, headers=headers).get_json()['task_id']
+    client.post(
+        '/api/tasks/upload-csv',
+        data={'file': (BytesIO(b"title,description,status\nImported task,monthly invoice run,pending\n"), 'tasks.csv')},
+        headers=headers,
+        content_type='multipart/form-data'
+    )
+    
+    assert {task['title'] for task in _search(client, headers, 'invoice')['tasks']} == {'Invoice reconciliation', 'Imported task'}
+    
+    client.put(f'/api/tasks/task/{task_id}', json={'title': 'Payroll review'}, headers=headers)
+    assert [task['title'] for task in _search(client, headers, 'invoice')['tasks']] == ['Imported task']
+    assert [task['id'] for task in _search(client, headers, 'payroll')['tasks']] == [task_id]
+    
+    client.delete(f'/api/tasks/task/{task_id}', headers=headers)
+    assert _search(client, headers, 'payroll')['tasks'] == []
+    assert client.get('/api/tasks/search?q=%20', headers=headers).status_code == 400
+
+def test_search_is_ranked_and_cursor_paginated(client, session, auth_headers):
+    """Test better matches come first and cursors walk every match once."""
+    headers = auth_headers()
+    client.post('/api/tasks/batch', json={'tasks': [
+        {'title': f'Deploy service {i}', 'description': 'deploy deploy deploy' if i == 3 else 'routine'}
+        for i in range(5)
+    ] + [{'title': 'Unrelated "quoted" task'}]}, headers=headers)
+    
+    first = _search(client, headers, 'deploy', limit=2)
+    assert first['tasks'][0]['title'] == 'Deploy service 3'
+    
+    titles = [task['title'] for task in first['tasks']]
+    cursor = first['next_cursor']
+    while cursor:
+        page = _search(client, headers, 'deploy', limit=2, cursor=cursor)
+        titles.extend(task['title'] for task in page['tasks'])
+        cursor = page['next_cursor']
+    assert sorted(titles) == [f'Deploy service {i}' for i in range(5)]
+    assert len(_search(client, headers, '"quoted" OR')['tasks']) == 0
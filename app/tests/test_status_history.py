@@ -0,0 +1,127 @@
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from app.blueprints.tasks.models import TaskManager, TaskLogger, TaskStatus, TaskStatusHistory
+from app.migration.compact_task_logger import compact_task_logs
+
+def _log_days(session, task, statuses, first_day=1):
+    for offset, status in enumerate(statuses):
+        session.add(TaskLogger(task_id=task.id, status=status, log_date=date(2030, 1, first_day + offset)))
+
+def test_compaction_builds_intervals_and_serves_daily_view(app, client, session, make_user, auth_headers, monkeypatch):
+    """Test task_logger compacts to intervals that reproduce the daily listing."""
+    user = make_user('historian')
+    kept = TaskManager(title="Kept task", created_by=user.id, status=TaskStatus.COMPLETED)
+    deleted = TaskManager(title="Deleted task", created_by=user.id, is_active=False)
+    session.add_all([kept, deleted])
+    session.flush()
+    pending, completed = TaskStatus.PENDING, TaskStatus.COMPLETED
+    _log_days(session, kept, [pending, pending, pending, completed, completed])
+    _log_days(session, deleted, [pending, pending])
+    session.commit()
+    
+    result = compact_task_logs(chunk_size=1)
+    
+    assert result['log_rows'] == 7
+    intervals = [
+        (row.task_id, row.status, row.valid_from, row.valid_to)
+        for row in TaskStatusHistory.query.order_by(TaskStatusHistory.task_id, TaskStatusHistory.valid_from)
+    ]
+    assert intervals == [
+        (kept.id, pending, date(2030, 1, 1), date(2030, 1, 4)),
+        (kept.id, completed, date(2030, 1, 4), None),
+        (deleted.id, pending, date(2030, 1, 1), date(2030, 1, 3)),
+    ]
+    assert compact_task_logs(chunk_size=1)['intervals'] == 0
+    
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_STORE', 'intervals')
+    headers = auth_headers()
+    body = client.get('/api/tasks/tasks?date=2030-01-02', headers=headers).get_json()
+    assert body['total'] == 2
+    assert {task['status'] for task in body['tasks']} == {'pending'}
+    body = client.get('/api/tasks/tasks?date=2030-01-05&cursor=&total=exact', headers=headers).get_json()
+    assert [(task['task_id'], task['status']) for task in body['tasks']] == [(kept.id, 'completed')]
+    assert body['total'] == 1
+
+def test_task_writes_keep_intervals_current(app, client, session, auth_headers, monkeypatch):
+    """Test create, status changes and deletes maintain one open interval per live task."""
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_STORE', 'intervals')
+    headers = auth_headers()
+    task_id = client.post('/api/tasks/task', json={'title': 'Tracked task'}, headers=headers).get_json()['task_id']
+    assert TaskLogger.query.count() == 0
+    
+    assert client.get('/api/tasks/tasks', headers=headers).get_json()['tasks'][0]['status'] == 'pending'
+    client.put(f'/api/tasks/task/{task_id}', json={'status': 'in_progress'}, headers=headers)
+    client.patch('/api/tasks/batch', json={'tasks': [{'id': task_id, 'status': 'completed'}]}, headers=headers)
+    
+    history = TaskStatusHistory.query.filter_by(task_id=task_id).all()
+    assert [(row.status, row.valid_to) for row in history] == [(TaskStatus.COMPLETED, None)]
+    assert client.get('/api/tasks/tasks', headers=headers).get_json()['tasks'][0]['status'] == 'completed'
+    
+    client.delete(f'/api/tasks/task/{task_id}', headers=headers)
+    assert TaskStatusHistory.query.filter_by(task_id=task_id).one().valid_to is not None
+
+def test_listing_ids_resolve_to_detail_in_intervals_mode(app, client, session, auth_headers, monkeypatch):
+    """Test the detail route answers for the interval ids the listing returns."""
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_STORE', 'intervals')
+    headers = auth_headers()
+    first = client.post('/api/tasks/task', json={'title': 'First'}, headers=headers).get_json()['task_id']
+    second = client.post('/api/tasks/task', json={'title': 'Second'}, headers=headers).get_json()['task_id']
+    session.add(TaskLogger(task_id=first, status=TaskStatus.PENDING, log_date=date(2030, 1, 1)))
+    session.commit()
+    client.put(f'/api/tasks/task/{second}', json={'status': 'in_progress'}, headers=headers)
+    
+    listed = client.get('/api/tasks/tasks', headers=headers).get_json()['tasks']
+    assert {task['task_id'] for task in listed} == {first, second}
+    for task in listed:
+        response = client.get(f"/api/tasks/task/{task['id']}", headers=headers)
+        assert response.status_code == 200
+        detail = response.get_json()
+        assert (detail['task_id'], detail['status'], detail['log_date']) == (task['task_id'], task['status'], task['log_date'])
+
+def test_daily_view_covers_recent_days_and_seeks_across_gaps(app, client, session, make_user, auth_headers, monkeypatch):
+    """Test the unfiltered view is bounded to TASK_HISTORY_VIEW_DAYS and cursor pages skip empty days."""
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_STORE', 'intervals')
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_VIEW_DAYS', 10)
+    user = make_user('windowed')
+    old, recent = TaskManager(title="Old task", created_by=user.id), TaskManager(title="Recent task", created_by=user.id)
+    session.add_all([old, recent])
+    session.flush()
+    today = datetime.utcnow().date()
+    session.add_all([
+        TaskStatusHistory(task_id=old.id, status=TaskStatus.PENDING, valid_from=today - timedelta(days=40), valid_to=today - timedelta(days=6)),
+        TaskStatusHistory(task_id=recent.id, status=TaskStatus.PENDING, valid_from=today - timedelta(days=8), valid_to=today - timedelta(days=6)),
+        TaskStatusHistory(task_id=recent.id, status=TaskStatus.COMPLETED, valid_from=today - timedelta(days=2)),
+    ])
+    session.commit()
+    headers = auth_headers()
+    
+    body = client.get('/api/tasks/tasks?per_page=100', headers=headers).get_json()
+    assert body['total'] == 3 + 2 + 3
+    listed = [(task['log_date'], task['id']) for task in body['tasks']]
+    
+    walked, cursor = [], ''
+    while cursor is not None:
+        page = client.get(f'/api/tasks/tasks?per_page=2&total=exact&cursor={cursor}', headers=headers).get_json()
+        assert page['total'] == 8
+        walked.extend((task['log_date'], task['id']) for task in page['tasks'])
+        cursor = page['next_cursor']
+    assert walked == sorted(listed, reverse=True)
+    assert min(log_date for log_date, _ in walked) == (today - timedelta(days=9)).isoformat()
+
+def test_csv_upload_and_deleted_tasks_keep_the_view_current(app, client, session, auth_headers, monkeypatch):
+    """Test a CSV upload refreshes the cached listing and a deleted task cannot be updated back into it."""
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_STORE', 'intervals')
+    headers = auth_headers()
+    task_id = client.post('/api/tasks/task', json={'title': 'Soon deleted'}, headers=headers).get_json()['task_id']
+    client.delete(f'/api/tasks/task/{task_id}', headers=headers)
+    assert client.get('/api/tasks/tasks', headers=headers).get_json()['total'] == 1
+    
+    csv_bytes = b"title,description,status\nImported,,pending\n"
+    client.post('/api/tasks/upload-csv', data={'file': (BytesIO(csv_bytes), 'tasks.csv')},
+                headers=headers, content_type='multipart/form-data')
+    assert client.get('/api/tasks/tasks', headers=headers).get_json()['total'] == 2
+    
+    assert client.put(f'/api/tasks/task/{task_id}', json={'status': 'completed'}, headers=headers).status_code == 400
+    response = client.patch('/api/tasks/batch', json={'tasks': [{'id': task_id, 'status': 'completed'}]}, headers=headers)
+    assert response.get_json()['results'][0]['status'] == 'invalid'
+    assert TaskStatusHistory.query.filter_by(task_id=task_id, valid_to=None).count() == 0
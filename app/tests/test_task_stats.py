@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from app.blueprints.tasks.models import TaskManager, TaskStatus, TaskStatusRollup
+from app.tasks.celery import celery
+from app.tasks.daily_task_loader import daily_task_loader
+
+def _rollup(log_date):
+    return {
+        (row.status.value, row.priority): row.task_count
+        for row in TaskStatusRollup.query.filter_by(log_date=log_date) if row.task_count
+    }
+
+def test_daily_loader_rolls_up_only_inserted_rows(app, session, make_user, monkeypatch):
+    """Test the loader adds each day's new logs to the rollup once, across chunks and reruns."""
+    monkeypatch.setitem(app.config, 'DAILY_LOADER_CHUNK_SIZE', 2)
+    monkeypatch.setattr(celery.conf, 'task_always_eager', True)
+    user = make_user()
+    for i in range(5):
+        session.add(TaskManager(title=f"Task {i}", status=TaskStatus.PENDING if i < 3 else TaskStatus.COMPLETED,
+                                priority=i % 2 + 1, created_by=user.id))
+    session.commit()
+    
+    daily_task_loader.run(log_date='2030-01-01')
+    daily_task_loader.run(log_date='2030-01-01')
+    
+    assert _rollup(date(2030, 1, 1)) == {('pending', 1): 2, ('pending', 2): 1, ('completed', 2): 1, ('completed', 1): 1}
+
+def test_stats_endpoint_follows_task_writes(app, client, session, auth_headers, monkeypatch):
+    """Test creates and status changes adjust today's rollup and the stats endpoint reads it."""
+    monkeypatch.setitem(app.config, 'TASK_HISTORY_STORE', 'intervals')
+    monkeypatch.setattr(celery.conf, 'task_always_eager', True)
+    headers = auth_headers()
+    today = datetime.utcnow().date()
+    created = client.post('/api/tasks/batch', json={'tasks': [
+        {'title': 'Rolled up one'}, {'title': 'Rolled up two', 'priority': 3}
+    ]}, headers=headers).get_json()['results']
+    client.put(f"/api/tasks/task/{created[0]['task_id']}", json={'status': 'completed'}, headers=headers)
+    
+    assert _rollup(today) == {('pending', 3): 1, ('completed', 1): 1}
+    
+    response = client.get(f'/api/tasks/stats?start={today}&end={today}&group_by=status', headers=headers)
+    assert response.status_code == 200
+    day = response.get_json()['days'][0]
+    assert day['total'] == 2
+    assert sorted((count['status'], count['count']) for count in day['counts']) == [('completed', 1), ('pending', 1)]
+    
+    daily_task_loader.run(log_date=today.isoformat())
+    assert _rollup(today) == {('pending', 3): 1, ('completed', 1): 1}
+    assert client.get('/api/tasks/stats?group_by=colour', headers=headers).status_code == 400
@@ -0,0 +1,299 @@
+from io import BytesIO
+from app.blueprints.tasks.models import TaskManager, TaskAuditLog
+from app.blueprints.auth.models import RoleEnum
+
+def test_upload_csv_bulk_inserts_in_batches(app, client, session, auth_headers, monkeypatch, query_counter):
+    """Test CSV upload inserts valid rows in batches and reports bad ones."""
+    monkeypatch.setitem(app.config, 'CSV_IMPORT_BATCH_SIZE', 2)
+    rows = ["title,description,status,priority,due_date"]
+    rows += [f"Task {i},desc {i},pending,2,2030-01-0{i}" for i in range(1, 6)]
+    rows.append("Bad row,desc,not-a-status,9,2030-13-40")
+    csv_bytes = ("\n".join(rows) + "\n").encode('utf-8')
+    
+    response = client.post(
+        '/api/tasks/upload-csv',
+        data={'file': (BytesIO(csv_bytes), 'tasks.csv')},
+        headers=auth_headers(),
+        content_type='multipart/form-data'
+    )
+    
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['created'] == 5
+    assert body['batches'] == 3
+    assert len([statement for statement in query_counter if statement.startswith('INSERT INTO task_manager')]) == 3
+    assert body['failed'] == 1
+    assert body['errors'][0]['row'] == 7
+    assert len(body['errors'][0]['errors']) == 3
+    assert TaskManager.query.count() == 5
+    assert TaskAuditLog.query.filter_by(action='create').count() == 5
+
+def test_upload_csv_missing_columns(client, session, auth_headers):
+    """Test CSV upload rejects files without the required header."""
+    response = client.post(
+        '/api/tasks/upload-csv',
+        data={'file': (BytesIO(b"title,priority\nTask,1\n"), 'tasks.csv')},
+        headers=auth_headers(),
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 400
+    assert b'Missing required columns' in response.data
+
+def test_upload_csv_failure_reports_committed_batches(app, client, session, auth_headers, monkeypatch):
+    """Test an unexpected error mid-import still reports the batches already committed."""
+    from app.services import task_service
+    monkeypatch.setitem(app.config, 'CSV_IMPORT_BATCH_SIZE', 2)
+    insert_batch = task_service._insert_csv_batch
+    calls = []
+    
+    def failing_insert(payloads, user_id):
+        calls.append(len(payloads))
+        if len(calls) == 2:
+            raise RuntimeError("database went away")
+        return insert_batch(payloads, user_id)
+    
+    monkeypatch.setattr(task_service, '_insert_csv_batch', failing_insert)
+    rows = ["title,description,status"] + [f"Task {i},desc,pending" for i in range(4)]
+    response = client.post(
+        '/api/tasks/upload-csv',
+        data={'file': (BytesIO(("\n".join(rows) + "\n").encode('utf-8')), 'tasks.csv')},
+        headers=auth_headers(),
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "database went away", "created": 2, "batches": 1}
+
+def test_get_tasks_query_count_is_constant(client, session, auth_headers, seed_task_logs, query_counter):
+    """Test the listing runs the same number of queries regardless of page size."""
+    headers = auth_headers()
+    seed_task_logs(30)
+    
+    counts = []
+    for per_page in (5, 30):
+        query_counter.clear()
+        response = client.get(f'/api/tasks/tasks?per_page={per_page}', headers=headers)
+        assert response.status_code == 200
+        assert len(response.get_json()['tasks']) == per_page
+        counts.append(len(query_counter))
+    
+    assert counts == [2, 2]
+
+def test_get_task_uses_single_query(client, session, auth_headers, seed_task_logs, query_counter):
+    """Test the task detail is read with one joined query."""
+    headers = auth_headers()
+    log_id = seed_task_logs(1)[0].id
+    
+    query_counter.clear()
+    response = client.get(f'/api/tasks/task/{log_id}', headers=headers)
+    
+    assert response.status_code == 200
+    assert response.get_json()['title'] == 'Task 0'
+    assert len(query_counter) == 1
+    assert client.get('/api/tasks/task/999999', headers=headers).status_code == 404
+
+def test_get_tasks_cursor_pagination(client, session, auth_headers, seed_task_logs):
+    """Test keyset pagination walks every row once, newest first."""
+    from datetime import date
+    headers = auth_headers()
+    seed_task_logs(3, log_date=date(2030, 1, 1))
+    seed_task_logs(2, log_date=date(2030, 1, 2))
+    
+    seen = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get(f'/api/tasks/tasks?per_page=2&cursor={cursor}&total=estimate', headers=headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['estimated_total'] == 5
+        seen.extend((task['log_date'], task['id']) for task in body['tasks'])
+        cursor = body['next_cursor']
+    
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+    assert client.get('/api/tasks/tasks?cursor=not-a-cursor', headers=headers).status_code == 400
+    
+    response = client.get('/api/tasks/tasks?page=2&per_page=2', headers=headers)
+    assert response.get_json()['total'] == 5
+    assert response.get_json()['pages'] == 3
+
+def test_task_writes_invalidate_cached_listing(client, session, auth_headers, seed_task_logs):
+    """Test creating or renaming a task is visible through the cached listing at once."""
+    headers = auth_headers()
+    seed_task_logs(1)
+    
+    assert client.get('/api/tasks/tasks', headers=headers).get_json()['total'] == 1
+    
+    response = client.post('/api/tasks/task', json={'title': 'Fresh task'}, headers=headers)
+    assert response.status_code == 201
+    task_id = response.get_json()['task_id']
+    
+    tasks = client.get('/api/tasks/tasks', headers=headers).get_json()['tasks']
+    assert 'Fresh task' in [task['title'] for task in tasks]
+    
+    response = client.put(f'/api/tasks/task/{task_id}', json={'title': 'Renamed task'}, headers=headers)
+    assert response.status_code == 200
+    
+    tasks = client.get('/api/tasks/tasks', headers=headers).get_json()['tasks']
+    assert 'Renamed task' in [task['title'] for task in tasks]
+
+def test_async_audit_writer_batches_after_commit(client, session, auth_headers, monkeypatch):
+    """Test async audit mode writes nothing in the request and flushes in one batch."""
+    from app.services.audit_service import audit_writer
+    from app.tasks.celery import celery
+    
+    monkeypatch.setattr(audit_writer, 'mode', 'async')
+    monkeypatch.setattr(audit_writer, 'interval', 3600)
+    monkeypatch.setattr(celery.conf, 'task_always_eager', True)
+    headers = auth_headers()
+    
+    for i in range(3):
+        response = client.post('/api/tasks/task', json={'title': f'Audited {i}'}, headers=headers)
+        assert response.status_code == 201
+    
+    assert TaskAuditLog.query.count() == 0
+    assert audit_writer.flush() == 3
+    assert TaskAuditLog.query.filter_by(action='create').count() == 3
+
+def test_async_audit_writer_keeps_events_when_both_writes_fail(client, session, auth_headers, monkeypatch):
+    """Test a batch that neither Celery nor the direct insert accepts stays buffered."""
+    import pytest
+    from app.services import audit_service
+    from app.services.audit_service import audit_writer
+    from app.tasks.celery import celery
+    
+    monkeypatch.setattr(audit_writer, 'mode', 'async')
+    monkeypatch.setattr(audit_writer, 'interval', 3600)
+    headers = auth_headers()
+    assert client.post('/api/tasks/task', json={'title': 'Kept event'}, headers=headers).status_code == 201
+    
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("unavailable")
+    
+    with monkeypatch.context() as outage:
+        outage.setattr(audit_service.write_audit_events, 'delay', unavailable)
+        outage.setattr(audit_service, 'insert_audit_events', unavailable)
+        with pytest.raises(ConnectionError):
+            audit_writer.flush()
+    
+    monkeypatch.setattr(celery.conf, 'task_always_eager', True)
+    assert audit_writer.flush() == 1
+    assert TaskAuditLog.query.filter_by(action='create').count() == 1
+
+def test_batch_create_and_update_tasks(client, session, auth_headers, query_counter):
+    """Test batch create/update apply valid items in bulk and report the rest per item."""
+    from app.blueprints.tasks.models import TaskLogger
+    headers = auth_headers()
+    
+    query_counter.clear()
+    response = client.post('/api/tasks/batch', json={'tasks': [
+        {'title': 'Batch one', 'priority': 2},
+        {'title': 'x'},
+        {'title': 'Batch two', 'status': 'in_progress', 'due_date': '2030-01-01'},
+    ]}, headers=headers)
+    
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['created'] == 2
+    assert [result['status'] for result in body['results']] == ['created', 'invalid', 'created']
+    first_id, second_id = body['results'][0]['task_id'], body['results'][2]['task_id']
+    assert len([statement for statement in query_counter if statement.startswith('INSERT INTO task_manager')]) == 1
+    assert (session.get(TaskManager, first_id).title, session.get(TaskManager, second_id).title) == ('Batch one', 'Batch two')
+    assert TaskLogger.query.filter_by(notes='Initial task creation').count() == 2
+    assert TaskAuditLog.query.filter_by(action='create').count() == 2
+    
+    query_counter.clear()
+    response = client.patch('/api/tasks/batch', json={'tasks': [
+        {'id': first_id, 'title': 'Batch one renamed', 'priority': 4},
+        {'id': second_id, 'title': 'Batch two', 'status': 'in_progress', 'due_date': '2030-01-01'},
+        {'id': 999999, 'title': 'Missing task'},
+        {'id': first_id, 'title': 'Duplicate'},
+        {'id': True, 'title': 'Boolean id'},
+    ]}, headers=headers)
+    
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['updated'] == 1
+    assert [result['status'] for result in body['results']] == ['updated', 'unchanged', 'not_found', 'invalid', 'invalid']
+    task_queries = [statement for statement in query_counter if 'task_manager' in statement.lower()]
+    assert len(task_queries) <= 2
+    assert session.get(TaskManager, first_id).priority == 4
+    assert TaskAuditLog.query.filter_by(action='update').count() == 1
+    
+    tasks = client.get('/api/tasks/tasks', headers=headers).get_json()['tasks']
+    assert 'Batch one renamed' in [task['title'] for task in tasks]
+    
+    other_headers = auth_headers('someone_else')
+    response = client.patch('/api/tasks/batch', json={'tasks': [{'id': first_id, 'title': 'Hijacked'}]}, headers=other_headers)
+    assert response.status_code == 400
+    assert response.get_json()['results'][0]['status'] == 'forbidden'
+    
+    assert client.post('/api/tasks/batch', json={'tasks': []}, headers=headers).status_code == 400
+
+def test_task_payloads_are_parsed_once(client, session, auth_headers):
+    """Test validation returns typed payloads and partial updates need no title."""
+    from datetime import datetime
+    from app.blueprints.tasks.models import TaskStatus
+    from app.utils.validators import parse_task_batch
+    
+    parsed = parse_task_batch([
+        {'title': 'Typed task', 'status': 'completed', 'priority': '3', 'due_date': '2030-01-02'},
+        {'title': 'x', 'priority': 9},
+    ])
+    payload, errors = parsed[0]
+    assert errors == []
+    assert payload.status is TaskStatus.COMPLETED
+    assert payload.priority == 3
+    assert payload.due_date == datetime(2030, 1, 2)
+    assert parsed[1][0] is None
+    assert len(parsed[1][1]) == 2
+    
+    headers = auth_headers()
+    task_id = client.post('/api/tasks/task', json={'title': 'Partial update'}, headers=headers).get_json()['task_id']
+    response = client.put(f'/api/tasks/task/{task_id}', json={'priority': 5}, headers=headers)
+    assert response.status_code == 200
+    assert session.get(TaskManager, task_id).priority == 5
+
+def test_task_reads_answer_conditional_gets(client, session, auth_headers, seed_task_logs, query_counter):
+    """Test unchanged reads return 304 without querying and writes change the ETag."""
+    headers = auth_headers('root', RoleEnum.ADMIN)
+    logs = seed_task_logs(2)
+    log_id, task_id = logs[0].id, logs[0].task_id
+    
+    for url in ('/api/tasks/tasks', f'/api/tasks/task/{log_id}'):
+        response = client.get(url, headers=headers)
+        etag = response.headers['ETag']
+        
+        query_counter.clear()
+        response = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert query_counter == []
+        
+        client.put(f'/api/tasks/task/{task_id}', json={'title': f'Changed for {url}'}, headers=headers)
+        response = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+def test_task_log_reads_are_served_from_the_two_level_cache(client, session, auth_headers, seed_task_logs, query_counter):
+    """Test repeat reads skip the database and Redis, and writes drop every tier."""
+    from app.services.task_cache import task_log_cache
+    headers = auth_headers('root', RoleEnum.ADMIN)
+    log = seed_task_logs(1)[0]
+    log_id, task_id = log.id, log.task_id
+    url = f'/api/tasks/task/{log_id}'
+    
+    client.get(url, headers=headers)
+    client.get(url, headers=headers)
+    query_counter.clear()
+    response = client.get(url, headers=headers)
+    assert response.get_json()['title'] == 'Task 0'
+    assert query_counter == []
+    assert 'cache;desc="0 hits, 0 misses"' in response.headers['Server-Timing']
+    
+    # A process with an empty LRU is served from Redis.
+    task_log_cache.local.clear()
+    assert client.get(url, headers=headers).get_json()['title'] == 'Task 0'
+    assert query_counter == []
+    
+    client.put(f'/api/tasks/task/{task_id}', json={'title': 'Renamed in place'}, headers=headers)
+    assert client.get(url, headers=headers).get_json()['title'] == 'Renamed in place'
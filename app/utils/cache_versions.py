@@ -0,0 +1,124 @@
+import time
+from datetime import datetime
+from hashlib import md5
+from flask import current_app, request
+from app.extensions import cache
+
+# Bumped when task titles/descriptions change; every listing embeds them.
+TASK_CONTENT_NAMESPACE = 'tasks:content'
+
+def task_list_namespace(log_date=None):
+    """Namespace for listing pages of one log_date, or of all dates."""
+    if log_date is None:
+        return 'tasks:list:all'
+    return f'tasks:list:{log_date.isoformat()}'
+
+def task_namespace(task_id):
+    """Namespace for data derived from a single task."""
+    return f'task:{task_id}'
+
+def _version_key(namespace):
+    return f'version:{namespace}'
+
+def _version_seed():
+    # Versions start from the clock so one lost to eviction or expiry never
+    # repeats an earlier value; ETags built from versions stay unique.
+    return time.time_ns() // 1000
+
+def _version_ttl():
+    # Finite so namespaces of deleted tasks do not pile up in Redis; an
+    # expired version is reseeded, which only retires its entries early.
+    return current_app.config.get('CACHE_VERSION_TTL', 2 * 86400)
+
+def get_versions(*namespaces):
+    """Return the current version number of each namespace, seeding missing ones."""
+    keys = [_version_key(namespace) for namespace in namespaces]
+    values = cache.get_many(*keys)
+    versions = []
+    for key, value in zip(keys, values):
+        if value is None:
+            seed = _version_seed()
+            value = seed if cache.add(key, seed, timeout=_version_ttl()) else cache.get(key)
+        versions.append(int(value or 0))
+    return versions
+
+def bump_versions(*namespaces):
+    """Invalidate every cache entry keyed on the given namespaces."""
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        cache.add(key, _version_seed(), timeout=_version_ttl())
+        cache.cache.inc(key)
+
+def invalidate_task_log_date(log_date):
+    """Invalidate listings that include task logs of log_date."""
+    bump_versions(task_list_namespace(log_date), task_list_namespace())
+
+def invalidate_task(task_id, listing=False):
+    """Invalidate one task; with listing=True also every listing page that shows it."""
+    invalidate_tasks([task_id], listing=listing)
+
+def invalidate_tasks(task_ids, listing=False):
+    """Invalidate several tasks at once, bumping the listing content version only once.
+
+    Also broadcasts the change so every process drops its in-memory copies
+    of the tasks' log payloads.
+    """
+    from app.services.task_cache import task_log_cache
+    namespaces = [task_namespace(task_id) for task_id in task_ids]
+    if listing:
+        namespaces.append(TASK_CONTENT_NAMESPACE)
+    bump_versions(*namespaces)
+    task_log_cache.invalidate(*task_ids)
+
+def task_list_cache_key():
+    """Cache key for GET /tasks built from the query string and the versions it depends on.
+
+    Computed once per request; ``task_list_etag`` reuses it.
+    """
+    # Memoized in the WSGI environ, which unlike ``g`` never outlives the request.
+    memo = request.environ.get('app.task_list_cache_key')
+    if memo is not None:
+        return memo
+    
+    log_date = None
+    date_filter = request.args.get('date')
+    if date_filter:
+        try:
+            log_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    
+    content_version, list_version = get_versions(
+        TASK_CONTENT_NAMESPACE, task_list_namespace(log_date)
+    )
+    args = str(sorted(request.args.items(multi=True))).encode('utf-8')
+    key = f"{request.path}:v{content_version}.{list_version}:{md5(args).hexdigest()}"
+    request.environ['app.task_list_cache_key'] = key
+    return key
+
+def task_list_etag():
+    """Strong ETag for a GET /tasks response; changes whenever its cache key does."""
+    return md5(task_list_cache_key().encode('utf-8')).hexdigest()
+
+def _task_log_owner_key(task_logger_id):
+    return f'task_log_owner:{task_logger_id}'
+
+def remember_task_log_owner(task_logger_id, task_id):
+    """Record which task a log row belongs to; the pairing never changes."""
+    cache.set(_task_log_owner_key(task_logger_id), task_id, timeout=86400)
+
+def task_log_owner(task_logger_id):
+    """The task id recorded by ``remember_task_log_owner``, or None."""
+    return cache.get(_task_log_owner_key(task_logger_id))
+
+def task_log_etag(task_logger_id, task_id=None):
+    """Strong ETag for GET /task/<id> from the owning task's version, without a query.
+
+    Returns None when the owning task is not known yet.
+    """
+    if task_id is None:
+        task_id = task_log_owner(task_logger_id)
+        if task_id is None:
+            return None
+    task_version, = get_versions(task_namespace(task_id))
+    return f"log-{task_logger_id}.{task_version}"
@@ -0,0 +1,101 @@
+import logging
+import time
+from flask import current_app, request, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+READ_ONLY_KEY = 'app.db_read_only'
+
+# Process-local: when the replica last failed, reads skip it until this time.
+_replica_down_until = 0.0
+
+
+def _recent_write_key(identity):
+    return f"db:recent_write:{identity}"
+
+
+def _request_identity():
+    # Imported here so the worker, which has no requests, never loads flask_jwt_extended.
+    from flask_jwt_extended import get_jwt_identity
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
+
+
+def replica_available():
+    """Whether a replica bind is configured and has not failed recently."""
+    return (
+        bool(current_app.config.get('SQLALCHEMY_BINDS', {}).get(REPLICA_BIND))
+        and time.monotonic() >= _replica_down_until
+    )
+
+
+def wrote_recently():
+    """Whether the current user committed a write within DB_READ_YOUR_WRITES_SECONDS."""
+    from app.extensions import cache
+    identity = _request_identity()
+    return identity is not None and cache.get(_recent_write_key(identity)) is not None
+
+
+def mark_replica_down():
+    global _replica_down_until
+    retry_after = current_app.config.get('DB_REPLICA_RETRY_AFTER', 30)
+    _replica_down_until = time.monotonic() + retry_after
+    logger.warning("Read replica unavailable, reading from the primary for %ss", retry_after)
+
+
+def reads_from_replica():
+    """Whether the current request's reads go to the replica."""
+    return has_request_context() and request.environ.get(READ_ONLY_KEY, False)
+
+
+def read_from_primary(response=None):
+    """Whether the current request's reads went to the primary.
+
+    Also usable as ``response_filter`` of ``cache.cached``: replica results
+    may lag behind the versions cache keys and ETags are built from, so
+    they are never cached.
+    """
+    return not reads_from_replica()
+
+
+def route_reads_to_replica(enabled=True):
+    """Send this request's reads to the replica (or stop doing so)."""
+    request.environ[READ_ONLY_KEY] = enabled
+
+
+class RoutingSession(Session):
+    """Session that sends reads of read-only requests to the replica bind.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary,
+    and mark the session so the user's reads stick to the primary after
+    the commit (see ``_remember_write``).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info['wrote'] = True
+            elif reads_from_replica():
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _remember_write(session):
+    if not session.info.pop('wrote', False) or not has_request_context():
+        return
+    identity = _request_identity()
+    if identity is not None:
+        from app.extensions import cache
+        cache.set(_recent_write_key(identity), 1, timeout=current_app.config.get('DB_READ_YOUR_WRITES_SECONDS', 5))
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _forget_write(session):
+    session.info.pop('wrote', None)
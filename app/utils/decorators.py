@@ -1,7 +1,12 @@
 from functools import wraps
-from flask import jsonify
+from flask import jsonify, make_response, request
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from sqlalchemy.exc import OperationalError
+from app.extensions import db
 from app.utils.exceptions import UnauthorizedAccess
+from app.utils.db_routing import (
+    replica_available, wrote_recently, mark_replica_down, route_reads_to_replica, read_from_primary
+)
 
 def role_required(required_role):
     """Decorator to require specific role for access."""
@@ -14,4 +19,59 @@ def role_required(required_role):
                 raise UnauthorizedAccess()
             return fn(*args, **kwargs)
         return wrapper
+    return decorator
+
+def read_only(fn):
+    """Decorator routing a view's queries to the read replica.
+
+    Stays on the primary when no replica is configured, when the caller
+    wrote something in the last DB_READ_YOUR_WRITES_SECONDS, or after the
+    replica failed. A view that fails on the replica is run again on the
+    primary and the replica is skipped for DB_REPLICA_RETRY_AFTER seconds.
+    Use it below ``jwt_required`` so the caller is known, and below
+    ``conditional_get`` and ``cache.cached`` so replica results are not
+    tagged or cached under the primary's versions.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not replica_available() or wrote_recently():
+            return fn(*args, **kwargs)
+        route_reads_to_replica()
+        try:
+            return fn(*args, **kwargs)
+        except OperationalError:
+            db.session.rollback()
+            mark_replica_down()
+            route_reads_to_replica(False)
+            return fn(*args, **kwargs)
+    return wrapper
+
+def conditional_get(make_etag):
+    """Decorator adding a strong ETag and If-None-Match handling to a GET view.
+
+    ``make_etag`` gets the view's arguments and returns the ETag, or None
+    when it cannot be known without running the view. A match returns 304
+    before the view runs; otherwise the ETag is computed again after it.
+    Responses read from the replica get no ETag, since the versions it is
+    built from may be newer than the data.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            etag = make_etag(*args, **kwargs)
+            if etag is not None and request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if not read_from_primary():
+                    etag = None
+                elif etag is None:
+                    etag = make_etag(*args, **kwargs)
+            if etag is not None:
+                response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
     return decorator
\ No newline at end of file
@@ -0,0 +1,19 @@
+import base64
+import json
+from app.utils.exceptions import InvalidInput
+
+def encode_cursor(values):
+    """Encode a list of JSON-serializable keyset values as an opaque cursor."""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor back into its list of values."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise InvalidInput("Invalid cursor")
+    if not isinstance(values, list):
+        raise InvalidInput("Invalid cursor")
+    return values
@@ -0,0 +1,131 @@
+import time
+from flask import g, request, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.metrics import registry
+
+SQL_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+request_duration = registry.histogram(
+    'http_request_duration_seconds', 'Wall time spent handling a request, by endpoint.'
+)
+request_sql_duration = registry.histogram(
+    'http_request_sql_duration_seconds', 'Time spent in SQL per request, by endpoint.'
+)
+request_sql_queries = registry.histogram(
+    'http_request_sql_queries', 'SQL statements executed per request, by endpoint.', SQL_QUERY_BUCKETS
+)
+requests_total = registry.counter(
+    'http_requests_total', 'Requests handled, by endpoint, method and status.'
+)
+cache_requests = registry.counter(
+    'cache_requests_total', 'Cache lookups, by endpoint and result (hit or miss).'
+)
+rate_limited_total = registry.counter(
+    'http_rate_limited_total', 'Requests rejected by the rate limiter, by endpoint.'
+)
+
+
+def _current_stats():
+    if not has_app_context():
+        return None
+    return g.get('_request_stats')
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['_query_started'] = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('_query_started', None)
+    stats = _current_stats()
+    if stats is not None and started is not None:
+        stats['sql_count'] += 1
+        stats['sql_time'] += time.perf_counter() - started
+
+
+class InstrumentedCacheBackend:
+    """Wraps a Flask-Caching backend and counts hits and misses for the current request."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def _record(self, hits, misses):
+        stats = _current_stats()
+        if stats is not None:
+            stats['cache_hits'] += hits
+            stats['cache_misses'] += misses
+
+    def get(self, key):
+        value = self._backend.get(key)
+        self._record(value is not None, value is None)
+        return value
+
+    def get_many(self, *keys):
+        values = self._backend.get_many(*keys)
+        hits = sum(value is not None for value in values)
+        self._record(hits, len(values) - hits)
+        return values
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+
+def _server_timing(stats, total):
+    parts = [
+        f'app;dur={total * 1000:.2f}',
+        f'db;dur={stats["sql_time"] * 1000:.2f};desc="{stats["sql_count"]} queries"',
+        f'cache;desc="{stats["cache_hits"]} hits, {stats["cache_misses"]} misses"',
+    ]
+    return ', '.join(parts)
+
+
+def init_instrumentation(app, cache, limiter):
+    """Record per-request timing, SQL, cache and rate-limit stats for ``app``.
+
+    Every response gets a ``Server-Timing`` header (unless
+    ``SERVER_TIMING_ENABLED`` is off) and updates the per-endpoint
+    histograms served at ``/metrics``. ``X-RateLimit-*`` headers come from
+    Flask-Limiter through ``RATELIMIT_HEADERS_ENABLED``.
+    """
+    backends = app.extensions.get('cache', {})
+    if cache in backends and not isinstance(backends[cache], InstrumentedCacheBackend):
+        backends[cache] = InstrumentedCacheBackend(backends[cache])
+
+    @app.before_request
+    def start_request_stats():
+        g._request_stats = {
+            "started": time.perf_counter(),
+            "sql_count": 0,
+            "sql_time": 0.0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+
+    @app.after_request
+    def record_request_stats(response):
+        endpoint = request.endpoint or 'unmatched'
+        current_limit = limiter.current_limit if limiter.enabled else None
+        if response.status_code == 429 or (current_limit is not None and current_limit.breached):
+            rate_limited_total.inc(endpoint=endpoint)
+
+        # Missing when an earlier before_request hook (e.g. the limiter) short-circuited.
+        stats = g.pop('_request_stats', None)
+        if stats is None:
+            return response
+
+        total = time.perf_counter() - stats['started']
+        request_duration.observe(total, endpoint=endpoint, method=request.method)
+        request_sql_duration.observe(stats['sql_time'], endpoint=endpoint)
+        request_sql_queries.observe(stats['sql_count'], endpoint=endpoint)
+        requests_total.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        if stats['cache_hits']:
+            cache_requests.inc(stats['cache_hits'], endpoint=endpoint, result='hit')
+        if stats['cache_misses']:
+            cache_requests.inc(stats['cache_misses'], endpoint=endpoint, result='miss')
+
+        if app.config.get('SERVER_TIMING_ENABLED', True):
+            response.headers['Server-Timing'] = _server_timing(stats, total)
+        return response
@@ -0,0 +1,196 @@
+import logging
+import time
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_limiter.util import get_remote_address
+from limits.storage import RedisStorage
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+rate_limit_fail_open_total = registry.counter(
+    'rate_limit_fail_open_total', 'Rate limit checks let through because Redis was unavailable.'
+)
+
+# Gives back ARGV[7] unspent entries stamped ARGV[6] from an earlier lease, then
+# reserves up to ARGV[4] entries (at least ARGV[5]) stamped ARGV[1] in a moving
+# window kept as a Redis list of timestamps, newest first.
+# Returns {granted, in_window, oldest}.
+ACQUIRE_LEASE_SCRIPT = """
+local timestamp = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local expiry = tonumber(ARGV[3])
+local wanted = tonumber(ARGV[4])
+local minimum = tonumber(ARGV[5])
+local unspent = tonumber(ARGV[7])
+
+if unspent > 0 then
+    redis.call('lrem', KEYS[1], unspent, ARGV[6])
+end
+
+local items = redis.call('lrange', KEYS[1], 0, limit - 1)
+local in_window = 0
+local oldest = timestamp
+for idx = 1, #items do
+    local value = tonumber(items[idx])
+    if value < timestamp - expiry then
+        break
+    end
+    in_window = in_window + 1
+    oldest = value
+end
+
+local granted = math.min(wanted, limit - in_window)
+if granted < minimum then
+    return {0, in_window, tostring(oldest)}
+end
+for i = 1, granted do
+    redis.call('lpush', KEYS[1], ARGV[1])
+end
+redis.call('ltrim', KEYS[1], 0, limit - 1)
+redis.call('expire', KEYS[1], expiry)
+return {granted, in_window + granted, tostring(oldest)}
+"""
+
+
+def rate_limit_key():
+    """Rate limit per user when the request carries a valid JWT, else per client address."""
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None
+    if identity is not None:
+        return f"user:{identity}"
+    return f"ip:{get_remote_address()}"
+
+
+class _Lease:
+    __slots__ = ('stamp', 'granted', 'remaining', 'in_window', 'window_start', 'expires_at')
+
+    def __init__(self, stamp, granted, remaining, in_window, window_start, expires_at):
+        self.stamp = stamp
+        self.granted = granted
+        self.remaining = remaining
+        self.in_window = in_window
+        self.window_start = window_start
+        self.expires_at = expires_at
+
+
+class LeasedRedisStorage(RedisStorage):
+    """Moving-window Redis storage that reserves quota in blocks and serves hits locally.
+
+    Use it with ``RATELIMIT_STORAGE_URI = "leased+redis://..."`` and the
+    moving-window strategy. A hit that finds no local quota reserves a block
+    of entries in Redis with one script call, and later hits spend that
+    block without a round trip for up to ``lease_ttl`` seconds.
+
+    Blocks are sized from what the previous lease on the key used: a lease
+    spent before it expired doubles the next block, up to ``lease_fraction``
+    of the limit, and one that expired part-spent shrinks it to what was
+    used. The next reservation also gives the unspent entries back, so
+    sparse traffic is counted one entry per hit. Entries reserved by a
+    process that stops seeing a key stay counted until they leave the
+    window; since blocks only grow while a process spends them within
+    ``lease_ttl``, other processes may be refused up to one block per
+    process early. Limits under ``1 / lease_fraction`` get blocks of one,
+    which means every hit checks Redis.
+
+    When Redis errors or times out, hits are let through and Redis is not
+    tried again for ``fail_open_for`` seconds.
+    """
+
+    STORAGE_SCHEME = ["leased+redis", "leased+rediss"]
+
+    def __init__(self, uri, lease_fraction=0.1, lease_ttl=1.0, fail_open_for=30.0, **options):
+        self.lease_fraction = float(lease_fraction)
+        self.lease_ttl = float(lease_ttl)
+        self.fail_open_for = float(fail_open_for)
+        self._leases = {}
+        self._closed_until = 0.0
+        super().__init__(uri[len('leased+'):], **options)
+
+    def initialize_storage(self, uri):
+        super().initialize_storage(uri)
+        self.lua_acquire_lease = self.storage.register_script(ACQUIRE_LEASE_SCRIPT)
+
+    def _failing_open(self, now):
+        return now < self._closed_until
+
+    def _fail_open(self, error, now):
+        self._closed_until = now + self.fail_open_for
+        with self.lock:
+            self._leases.clear()
+        logger.warning("Rate limit storage unavailable, allowing requests for %ss: %s", self.fail_open_for, error)
+
+    def _block_size(self, lease, now, limit, amount):
+        largest = max(amount, int(limit * self.lease_fraction))
+        if lease is None:
+            return amount
+        if lease.expires_at > now:
+            return min(largest, max(amount, lease.granted * 2))
+        return min(largest, max(amount, lease.granted - lease.remaining))
+
+    def _reserve(self, key, stamp, limit, expiry, block, amount, release):
+        """Run ACQUIRE_LEASE_SCRIPT, giving back ``release`` = (stamp, unspent) first."""
+        return self.lua_acquire_lease(
+            [self.prefixed_key(key)], [stamp, limit, expiry, block, amount, *release]
+        )
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        now = time.time()
+        if self._failing_open(now):
+            rate_limit_fail_open_total.inc()
+            return True
+
+        with self.lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease.expires_at > now and lease.remaining >= amount:
+                lease.remaining -= amount
+                return True
+            # Take the lease so a concurrent hit cannot give back the same entries twice.
+            self._leases.pop(key, None)
+
+        block = self._block_size(lease, now, limit, amount)
+        stamp = repr(now)
+        release = (lease.stamp, lease.remaining) if lease is not None else ('', 0)
+        try:
+            granted, in_window, oldest = self._reserve(key, stamp, limit, expiry, block, amount, release)
+        except self.base_exceptions as e:
+            self._fail_open(e, now)
+            rate_limit_fail_open_total.inc()
+            return True
+
+        with self.lock:
+            self._leases[key] = _Lease(
+                stamp=stamp,
+                granted=granted,
+                remaining=max(granted - amount, 0),
+                in_window=in_window,
+                window_start=int(float(oldest)),
+                expires_at=now + min(self.lease_ttl, expiry),
+            )
+        return granted >= amount
+
+    def get_moving_window(self, key, limit, expiry):
+        now = time.time()
+        if self._failing_open(now):
+            return int(now), 0
+        with self.lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease.expires_at > now:
+                return lease.window_start, lease.in_window - lease.remaining
+        try:
+            return super().get_moving_window(key, limit, expiry)
+        except self.base_exceptions as e:
+            self._fail_open(e, now)
+            return int(now), 0
+
+    def clear(self, key):
+        with self.lock:
+            self._leases.pop(key, None)
+        return super().clear(key)
+
+    def reset(self):
+        with self.lock:
+            self._leases.clear()
+        return super().reset()
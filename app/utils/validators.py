@@ -1,54 +1,84 @@
 import re
-from pydantic import BaseModel, validator
 from datetime import datetime
-from enum import Enum
-from typing import Optional
-
-class TaskStatus(str, Enum):
-    PENDING = 'pending'
-    IN_PROGRESS = 'in_progress'
-    COMPLETED = 'completed'
-    CANCELLED = 'cancelled'
+from typing import List, Optional
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from app.blueprints.tasks.models import TaskStatus
 
 class TaskCreateSchema(BaseModel):
-    title: str
+    """A validated new task, with status, priority and due_date already parsed."""
+    title: str = Field(min_length=3, max_length=120)
     description: Optional[str] = ""
-    status: Optional[TaskStatus] = TaskStatus.PENDING
-    priority: Optional[int] = 1
-    due_date: Optional[str] = None
-    
-    @validator('title')
-    def title_length(cls, v):
-        if len(v) < 3 or len(v) > 120:
-            raise ValueError('Title must be between 3 and 120 characters')
-        return v
-    
-    @validator('priority')
-    def priority_range(cls, v):
-        if v < 1 or v > 5:
-            raise ValueError('Priority must be between 1 and 5')
-        return v
-    
-    @validator('due_date')
-    def validate_due_date(cls, v):
-        if v:
-            try:
-                datetime.fromisoformat(v)
-            except ValueError:
-                raise ValueError('Invalid date format. Use ISO format (YYYY-MM-DD)')
-        return v
+    status: TaskStatus = TaskStatus.PENDING
+    priority: int = Field(1, ge=1, le=5)
+    due_date: Optional[datetime] = None
 
-def validate_task_data(data, update=False):
-    try:
-        if update:
-            TaskCreateSchema(**data)
+class TaskUpdateSchema(BaseModel):
+    """A validated partial update; only the fields that were sent are set."""
+    title: str = Field(None, min_length=3, max_length=120)
+    description: Optional[str] = None
+    status: TaskStatus = None
+    priority: int = Field(None, ge=1, le=5)
+    due_date: Optional[datetime] = None
+
+_SCHEMAS = {False: TaskCreateSchema, True: TaskUpdateSchema}
+_BATCH_ADAPTERS = {update: TypeAdapter(List[schema]) for update, schema in _SCHEMAS.items()}
+
+_FIELD_MESSAGES = {
+    'title': "Title must be between 3 and 120 characters",
+    'priority': "Priority must be an integer between 1 and 5",
+    'due_date': "Invalid date format. Use ISO format (YYYY-MM-DD)",
+    'status': "Status must be one of: " + ", ".join(status.value for status in TaskStatus),
+}
+
+def _format_errors(errors):
+    """Turn pydantic error dicts into the API's human-readable messages."""
+    messages = []
+    for error in errors:
+        field = error['loc'][-1] if error['loc'] else None
+        if error['type'] == 'missing':
+            messages.append(f"{str(field).capitalize()} is required")
+        elif error['type'] == 'model_type':
+            messages.append("Task must be an object")
         else:
-            if 'title' not in data:
-                return ["Title is required"]
-            TaskCreateSchema(**data)
-        return []
-    except ValueError as e:
-        return [str(err) for err in e.errors()]
+            messages.append(_FIELD_MESSAGES.get(field, f"{field}: {error['msg']}"))
+    return messages
+
+def parse_task_data(data, update=False):
+    """Validate one task payload and return (payload, errors).
+
+    ``payload`` is a TaskCreateSchema, or a TaskUpdateSchema when
+    ``update`` is true, and is None whenever ``errors`` is not empty.
+    """
+    try:
+        return _SCHEMAS[update].model_validate(data), []
+    except ValidationError as e:
+        return None, _format_errors(e.errors())
+
+def parse_task_batch(rows, update=False):
+    """Validate a list of task payloads and return one (payload, errors) per row.
+
+    The whole list goes through a single schema call. Only when some rows
+    fail is a second call made over the rows that passed, since pydantic
+    returns no values for a list that has errors.
+    """
+    adapter = _BATCH_ADAPTERS[update]
+    try:
+        return [(payload, []) for payload in adapter.validate_python(rows)]
+    except ValidationError as e:
+        failed = {}
+        for error in e.errors():
+            index, loc = error['loc'][0], error['loc'][1:]
+            failed.setdefault(index, []).append({**error, 'loc': loc})
+
+    valid = iter(adapter.validate_python([row for index, row in enumerate(rows) if index not in failed]))
+    return [
+        (None, _format_errors(failed[index])) if index in failed else (next(valid), [])
+        for index in range(len(rows))
+    ]
+
+def validate_task_data(data, update=False):
+    """Return the validation errors for a task payload (empty when valid)."""
+    return parse_task_data(data, update)[1]
 
 def validate_email(email):
     """Validate email format."""
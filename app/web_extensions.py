@@ -0,0 +1,7 @@
+"""Extensions only the web process uses; the worker never imports this module."""
+from flask_jwt_extended import JWTManager
+from flask_limiter import Limiter
+from app.utils.rate_limit import rate_limit_key
+
+jwt = JWTManager()
+limiter = Limiter(key_func=rate_limit_key)
@@ -0,0 +1,10 @@
+# app/worker.py
+"""Celery entry point: ``celery -A app.worker worker`` (or ``beat``).
+
+Builds the worker profile of the app, so tasks run in an app context
+without blueprints, JWT, CORS or the rate limiter being loaded.
+"""
+from app import create_app
+from app.tasks.celery import celery
+
+app = create_app(role='worker')